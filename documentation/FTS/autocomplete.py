@@ -0,0 +1,212 @@
+"""
+Typeahead suggestions for the FTS table.
+
+Every distinct title is kept once in a small suggest table, upserted as documents
+are indexed, and indexed there into the `title_suggest` index column with an
+edge-ngram analyzer: "Machine" is stored as "m", "ma", "mac", ... "machine". A
+prefix typed into a search box is then an exact term lookup in that index instead
+of a wildcard or a full-text query over `content`. At query time the prefix is
+analysed with the plain `standard` analyzer, so "mac" stays a single term and is
+not split into n-grams itself.
+
+Because each title is one row, a short prefix matches a handful of rows rather
+than most of the documents, and ORDER BY _score LIMIT k is answered by Lucene's
+top-k collector without any GROUP BY.
+
+Suggester keeps a small LRU of recent prefixes on top of that. Every keystroke
+extends the previous prefix, and when the cached result for the shorter prefix was
+already complete (no further title matched) the longer prefix is answered by
+filtering those results, without a round trip.
+
+    python3 documentation/FTS/autocomplete.py
+"""
+
+import re
+from collections import OrderedDict
+from itertools import islice
+import fts
+
+SUGGEST_ANALYZER = "autocomplete_edge_ngram"
+SUGGEST_TABLE = f"{fts.TABLE_NAME}_suggest"
+MIN_GRAM = 1
+MAX_GRAM = 20
+
+
+def create_suggest_analyzer(cursor):
+    """Create the edge-ngram analyzer once; analyzers are cluster-wide and cannot be redefined while in use."""
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.routines
+    WHERE routine_type = 'ANALYZER' AND routine_name = ?
+    """, (SUGGEST_ANALYZER,))
+    if cursor.fetchone()[0]:
+        return
+
+    cursor.execute(f"""
+    CREATE ANALYZER {SUGGEST_ANALYZER} (
+        TOKENIZER standard,
+        TOKEN_FILTERS (
+            lowercase,
+            suggest_edge_ngram WITH (
+                type = 'edge_ngram',
+                min_gram = {MIN_GRAM},
+                max_gram = {MAX_GRAM}
+            )
+        )
+    )
+    """)
+
+
+def create_suggest_table(cursor, table=SUGGEST_TABLE, drop=True):
+    """Create the suggest table: one row per distinct title, edge-ngram indexed. The analyzer must exist."""
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {fts.DB_SCHEMA}.{table}")
+
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {fts.DB_SCHEMA}.{table} (
+        title TEXT PRIMARY KEY,
+        INDEX title_suggest USING FULLTEXT (title) WITH (analyzer = '{SUGGEST_ANALYZER}')
+    )
+    """)
+
+
+def upsert_titles(cursor, titles, table=SUGGEST_TABLE):
+    """Add titles to the suggest table; titles it already holds are left alone."""
+    rows = [[title] for title in set(titles) if title]
+    if rows:
+        cursor.executemany(
+            f"INSERT INTO {fts.DB_SCHEMA}.{table} (title) VALUES (?) ON CONFLICT (title) DO NOTHING", rows)
+
+
+def index_documents(cursor, rows, table=fts.TABLE_NAME, suggest_table=SUGGEST_TABLE, batch_size=1000):
+    """
+    fts.insert_documents() that keeps the suggest table in step.
+
+    Each batch of (id, title, content) rows is inserted, then its distinct titles
+    are upserted into `suggest_table`. Returns the number of rows sent.
+    """
+    rows = iter(rows)
+    sent = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return sent
+        sent += fts.insert_documents(cursor, batch, table, batch_size)
+        upsert_titles(cursor, (title for _, title, _ in batch), suggest_table)
+
+
+def normalize_prefix(prefix):
+    return re.sub(r"\s+", " ", prefix.strip().lower())
+
+
+def suggest(cursor, prefix, limit=10, table=SUGGEST_TABLE):
+    """Return up to `limit` distinct titles whose words start with the typed prefix, best first."""
+    return _query_suggestions(cursor, normalize_prefix(prefix), limit, table)[0]
+
+
+def _query_suggestions(cursor, prefix, limit, table):
+    """Return (titles, complete); complete means no further matching title exists."""
+    if not prefix:
+        return [], True
+
+    # The suggest table holds each title once, so the top rows are already distinct;
+    # one extra row tells whether more titles match.
+    limit = int(limit)
+    cursor.execute(f"""
+    SELECT title
+    FROM {fts.DB_SCHEMA}.{table}
+    WHERE MATCH(title_suggest, ?) USING best_fields WITH (analyzer = 'standard', operator = 'and')
+    ORDER BY _score DESC
+    LIMIT {limit + 1}
+    """, (prefix,))
+    titles = [title for title, in cursor.fetchall()]
+    return titles[:limit], len(titles) <= limit
+
+
+# Words as the standard tokenizer (Unicode word boundaries) sees them: runs of
+# letters and digits, kept together across an inner "." or apostrophe, as in
+# "u.s" or "don't", and split on hyphens, slashes and other punctuation.
+_WORD = re.compile(r"\w+(?:[.'\u2019]\w+)*")
+
+
+def _tokens(text):
+    return _WORD.findall(text.lower())
+
+
+def _matches_prefix(title, prefix):
+    """The client-side equivalent of the title_suggest query for a title already fetched."""
+    words = _tokens(title)
+    # Edge n-grams stop at MAX_GRAM characters, so a longer term matches nothing.
+    return all(len(term) <= MAX_GRAM and any(word.startswith(term) for word in words)
+               for term in _tokens(prefix))
+
+
+class Suggester:
+    """Prefix suggestions with a client-side LRU cache of recent prefixes."""
+
+    def __init__(self, cursor, limit=10, cache_size=256, table=SUGGEST_TABLE):
+        self.cursor = cursor
+        self.limit = limit
+        self.cache_size = cache_size
+        self.table = table
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def suggest(self, prefix):
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+
+        entry = self._cache.get(prefix) or self._from_shorter_prefix(prefix)
+        if entry is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = _query_suggestions(self.cursor, prefix, self.limit, self.table)
+
+        self._cache[prefix] = entry
+        self._cache.move_to_end(prefix)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry[0]
+
+    def _from_shorter_prefix(self, prefix):
+        # Only a complete answer for a shorter prefix is guaranteed to contain
+        # every answer for the longer one.
+        for end in range(len(prefix) - 1, 0, -1):
+            shorter = self._cache.get(prefix[:end])
+            if shorter is not None and shorter[1]:
+                return [title for title in shorter[0] if _matches_prefix(title, prefix)], True
+        return None
+
+
+def main():
+    connection = fts.connect()
+    cursor = connection.cursor()
+
+    create_suggest_analyzer(cursor)
+    fts.create_table(cursor)
+    create_suggest_table(cursor)
+    with fts.bulk_indexing(cursor):
+        index_documents(cursor, [
+            (1, "Machine Learning", "Machine learning algorithms power modern AI applications."),
+            (2, "Deep Learning", "Deep learning revolutionized image recognition and NLP."),
+            (3, "AI Ethics", "Ethical considerations in AI are crucial for fairness and bias mitigation."),
+            (4, "Vector Databases", "Vector databases optimize similarity search for high-dimensional data."),
+            (5, "Big Data Analytics", "Big data analytics transforms decision-making in businesses."),
+            (6, "Machine Vision", "Machine vision systems inspect products on assembly lines."),
+        ])
+    fts.wait_until_visible(cursor, 6)
+    cursor.execute(f"REFRESH TABLE {fts.DB_SCHEMA}.{SUGGEST_TABLE}")
+
+    suggester = Suggester(cursor, limit=5)
+    for typed in ["m", "ma", "mac", "mach", "machine l", "d", "da"]:
+        print(f"🔎 '{typed}' → {suggester.suggest(typed)}")
+    print(f"\nCache hits: {suggester.hits}, database queries: {suggester.misses}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Builds the same corpus under several analyzers and compares them.
+
+For every analyzer the FTS table is created with fts.create_table(analyzer=...),
+the corpus is loaded with fts.bulk_indexing(), and the harness reports:
+
+- index size: primary shard bytes from sys.shards after merging to one segment,
+- indexing throughput: docs/sec until every document is searchable,
+- query latency: p50/p99 of boosted multi-field searches (fts.DEFAULT_BOOSTS),
+- hits: how many documents the query terms match, as a recall hint.
+
+Results are printed as a table and, with --output, written as JSON so runs on
+different corpora or clusters can be compared.
+
+    python3 documentation/FTS/benchmark_analyzers.py --documents 500000 --output analyzers.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+import fts
+from corpus import generate_documents
+
+# name -> CREATE ANALYZER statement, or None for a built-in analyzer
+ANALYZERS = {
+    "standard": None,
+    "english": None,
+    "english_kstem_stop": """
+    CREATE ANALYZER english_kstem_stop (
+        TOKENIZER standard,
+        TOKEN_FILTERS (
+            lowercase,
+            english_stopwords WITH (type = 'stop', stopwords = '_english_'),
+            kstem
+        )
+    )
+    """,
+    "whitespace_lowercase": """
+    CREATE ANALYZER whitespace_lowercase (
+        TOKENIZER whitespace,
+        TOKEN_FILTERS (lowercase)
+    )
+    """,
+}
+
+QUERY_TERMS = ["index", "indexing", "searches", "running", "data model",
+               "machine learning", "bias mitigation", "the data"]
+QUERY_REPEATS = 50
+
+
+def ensure_analyzer(cursor, name, statement):
+    if statement is None:
+        return
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.routines
+    WHERE routine_type = 'ANALYZER' AND routine_name = ?
+    """, (name,))
+    if not cursor.fetchone()[0]:
+        cursor.execute(statement)
+
+
+def index_size_bytes(cursor, table):
+    cursor.execute("""
+    SELECT SUM(size) FROM sys.shards
+    WHERE schema_name = ? AND table_name = ? AND "primary" = true
+    """, (fts.DB_SCHEMA, table))
+    return cursor.fetchone()[0] or 0
+
+
+def measure_analyzer(cursor, name, documents):
+    table = f"{fts.TABLE_NAME}_an_{name}"
+    fts.create_table(cursor, table, analyzer=name)
+
+    start = time.perf_counter()
+    with fts.bulk_indexing(cursor, table):
+        fts.insert_documents(cursor, generate_documents(documents), table, batch_size=5000)
+    fts.wait_until_visible(cursor, documents, table, timeout=600)
+    docs_per_sec = documents / (time.perf_counter() - start)
+
+    # Merge to one segment so sizes are not skewed by how many segments each load left.
+    cursor.execute(f"OPTIMIZE TABLE {fts.DB_SCHEMA}.{table} WITH (max_num_segments = 1)")
+    size = index_size_bytes(cursor, table)
+
+    timings, hits = [], {}
+    for i in range(QUERY_REPEATS):
+        term = QUERY_TERMS[i % len(QUERY_TERMS)]
+        started = time.perf_counter()
+        fts.search(cursor, term, k=10, table=table, boosts=fts.DEFAULT_BOOSTS)
+        timings.append((time.perf_counter() - started) * 1000)
+    for term in QUERY_TERMS:
+        cursor.execute(f"""
+        SELECT COUNT(*) FROM {fts.DB_SCHEMA}.{table}
+        WHERE MATCH({fts.match_target(fts.DEFAULT_BOOSTS)}, ?)
+        """, (term,))
+        hits[term] = cursor.fetchone()[0]
+
+    timings.sort()
+    cursor.execute(f"DROP TABLE IF EXISTS {fts.DB_SCHEMA}.{table}")
+    return {
+        "analyzer": name,
+        "documents": documents,
+        "index_size_bytes": size,
+        "docs_per_sec": round(docs_per_sec, 1),
+        "query_p50_ms": round(statistics.median(timings), 3),
+        "query_p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+        "hits": hits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200_000)
+    parser.add_argument("--analyzers", nargs="+", default=list(ANALYZERS),
+                        choices=list(ANALYZERS))
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    connection = fts.connect()
+    cursor = connection.cursor()
+
+    results = []
+    print(f"{'analyzer':<22} {'size (MB)':>10} {'docs/sec':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name in args.analyzers:
+        ensure_analyzer(cursor, name, ANALYZERS[name])
+        result = measure_analyzer(cursor, name, args.documents)
+        results.append(result)
+        print(f"{name:<22} {result['index_size_bytes'] / 1e6:>10.1f} {result['docs_per_sec']:>10.0f} "
+              f"{result['query_p50_ms']:>9.2f} {result['query_p99_ms']:>9.2f}")
+
+    print("\nMatching documents per query term:")
+    print(f"{'term':<18}" + "".join(f"{r['analyzer']:>22}" for r in results))
+    for term in QUERY_TERMS:
+        print(f"{term:<18}" + "".join(f"{r['hits'][term]:>22}" for r in results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"\n✅ Results written to {args.output}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measures per-keystroke latency of the prefix-suggest API against a 10 ms p99 budget.
+
+Each simulated user types a title from the corpus one character at a time and asks
+for suggestions after every keystroke, as a search box does. Latency is reported
+for the raw query (autocomplete.suggest) and for the cached Suggester, with one
+Suggester per user session.
+
+    python3 documentation/FTS/benchmark_autocomplete.py --load --documents 1000000
+    python3 documentation/FTS/benchmark_autocomplete.py
+"""
+
+import argparse
+import random
+import statistics
+import time
+import autocomplete
+import fts
+from corpus import TOPICS, generate_documents
+
+BENCH_TABLE = f"{fts.TABLE_NAME}_suggest_bench"
+BENCH_SUGGEST_TABLE = f"{autocomplete.SUGGEST_TABLE}_bench"
+BUDGET_MS = 10.0
+SESSIONS = 200
+
+
+def keystrokes(rng):
+    title = rng.choice(TOPICS)
+    return [title[:end] for end in range(1, len(title) + 1)]
+
+
+def percentile(timings, fraction):
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def report(label, timings):
+    timings.sort()
+    p99 = percentile(timings, 0.99)
+    verdict = "✅" if p99 < BUDGET_MS else "⚠️"
+    print(f"{label:<22} {statistics.median(timings):>9.2f} {percentile(timings, 0.95):>9.2f} "
+          f"{p99:>9.2f}  {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--load", action="store_true",
+                        help="(re)create the benchmark table and load the corpus")
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    connection = fts.connect()
+    cursor = connection.cursor()
+
+    if args.load:
+        autocomplete.create_suggest_analyzer(cursor)
+        fts.create_table(cursor, BENCH_TABLE)
+        autocomplete.create_suggest_table(cursor, BENCH_SUGGEST_TABLE)
+        with fts.bulk_indexing(cursor, BENCH_TABLE):
+            autocomplete.index_documents(cursor, generate_documents(args.documents),
+                                         BENCH_TABLE, BENCH_SUGGEST_TABLE, batch_size=5000)
+        fts.wait_until_visible(cursor, args.documents, BENCH_TABLE, timeout=600)
+        cursor.execute(f"REFRESH TABLE {fts.DB_SCHEMA}.{BENCH_SUGGEST_TABLE}")
+
+    rng = random.Random(11)
+    sessions = [keystrokes(rng) for _ in range(SESSIONS)]
+
+    raw, cached = [], []
+    queries = 0
+    for session in sessions:
+        for prefix in session:
+            start = time.perf_counter()
+            autocomplete.suggest(cursor, prefix, table=BENCH_SUGGEST_TABLE)
+            raw.append((time.perf_counter() - start) * 1000)
+
+        suggester = autocomplete.Suggester(cursor, table=BENCH_SUGGEST_TABLE)
+        for prefix in session:
+            start = time.perf_counter()
+            suggester.suggest(prefix)
+            cached.append((time.perf_counter() - start) * 1000)
+        queries += suggester.misses
+
+    print(f"⏱️ {len(raw)} keystrokes over {SESSIONS} sessions, budget p99 < {BUDGET_MS} ms")
+    print(f"{'path':<22} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    report("suggest (no cache)", raw)
+    report("Suggester (LRU)", cached)
+    print(f"Database queries with the LRU: {queries} of {len(cached)} keystrokes")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
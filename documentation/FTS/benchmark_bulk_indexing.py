@@ -0,0 +1,64 @@
+"""
+Compares the docs/sec of the bulk indexing mode in fts.py with the previous
+"INSERT, REFRESH TABLE, time.sleep(1)" approach.
+
+Both strategies load the same synthetic corpus into a scratch copy of the FTS table
+and the clock stops once every document is searchable.
+
+- refresh + sleep: the batches are inserted with executemany, then one REFRESH
+  TABLE and a fixed time.sleep(1), as fts.py did for its load. Default refresh
+  interval and replicas stay in place.
+- bulk mode: fts.bulk_indexing() switches the periodic refresh off and drops the
+  replicas, the batches are streamed in, the settings are restored with a single
+  REFRESH, and fts.wait_until_visible() polls instead of sleeping.
+
+    python3 documentation/FTS/benchmark_bulk_indexing.py --documents 200000
+"""
+
+import argparse
+import time
+import fts
+from corpus import generate_documents
+
+BENCH_TABLE = f"{fts.TABLE_NAME}_bulk_bench"
+
+
+def load_with_refresh_and_sleep(cursor, documents, batch_size):
+    fts.insert_documents(cursor, generate_documents(documents), BENCH_TABLE, batch_size)
+    cursor.execute(f"REFRESH TABLE {fts.DB_SCHEMA}.{BENCH_TABLE}")
+    time.sleep(1)  # Ensure data is indexed before querying
+
+
+def load_in_bulk_mode(cursor, documents, batch_size):
+    with fts.bulk_indexing(cursor, BENCH_TABLE):
+        fts.insert_documents(cursor, generate_documents(documents), BENCH_TABLE, batch_size)
+    fts.wait_until_visible(cursor, documents, BENCH_TABLE)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    connection = fts.connect()
+    cursor = connection.cursor()
+
+    print(f"⏱️ Loading {args.documents} documents in batches of {args.batch_size}")
+    print(f"{'strategy':<18} {'seconds':>10} {'docs/sec':>12}")
+    for label, load in [("refresh + sleep", load_with_refresh_and_sleep),
+                        ("bulk mode", load_in_bulk_mode)]:
+        fts.create_table(cursor, BENCH_TABLE)
+        start = time.perf_counter()
+        load(cursor, args.documents, args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<18} {elapsed:>10.2f} {args.documents / elapsed:>12.0f}")
+
+    cursor.execute(f"DROP TABLE IF EXISTS {fts.DB_SCHEMA}.{BENCH_TABLE}")
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compares full-text search strategies on a large synthetic corpus.
+
+- group by: the original fts.py query, GROUP BY content, title with MAX(_score)
+  over every match, then ORDER BY. A LIMIT is added so it returns the same
+  number of rows as the others.
+- top-k: fts.search(), ORDER BY _score DESC, id LIMIT k, no aggregation.
+- offset page N / search-after page N: the N-th page of k results fetched with
+  OFFSET versus with fts.search(search_after=...). Search-after walks from the
+  first page, and only the final page request is timed. Both rescore every
+  match on each page, so expect deep pages to cost about the same either way.
+
+Load the corpus once with --load (it uses fts.bulk_indexing), then run the
+comparison as often as needed:
+
+    python3 documentation/FTS/benchmark_search.py --load --documents 2000000
+    python3 documentation/FTS/benchmark_search.py
+"""
+
+import argparse
+import statistics
+import time
+import fts
+from corpus import generate_documents
+
+BENCH_TABLE = f"{fts.TABLE_NAME}_search_bench"
+TERMS = ["data", "vector", "ethics", "distributed", "anomaly"]
+K = 10
+REPEATS = 20
+DEEP_PAGES = [1, 10, 100]
+
+
+def group_by_query(cursor, term):
+    cursor.execute(f"""
+    SELECT title, content, MAX(_score) as max_score
+    FROM {fts.DB_SCHEMA}.{BENCH_TABLE}
+    WHERE MATCH(content, ?)
+    GROUP BY content, title
+    ORDER BY max_score DESC
+    LIMIT {K}
+    """, (term,))
+    return cursor.fetchall()
+
+
+def offset_page(cursor, term, page):
+    cursor.execute(f"""
+    SELECT id, title, content, _score
+    FROM {fts.DB_SCHEMA}.{BENCH_TABLE}
+    WHERE MATCH(content, ?)
+    ORDER BY _score DESC, id ASC
+    LIMIT {K} OFFSET {(page - 1) * K}
+    """, (term,))
+    return cursor.fetchall()
+
+
+def search_after_cursor(cursor, term, page):
+    """Walk to the page before `page` and return its search-after cursor, or None if there is no such page."""
+    search_after = None
+    for _ in range(page - 1):
+        rows = fts.search(cursor, term, K, search_after, BENCH_TABLE)
+        if len(rows) < K:
+            return None
+        search_after = (rows[-1][3], rows[-1][0])
+    return search_after
+
+
+def median_ms(fn, *args):
+    timings = []
+    for i in range(REPEATS):
+        term = TERMS[i % len(TERMS)]
+        start = time.perf_counter()
+        fn(term, *args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--load", action="store_true",
+                        help="(re)create the benchmark table and load the corpus")
+    parser.add_argument("--documents", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    connection = fts.connect()
+    cursor = connection.cursor()
+
+    if args.load:
+        fts.create_table(cursor, BENCH_TABLE)
+        start = time.perf_counter()
+        with fts.bulk_indexing(cursor, BENCH_TABLE):
+            fts.insert_documents(cursor, generate_documents(args.documents),
+                                 BENCH_TABLE, batch_size=5000)
+        fts.wait_until_visible(cursor, args.documents, BENCH_TABLE, timeout=600)
+        print(f"Loaded {args.documents} documents in {time.perf_counter() - start:.1f}s")
+
+    cursor.execute(f"SELECT COUNT(*) FROM {fts.DB_SCHEMA}.{BENCH_TABLE}")
+    print(f"⏱️ Full-text search over {cursor.fetchone()[0]} documents, k={K}, median of {REPEATS}")
+    print(f"{'strategy':<24} {'median (ms)':>12}")
+
+    print(f"{'group by':<24} {median_ms(lambda term: group_by_query(cursor, term)):>12.2f}")
+    print(f"{'top-k':<24} {median_ms(lambda term: fts.search(cursor, term, K, table=BENCH_TABLE)):>12.2f}")
+
+    for page in DEEP_PAGES:
+        print(f"{f'offset page {page}':<24} "
+              f"{median_ms(lambda term: offset_page(cursor, term, page)):>12.2f}")
+
+        cursors = {term: search_after_cursor(cursor, term, page) for term in TERMS}
+        missing = [term for term, search_after in cursors.items() if page > 1 and search_after is None]
+        if missing:
+            print(f"{f'search-after page {page}':<24} {'no such page':>12} for {', '.join(missing)}")
+            continue
+        print(f"{f'search-after page {page}':<24} "
+              f"{median_ms(lambda term: fts.search(cursor, term, K, cursors[term], BENCH_TABLE)):>12.2f}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
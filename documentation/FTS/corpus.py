@@ -0,0 +1,37 @@
+"""
+Synthetic text corpus for the full-text search benchmarks.
+
+Documents are built from a fixed vocabulary with a seeded RNG, so every run (and
+every analyzer or loading strategy being compared) indexes exactly the same text.
+Word frequencies follow a rough Zipf curve, which gives BM25 the mix of common and
+rare terms it sees on real text.
+"""
+
+import random
+
+TOPICS = ["Machine Learning", "Deep Learning", "AI Ethics",
+          "Vector Databases", "Big Data Analytics", "Search Engines",
+          "Distributed Systems", "Time Series", "Geospatial Analytics"]
+
+VOCABULARY = (
+    "data model learning search index query vector database algorithm network "
+    "training inference embedding cluster shard replica storage analytics "
+    "machine deep neural language image recognition ranking relevance score "
+    "distributed scalable realtime streaming batch pipeline feature engineering "
+    "ethics fairness bias mitigation privacy security compliance governance "
+    "geospatial polygon point location timeseries sensor metric forecast anomaly "
+    "running runs ran indexes indexing indexed searching searched searches "
+    "the a an and of in on for with to is are was were be by as at from"
+).split()
+
+# Zipf-like weights: the i-th word is roughly 1/(i+1) as likely as the first.
+_WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def generate_documents(count, start_id=1, words_per_document=(12, 40), seed=7):
+    """Yield `count` (id, title, content) rows without materialising the corpus."""
+    rng = random.Random(seed)
+    low, high = words_per_document
+    for doc_id in range(start_id, start_id + count):
+        words = rng.choices(VOCABULARY, weights=_WEIGHTS, k=rng.randint(low, high))
+        yield doc_id, rng.choice(TOPICS), " ".join(words).capitalize() + "."
@@ -1,4 +1,7 @@
 from monkdb import client
+from contextlib import contextmanager
+from itertools import islice
+import re
 import time
 import configparser
 import os
@@ -21,74 +24,270 @@ DB_PASSWORD = config['database']['DB_PASSWORD']
 DB_SCHEMA = config['database']['DB_SCHEMA']
 TABLE_NAME = config['database']['FTS_TABLE_NAME']
 
-# Create a MonkDB connection
-try:
-    connection = client.connect(
+# Full-text columns that may take part in a (boosted) multi-field MATCH.
+SEARCH_FIELDS = ("title_ft", "content")
+# Titles are short and hand-written, so a hit there says more than one in the body.
+DEFAULT_BOOSTS = {"title_ft": 2.0, "content": 1.0}
+
+# MonkDB refreshes every second by default; 0 switches the periodic refresh off.
+DEFAULT_REFRESH_INTERVAL = 1000
+REFRESH_DISABLED = 0
+
+
+def connect():
+    """Open a new MonkDB connection using the credentials from config.ini."""
+    return client.connect(
         f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER
     )
-    cursor = connection.cursor()
-    print("✅ Database connection established successfully!")
-except Exception as e:
-    print(f"⚠️ Error connecting to the database: {e}")
-    exit(1)
-
-# Drop table if exists
-cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{TABLE_NAME}")
-connection.commit()
-
-# Create table with a full-text index using the standard analyzer
-cursor.execute(f'''
-CREATE TABLE {DB_SCHEMA}.{TABLE_NAME} (
-    id INTEGER PRIMARY KEY,
-    title TEXT,
-    content TEXT INDEX USING FULLTEXT WITH (analyzer = 'standard')
-)
-''')
-connection.commit()
-
-# Generate synthetic data
-titles = ["Machine Learning", "Deep Learning",
-          "AI Ethics", "Vector Databases", "Big Data Analytics"]
-contents = [
-    "Machine learning algorithms power modern AI applications.",
-    "Deep learning revolutionized image recognition and NLP.",
-    "Ethical considerations in AI are crucial for fairness and bias mitigation.",
-    "Vector databases optimize similarity search for high-dimensional data.",
-    "Big data analytics transforms decision-making in businesses."
-]
-
-# Insert synthetic data (ensuring unique entries)
-data = [(i, titles[i % len(titles)], contents[i % len(contents)])
-        for i in range(1, 11)]
-cursor.executemany(
-    f"INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (id, title, content) VALUES (?, ?, ?)", data)
-connection.commit()
-
-# Refresh the table to ensure changes are reflected in the index
-cursor.execute(f"REFRESH TABLE {DB_SCHEMA}.{TABLE_NAME}")
-
-time.sleep(1)  # Ensure data is indexed before querying
-
-# GROUP BY content, title ensures each content value appears only once. Before, multiple rows for the same content could exist, leading to duplicate processing.
-# Used MAX(_score) to Select the Highest Score. It finds the highest _score per unique content. This guarantees that only the most relevant version of the content appears.
-# This ensures the most relevant results appear at the top.
-search_term = "AI"
-cursor.execute(f"""
-SELECT title, content, MAX(_score) as max_score
-FROM {DB_SCHEMA}.{TABLE_NAME}
-WHERE MATCH(content, ?)
-GROUP BY content, title
-ORDER BY max_score DESC;
-""", (search_term,))
-
-# Fetch results
-results = cursor.fetchall()
-
-# Print unique results
-for title, content, score in results:
-    print(f"Title: {title}, Content: {content}, Score: {score}")
-
-
-# Close connection
-cursor.close()
-connection.close()
+
+
+def create_table(cursor, table=TABLE_NAME, drop=True, analyzer="standard"):
+    """
+    Create the FTS table with full-text indices on `content` and `title`.
+
+    `content` and the `title_ft` index column over `title` use `analyzer`. `title`
+    itself stays a plain column, so it can still be grouped and sorted on.
+    """
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{table}")
+
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{table} (
+        id INTEGER PRIMARY KEY,
+        title TEXT,
+        content TEXT INDEX USING FULLTEXT WITH (analyzer = '{analyzer}'),
+        INDEX title_ft USING FULLTEXT (title) WITH (analyzer = '{analyzer}')
+    )
+    ''')
+
+
+def insert_documents(cursor, rows, table=TABLE_NAME, batch_size=1000):
+    """
+    Stream (id, title, content) rows into the table in executemany batches.
+
+    rows can be any iterable, including a generator, so a load never has to be
+    held in memory as a whole. Returns the number of rows sent.
+    """
+    rows = iter(rows)
+    sent = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return sent
+        cursor.executemany(
+            f"INSERT INTO {DB_SCHEMA}.{table} (id, title, content) VALUES (?, ?, ?)", batch)
+        sent += len(batch)
+
+
+def wait_until_visible(cursor, expected_rows, table=TABLE_NAME, timeout=30.0):
+    """
+    Poll until `expected_rows` rows are searchable instead of sleeping for a fixed time.
+
+    The poll interval starts at 10 ms and doubles up to 500 ms, so a table that is
+    already visible costs a single COUNT(*). Raises TimeoutError after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        cursor.execute(f"SELECT COUNT(*) FROM {DB_SCHEMA}.{table}")
+        visible = cursor.fetchone()[0]
+        if visible >= expected_rows:
+            return visible
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(
+                f"Only {visible} of {expected_rows} rows visible in {DB_SCHEMA}.{table} after {timeout}s")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+def match_target(boosts):
+    """Render the first argument of MATCH(): `content`, or `(title_ft 2.0, content 1.0)`."""
+    if not boosts:
+        return "content"
+    unknown = set(boosts) - set(SEARCH_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot search {sorted(unknown)}; choose from {SEARCH_FIELDS}")
+    return "(" + ", ".join(f"{field} {float(boost)}" for field, boost in boosts.items()) + ")"
+
+
+def search(cursor, term, k=10, search_after=None, table=TABLE_NAME, boosts=None):
+    """
+    Return one page of the top-k matches as (id, title, content, score) rows.
+
+    Rows are ordered by score, highest first, with the id as a tie-breaker, so the
+    order is total and stable between calls. Pass the (score, id) of the last row
+    of a page as `search_after` to get the next page.
+
+    Search-after gives stable pages, not cheaper ones. The cursor condition cannot
+    be pushed into the MATCH query, so every page still scores and collects all
+    matches before it is applied, much like OFFSET does; benchmark_search.py
+    compares the two at increasing depths.
+
+    `boosts` maps full-text fields to weights, e.g. DEFAULT_BOOSTS, and searches
+    all of them in the same MATCH(); without it only `content` is searched.
+    """
+    target = match_target(boosts)
+    if search_after is None:
+        cursor.execute(f"""
+        SELECT id, title, content, _score
+        FROM {DB_SCHEMA}.{table}
+        WHERE MATCH({target}, ?)
+        ORDER BY _score DESC, id ASC
+        LIMIT {int(k)}
+        """, (term,))
+    else:
+        last_score, last_id = search_after
+        # _score can only be compared with >= inside WHERE, so the keyset
+        # condition is applied to the matches one level up. _score is a REAL;
+        # casting the cursor back to REAL keeps the equality exact after the
+        # round trip through a Python float.
+        cursor.execute(f"""
+        SELECT id, title, content, score
+        FROM (
+            SELECT id, title, content, _score AS score
+            FROM {DB_SCHEMA}.{table}
+            WHERE MATCH({target}, ?)
+        ) matches
+        WHERE score < CAST(? AS REAL) OR (score = CAST(? AS REAL) AND id > ?)
+        ORDER BY score DESC, id ASC
+        LIMIT {int(k)}
+        """, (term, last_score, last_score, last_id))
+    return cursor.fetchall()
+
+
+def _shingles(text, size=3):
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def dedupe_near_duplicates(rows, seen=None, threshold=0.9):
+    """
+    Drop rows whose content is a near-duplicate of a row already kept.
+
+    Two contents are near-duplicates when the Jaccard similarity of their word
+    3-shingles is at least `threshold`; case, punctuation and spacing are ignored.
+    Pass the same `seen` list across pages to dedupe a whole result set.
+    """
+    seen = [] if seen is None else seen
+    kept = []
+    for row in rows:
+        shingles = _shingles(row[2] or "")
+        if any(len(shingles & other) / len(shingles | other) >= threshold for other in seen):
+            continue
+        seen.append(shingles)
+        kept.append(row)
+    return kept
+
+
+def iter_search_pages(cursor, term, page_size=10, dedupe=True, table=TABLE_NAME, boosts=None):
+    """Yield pages of up to `page_size` results, deduped across pages, until the matches run out."""
+    seen = []
+    search_after = None
+    page = []
+    while True:
+        rows = search(cursor, term, page_size, search_after, table, boosts)
+        if rows:
+            search_after = (rows[-1][3], rows[-1][0])
+            page.extend(dedupe_near_duplicates(rows, seen) if dedupe else rows)
+        while len(page) >= page_size:
+            yield page[:page_size]
+            page = page[page_size:]
+        if len(rows) < page_size:
+            if page:
+                yield page
+            return
+
+
+@contextmanager
+def bulk_indexing(cursor, table=TABLE_NAME, replicas=0):
+    """
+    Put a table into bulk-load mode for the duration of a `with` block.
+
+    Periodic refreshes are switched off (refresh_interval = 0) so the load does not
+    keep opening new searchers, and replicas are lowered so every document is
+    indexed once instead of once per copy. On exit the previous settings are
+    restored and a single REFRESH makes the whole load searchable.
+    """
+    cursor.execute("""
+    SELECT settings['refresh_interval'], number_of_replicas
+    FROM information_schema.tables
+    WHERE table_schema = ? AND table_name = ?
+    """, (DB_SCHEMA, table))
+    previous_refresh_interval, previous_replicas = cursor.fetchone()
+
+    cursor.execute(
+        f"ALTER TABLE {DB_SCHEMA}.{table} SET (refresh_interval = {REFRESH_DISABLED}, number_of_replicas = {int(replicas)})")
+    try:
+        yield
+    finally:
+        if previous_refresh_interval in (None, DEFAULT_REFRESH_INTERVAL):
+            # RESET rather than SET keeps the default freeze-on-idle behaviour.
+            cursor.execute(
+                f"ALTER TABLE {DB_SCHEMA}.{table} RESET (refresh_interval)")
+        else:
+            cursor.execute(
+                f"ALTER TABLE {DB_SCHEMA}.{table} SET (refresh_interval = {int(previous_refresh_interval)})")
+        cursor.execute(
+            f"ALTER TABLE {DB_SCHEMA}.{table} SET (number_of_replicas = '{previous_replicas}')")
+        cursor.execute(f"REFRESH TABLE {DB_SCHEMA}.{table}")
+
+
+def main():
+    # Create a MonkDB connection
+    try:
+        connection = connect()
+        cursor = connection.cursor()
+        print("✅ Database connection established successfully!")
+    except Exception as e:
+        print(f"⚠️ Error connecting to the database: {e}")
+        exit(1)
+
+    # Create table with a full-text index using the standard analyzer
+    create_table(cursor)
+    connection.commit()
+
+    # Generate synthetic data
+    titles = ["Machine Learning", "Deep Learning",
+              "AI Ethics", "Vector Databases", "Big Data Analytics"]
+    contents = [
+        "Machine learning algorithms power modern AI applications.",
+        "Deep learning revolutionized image recognition and NLP.",
+        "Ethical considerations in AI are crucial for fairness and bias mitigation.",
+        "Vector databases optimize similarity search for high-dimensional data.",
+        "Big data analytics transforms decision-making in businesses."
+    ]
+
+    # Insert synthetic data (ensuring unique entries). The load runs in bulk mode,
+    # which ends with a single REFRESH; we then poll until every row is searchable.
+    data = [(i, titles[i % len(titles)], contents[i % len(contents)])
+            for i in range(1, 11)]
+    with bulk_indexing(cursor):
+        insert_documents(cursor, data)
+    connection.commit()
+    wait_until_visible(cursor, len(data))
+
+    # ORDER BY _score DESC LIMIT lets the engine keep only the best k matches
+    # instead of aggregating every hit. Rows repeating the same content are
+    # dropped on the client, which is cheap because there are only k of them.
+    search_term = "AI"
+    results = dedupe_near_duplicates(search(cursor, search_term, k=10))
+
+    # Print unique results
+    for _, title, content, score in results:
+        print(f"Title: {title}, Content: {content}, Score: {score}")
+
+    # Search title and content together, a title hit counting double
+    print(f"\nBoosted search over {DEFAULT_BOOSTS}:")
+    for _, title, content, score in dedupe_near_duplicates(
+            search(cursor, search_term, k=10, boosts=DEFAULT_BOOSTS)):
+        print(f"Title: {title}, Content: {content}, Score: {score}")
+
+    # Close connection
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
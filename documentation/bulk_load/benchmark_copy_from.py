@@ -0,0 +1,86 @@
+"""
+Compares the rows/sec of COPY FROM with the INSERT path for the timeseries,
+document and FTS tables.
+
+For each dataset the same generated rows are loaded into a scratch copy of the
+demo table, recreated before every run:
+
+- INSERT: executemany batches of --batch-size rows, as fts.py and doc_json.py
+  load their data, followed by a REFRESH TABLE.
+- COPY json / COPY csv: copy_loader.bulk_load() writes gzip-compressed shard
+  files, runs --parallel COPY FROM statements and refreshes the table. Writing the
+  files is included in the time; the COPY column shows the server side alone.
+
+The clock stops once the rows are visible, and the run reports any row that was
+not loaded. See copy_loader.py for how the nodes reach the shard files
+(--server-dir, --serve).
+
+    python3 documentation/bulk_load/benchmark_copy_from.py --rows 200000
+    python3 documentation/bulk_load/benchmark_copy_from.py --datasets fts --formats csv --parallel 8 --serve 172.17.0.1
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+import copy_loader
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", nargs="+", choices=list(copy_loader.DATASETS),
+                        default=list(copy_loader.DATASETS))
+    parser.add_argument("--formats", nargs="+", choices=("json", "csv"), default=["json", "csv"])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per INSERT executemany")
+    parser.add_argument("--rows-per-file", type=int, default=25_000)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--out", help="directory for the shard files, as this machine sees it")
+    parser.add_argument("--server-dir", help="--out as the MonkDB nodes see it")
+    parser.add_argument("--serve", metavar="HOST", help="serve the shards over HTTP, reachable by the nodes at HOST")
+    args = parser.parse_args()
+
+    connection = copy_loader.connect(args.parallel)
+    cursor = connection.cursor()
+    out_dir = args.out or tempfile.mkdtemp(prefix="monkdb_copy_bench_")
+
+    print(f"⏱️ Loading {args.rows:,} rows per dataset")
+    print(f"{'dataset':<12} {'path':<10} {'seconds':>9} {'rows/sec':>12} {'COPY s':>8} {'missing':>8}")
+    for dataset in args.datasets:
+        name, columns, generate, create_table = copy_loader.DATASETS[dataset]
+        bench = f"{name}_copy_bench"
+        table = f"{copy_loader.DB_SCHEMA}.{bench}"
+
+        create_table(cursor, bench, True)
+        started = time.perf_counter()
+        copy_loader.insert_rows(cursor, table, columns, generate(args.rows), args.batch_size)
+        cursor.execute(f"REFRESH TABLE {table}")
+        elapsed = time.perf_counter() - started
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        missing = args.rows - cursor.fetchone()[0]
+        print(f"{dataset:<12} {'INSERT':<10} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {'':>8} {missing:>8}")
+
+        for fmt in args.formats:
+            create_table(cursor, bench, True)
+            summary = copy_loader.bulk_load(
+                connection, table, generate(args.rows), out_dir, fmt, columns, args.parallel,
+                args.rows_per_file, True, args.server_dir, args.serve)
+            elapsed = summary["write_s"] + summary["copy_s"] + summary["refresh_s"]
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            missing = args.rows - cursor.fetchone()[0]
+            print(f"{dataset:<12} {'COPY ' + fmt:<10} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} "
+                  f"{summary['copy_s']:>8.2f} {missing:>8}")
+            if summary["error_count"] or summary["failed_uris"]:
+                copy_loader.print_summary(summary)
+
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    if not args.out:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
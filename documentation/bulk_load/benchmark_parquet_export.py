@@ -0,0 +1,102 @@
+"""
+Measures rows/sec and peak memory of exporting a table to Parquet.
+
+A scratch copy of the timeseries table is filled with --rows generated readings,
+or --table names an existing table and --no-load skips the fill. Each mode then
+writes the whole table to a temporary directory, in its own process so its peak
+memory (max RSS) is measured on its own:
+
+- fetchall: SELECT * and fetchall(), converted to one Arrow table and written
+  with pq.write_table(), the way the analytics notebooks pull data today,
+- streaming, 1 worker: parquet_export.export_table() with a single unit,
+- streaming, N workers: the same, with the key range cut into --workers slices.
+
+    python3 documentation/bulk_load/benchmark_parquet_export.py --rows 2000000
+    python3 documentation/bulk_load/benchmark_parquet_export.py --table documents --no-load --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.parquet as pq
+import copy_loader
+import parquet_export
+
+MODES = ["fetchall", "streaming, 1 worker", "streaming, N workers"]
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run_mode(mode, table, out_dir, workers, page_size):
+    connection = parquet_export.connect(workers)
+    started = time.perf_counter()
+    if mode == "fetchall":
+        cursor = connection.cursor()
+        columns, _, _, _ = parquet_export.describe(cursor, table)
+        schema = pa.schema([(name, parquet_export.arrow_type(cursor, table, name, data_type))
+                            for name, data_type in columns])
+        cursor.execute(f"SELECT {', '.join(schema.names)} FROM {parquet_export.DB_SCHEMA}.{table}")
+        values = list(zip(*cursor.fetchall()))
+        arrays = [pa.array(parquet_export.converter(data_type)(list(column)), type=field.type)
+                  for (_, data_type), column, field in zip(columns, values, schema)]
+        os.makedirs(out_dir, exist_ok=True)
+        pq.write_table(pa.Table.from_arrays(arrays, schema=schema), os.path.join(out_dir, "table.parquet"),
+                       compression="zstd")
+        rows = len(values[0]) if values else 0
+        cursor.close()
+    else:
+        slices = 1 if mode.endswith("1 worker") else workers
+        with ThreadPoolExecutor(max_workers=slices) as pool:
+            futures = parquet_export.export_table(connection, pool, table, out_dir, slices, page_size=page_size)
+            rows = sum(future.result()[0] for future in futures)
+    seconds = time.perf_counter() - started
+    connection.close()
+    # ru_maxrss is in KB on Linux
+    return rows, directory_size(out_dir), seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--table", help="export this existing table instead of a generated one")
+    parser.add_argument("--no-load", action="store_true", help="reuse the table from a previous run")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=parquet_export.PAGE_SIZE)
+    args = parser.parse_args()
+
+    table = args.table or f"{parquet_export.TABLES[0]}_parquet_bench"
+    if not args.no_load and not args.table:
+        name, columns, generate, create_table = copy_loader.DATASETS["timeseries"]
+        connection = copy_loader.connect()
+        cursor = connection.cursor()
+        print(f"⏱️ Loading {args.rows:,} rows into {parquet_export.DB_SCHEMA}.{table}")
+        create_table(cursor, table, True)
+        copy_loader.insert_rows(cursor, f"{parquet_export.DB_SCHEMA}.{table}", columns, generate(args.rows), 5000)
+        cursor.execute(f"REFRESH TABLE {parquet_export.DB_SCHEMA}.{table}")
+        cursor.close()
+        connection.close()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"\n{'mode':<22} {'rows':>10} {'MB':>8} {'seconds':>8} {'rows/sec':>10} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in MODES:
+            out_dir = os.path.join(directory, "export")
+            with context.Pool(1) as pool:
+                rows, size, seconds, peak = pool.apply(
+                    run_mode, (mode, table, out_dir, args.workers, args.page_size))
+            print(f"{mode:<22} {rows:>10,} {size / 1e6:>8.1f} {seconds:>8.2f} "
+                  f"{rows / seconds if seconds else 0:>10,.0f} {peak:>14.0f}")
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
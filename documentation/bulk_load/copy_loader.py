@@ -0,0 +1,348 @@
+"""
+Bulk loading with COPY FROM instead of INSERT.
+
+Every demo script loads its data with INSERT statements, one row or one
+executemany batch per request. For large loads, MonkDB's COPY FROM is much
+cheaper. The nodes read the files themselves, parse them in bulk_size batches and
+index them without a client round trip per batch. This tool loads data that way:
+
+1. Write the rows to numbered shard files of --rows-per-file rows each, as JSON
+   lines or CSV with a header, gzip-compressed unless --no-compress.
+2. Issue one `COPY ... FROM <shard> WITH (...) RETURN SUMMARY` per shard, with
+   --parallel statements running at a time on a pooled connection.
+3. Merge the per-node summaries. Rows that failed are reported by error message
+   with their file and line numbers, and files no node could read are listed
+   separately. The run exits with 1 if more than --max-errors rows failed.
+4. REFRESH the table and check that COUNT(*) matches what was written.
+
+The nodes have to be able to read the shard files:
+
+- by default they are addressed as file:// URIs under --out, which works when
+  MonkDB runs on this machine;
+- --server-dir names the same directory as the nodes see it, e.g. the mount
+  point of a docker volume or a shared disk (add --shared for the latter);
+- --serve HOST serves --out over HTTP from this process and the nodes fetch
+  http://HOST:port/<shard>, so nothing has to be mounted.
+
+The data is either one of the demo datasets (timeseries, doc, fts), generated
+into its demo table, or an NDJSON file (optionally .gz) loaded into --table.
+
+    python3 documentation/bulk_load/copy_loader.py timeseries --rows 1000000
+    python3 documentation/bulk_load/copy_loader.py fts --rows 500000 --format csv --parallel 8
+    python3 documentation/bulk_load/copy_loader.py doc --rows 200000 --serve 172.17.0.1
+    python3 documentation/bulk_load/copy_loader.py events.ndjson.gz --table monkdb.events --server-dir /data/shards
+"""
+
+import argparse
+import configparser
+import csv
+import functools
+import gzip
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count, islice
+from faker import Faker
+
+current_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(current_directory, "..", "timeseries"))
+sys.path.append(os.path.join(current_directory, "..", "document_json"))
+sys.path.append(os.path.join(current_directory, "..", "FTS"))
+import doc_json
+import fts
+import timeseries
+from corpus import generate_documents
+from ndjson_ingest import iter_documents
+
+config = configparser.ConfigParser()
+config.read(os.path.join(current_directory, "..", "config.ini"), encoding="utf-8")
+
+DB_HOST = config['database']['DB_HOST']
+DB_PORT = config['database']['DB_PORT']
+DB_USER = config['database']['DB_USER']
+DB_PASSWORD = config['database']['DB_PASSWORD']
+DB_SCHEMA = config['database']['DB_SCHEMA']
+
+ROWS_PER_FILE = 100_000
+INTERESTS = ["hiking", "chess", "cooking", "photography", "cycling", "music", "travel", "gaming"]
+
+
+def connect(pool_size=4):
+    """Open a MonkDB connection with room for `pool_size` concurrent COPY statements."""
+    from monkdb import client
+
+    return client.connect(
+        f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER, pool_size=pool_size)
+
+
+def sensor_rows(count, seed=7):
+    """Readings for the timeseries table, 10 ms apart so the timestamp primary key stays unique."""
+    rng = random.Random(seed)
+    Faker.seed(seed)
+    fake = Faker()
+    cities = [fake.city() for _ in range(200)]
+    newest = int(datetime.now(timezone.utc).timestamp() * 1000)
+    for i in range(count):
+        yield {
+            "timestamp": newest - i * 10,
+            "location": rng.choice(cities),
+            "temperature": round(rng.uniform(10, 40), 2),
+            "humidity": round(rng.uniform(20, 90), 2),
+            "wind_speed": round(rng.uniform(0, 30), 2),
+        }
+
+
+def user_rows(count, seed=7):
+    """Users with nested metadata for the doc_json table."""
+    rng = random.Random(seed)
+    Faker.seed(seed)
+    fake = Faker()
+    names = [fake.first_name() for _ in range(500)]
+    cities = [fake.city() for _ in range(200)]
+    for user_id in range(1, count + 1):
+        yield {
+            "id": user_id,
+            "name": rng.choice(names),
+            "age": rng.randint(18, 80),
+            "metadata": {
+                "city": rng.choice(cities),
+                "interests": rng.sample(INTERESTS, 2),
+                "profile": {"verified": rng.random() < 0.5, "score": rng.randint(0, 100)},
+            },
+        }
+
+
+def document_rows(count, seed=7):
+    """The synthetic FTS corpus from corpus.py."""
+    for doc_id, title, content in generate_documents(count, seed=seed):
+        yield {"id": doc_id, "title": title, "content": content}
+
+
+# name: (table, columns, row generator, create_table(cursor, table, drop))
+DATASETS = {
+    "timeseries": (timeseries.TABLE_NAME, ("timestamp", "location", "temperature", "humidity", "wind_speed"),
+                   sensor_rows, timeseries.create_table),
+    "doc": (doc_json.TABLE_NAME, ("id", "name", "age", "metadata"), user_rows, doc_json.create_table),
+    "fts": (fts.TABLE_NAME, ("id", "title", "content"), document_rows, fts.create_table),
+}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def write_shards(rows, out_dir, name, fmt="json", columns=None, rows_per_file=ROWS_PER_FILE, compress=True):
+    """
+    Write dict rows to `<name>-00000.json[.gz]`, `<name>-00001...` under `out_dir`.
+
+    Only one shard is held in memory at a time. CSV files get a header of `columns`,
+    or of the first row's keys, and store objects and arrays as JSON text. Returns
+    a list of (path, rows) pairs.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    opener = functools.partial(gzip.open, compresslevel=1) if compress else open
+    rows = iter(rows)
+    shards = []
+    for number in count():
+        chunk = list(islice(rows, rows_per_file))
+        if not chunk:
+            return shards
+        path = os.path.join(out_dir, f"{name}-{number:05d}.{fmt}" + (".gz" if compress else ""))
+        with opener(path, "wt", encoding="utf-8", newline="") as f:
+            if fmt == "json":
+                f.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in chunk)
+            else:
+                header = columns or list(chunk[0])
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows([_csv_value(row.get(column)) for column in header] for row in chunk)
+        shards.append((path, len(chunk)))
+
+
+def copy_statement(table, uri, fmt="json", compressed=True, shared=False, bulk_size=10_000,
+                   fail_fast=False, overwrite_duplicates=False):
+    options = [f"format = '{fmt}'", f"bulk_size = {bulk_size}"]
+    if compressed:
+        options.append("compression = 'gzip'")
+    if shared:
+        options.append("shared = true")
+    if fail_fast:
+        options.append("fail_fast = true")
+    if overwrite_duplicates:
+        options.append("overwrite_duplicates = true")
+    return f"COPY {table} FROM '{uri}' WITH ({', '.join(options)}) RETURN SUMMARY"
+
+
+def copy_from(connection, table, uris, parallel=4, **options):
+    """
+    Run one COPY FROM ... RETURN SUMMARY per URI, `parallel` at a time, and merge the summaries.
+
+    The result has the total success_count and error_count, errors as
+    {message: {"count", "lines": [(uri, line), ...]}}, and failed_uris as
+    {uri: reason} for files that no node could read.
+    """
+    def load(uri):
+        cursor = connection.cursor()
+        cursor.execute(copy_statement(table, uri, **options))
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    summary = {"success_count": 0, "error_count": 0, "errors": {}, "failed_uris": {}}
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for uri, node_rows in zip(uris, pool.map(load, uris)):
+            if not node_rows:
+                summary["failed_uris"][uri] = "no node read this file"
+            for row in node_rows:
+                if row["success_count"] is None:
+                    summary["failed_uris"][row["uri"]] = "; ".join(row["errors"] or {}) or "read error"
+                    continue
+                summary["success_count"] += row["success_count"]
+                summary["error_count"] += row["error_count"]
+                for message, info in (row["errors"] or {}).items():
+                    error = summary["errors"].setdefault(message, {"count": 0, "lines": []})
+                    error["count"] += info["count"]
+                    error["lines"].extend((row["uri"], line) for line in info.get("line_numbers") or [])
+    return summary
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory, host):
+    """Serve `directory` over HTTP on a free port. Returns the server and the base URL the nodes should use."""
+    server = ThreadingHTTPServer(("0.0.0.0", 0), functools.partial(_QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def bulk_load(connection, table, rows, out_dir, fmt="json", columns=None, parallel=4,
+              rows_per_file=ROWS_PER_FILE, compress=True, server_dir=None, serve_host=None, **copy_options):
+    """
+    Write `rows` to shard files in `out_dir`, COPY them into `table` and refresh it.
+
+    Returns the copy_from() summary plus the number of rows and files written
+    and the seconds spent writing, copying and refreshing.
+    """
+    started = time.perf_counter()
+    shards = write_shards(rows, out_dir, table.split(".")[-1], fmt, columns, rows_per_file, compress)
+    written = time.perf_counter()
+
+    server = None
+    if serve_host:
+        server, base = serve_directory(out_dir, serve_host)
+    else:
+        base = "file://" + (server_dir or os.path.abspath(out_dir)).rstrip("/")
+    try:
+        uris = [f"{base}/{os.path.basename(path)}" for path, _ in shards]
+        summary = copy_from(connection, table, uris, parallel, fmt=fmt, compressed=compress, **copy_options)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    copied = time.perf_counter()
+
+    connection.cursor().execute(f"REFRESH TABLE {table}")
+    summary.update(rows=sum(n for _, n in shards), files=len(shards), write_s=written - started,
+                   copy_s=copied - written, refresh_s=time.perf_counter() - copied)
+    return summary
+
+
+def insert_rows(cursor, table, columns, rows, batch_size=1000):
+    """The INSERT path for comparison: executemany batches of `batch_size` rows. Returns the number sent."""
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    rows = iter(rows)
+    sent = 0
+    while True:
+        batch = [tuple(row.get(column) for column in columns) for row in islice(rows, batch_size)]
+        if not batch:
+            return sent
+        cursor.executemany(statement, batch)
+        sent += len(batch)
+
+
+def print_summary(summary, max_lines=5):
+    elapsed = summary["write_s"] + summary["copy_s"] + summary["refresh_s"]
+    print(f"✅ {summary['success_count']:,} of {summary['rows']:,} rows loaded from {summary['files']} files "
+          f"in {elapsed:.2f} s ({summary['success_count'] / elapsed:,.0f} rows/sec)")
+    print(f"⏱️ write {summary['write_s']:.2f} s, COPY {summary['copy_s']:.2f} s, "
+          f"refresh {summary['refresh_s']:.2f} s")
+    for message, error in summary["errors"].items():
+        shown = ", ".join(f"{os.path.basename(uri)}:{line}" for uri, line in error["lines"][:max_lines])
+        print(f"⚠️ {error['count']} rows failed: {message} ({shown})")
+    for uri, reason in summary["failed_uris"].items():
+        print(f"⚠️ {uri} was not loaded: {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help=f"one of {', '.join(DATASETS)}, or an NDJSON file")
+    parser.add_argument("--table", help="target table for an NDJSON file, e.g. monkdb.events")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to generate for a dataset")
+    parser.add_argument("--append", action="store_true", help="keep the dataset's table instead of recreating it")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--rows-per-file", type=int, default=ROWS_PER_FILE)
+    parser.add_argument("--parallel", type=int, default=4, help="COPY statements running at the same time")
+    parser.add_argument("--bulk-size", type=int, default=10_000, help="rows per batch on the nodes")
+    parser.add_argument("--fail-fast", action="store_true")
+    parser.add_argument("--overwrite-duplicates", action="store_true")
+    parser.add_argument("--shared", action="store_true", help="the shard directory is visible to every node")
+    parser.add_argument("--out", help="keep the shard files in this directory instead of a temporary one")
+    parser.add_argument("--server-dir", help="--out as the MonkDB nodes see it")
+    parser.add_argument("--serve", metavar="HOST", help="serve the shards over HTTP, reachable by the nodes at HOST")
+    parser.add_argument("--max-errors", type=int, default=0, help="failed rows tolerated before exiting with 1")
+    args = parser.parse_args()
+
+    connection = connect(args.parallel)
+    cursor = connection.cursor()
+    if args.source in DATASETS:
+        name, columns, generate, create_table = DATASETS[args.source]
+        table = f"{DB_SCHEMA}.{name}"
+        if not args.append:
+            create_table(cursor, name, True)
+        rows = generate(args.rows)
+    elif args.table:
+        table, columns, rows = args.table, None, iter_documents(args.source)
+    else:
+        parser.error("--table is required when loading an NDJSON file")
+
+    out_dir = args.out or tempfile.mkdtemp(prefix="monkdb_copy_")
+    try:
+        summary = bulk_load(
+            connection, table, rows, out_dir, args.format, columns, args.parallel, args.rows_per_file,
+            not args.no_compress, args.server_dir, args.serve, shared=args.shared, bulk_size=args.bulk_size,
+            fail_fast=args.fail_fast, overwrite_duplicates=args.overwrite_duplicates)
+    finally:
+        if not args.out:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    print_summary(summary)
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    visible = cursor.fetchone()[0]
+    if not args.append and visible != summary["success_count"]:
+        print(f"⚠️ {table} has {visible:,} rows, COPY reported {summary['success_count']:,}")
+    cursor.close()
+    connection.close()
+    if summary["error_count"] > args.max_errors or summary["failed_uris"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Streaming export of MonkDB tables to partitioned Parquet files.
+
+Pulling sensor_data, doc_json or documents out with SELECT * and fetchall()
+holds the whole result in Python objects before anything is written. This
+exporter reads each table in keyset pages instead (json_export.iter_pages).
+Every page becomes one Arrow record batch, which is appended to an open Parquet
+file, so memory depends on --page-size and --workers rather than on table size.
+
+The Arrow schema comes from information_schema.columns:
+
+- FLOAT_VECTOR(n) becomes fixed_size_list<float32>[n],
+- GEO_POINT becomes struct<lon: double, lat: double>,
+- TIMESTAMP becomes timestamp[ms] (UTC for WITH TIME ZONE),
+- arrays become list<...> of their element type,
+- OBJECT and GEO_SHAPE are stored as JSON text.
+
+The work is split into independent units that run on a thread pool with one
+pooled connection:
+
+- a partitioned table yields one unit per partition, written hive-style to
+  <table>/<column>=<value>/ without the partition columns;
+- the key range of each partition (or of the whole table) is cut into --slices
+  ranges, by default the table's number_of_shards, so large tables are read by
+  several workers at once.
+
+The key is the table's first non-partition primary key column (or --key). It
+must be unique, and only integer and timestamp keys can be sliced.
+
+Server-side cursors (DECLARE / FETCH) only live within one connection session,
+which the HTTP endpoint does not keep between requests. COPY TO writes JSON files
+on the nodes instead and is the better choice when no Arrow conversion is needed.
+
+    python3 documentation/bulk_load/parquet_export.py exports
+    python3 documentation/bulk_load/parquet_export.py exports --tables sensor_data --workers 8 --slices 16
+"""
+
+import argparse
+import configparser
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+current_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(current_directory, "..", "document_json"))
+from json_export import iter_pages
+
+config = configparser.ConfigParser()
+config.read(os.path.join(current_directory, "..", "config.ini"), encoding="utf-8")
+
+DB_HOST = config['database']['DB_HOST']
+DB_PORT = config['database']['DB_PORT']
+DB_USER = config['database']['DB_USER']
+DB_PASSWORD = config['database']['DB_PASSWORD']
+DB_SCHEMA = config['database']['DB_SCHEMA']
+TABLES = [config['database']['TIMESERIES_TABLE_NAME'], config['database']['DOC_TABLE_NAME'],
+          config['database']['VECTOR_TABLE_NAME']]
+
+PAGE_SIZE = 10_000
+ROWS_PER_FILE = 1_000_000
+
+GEO_POINT = pa.struct([("lon", pa.float64()), ("lat", pa.float64())])
+ARROW_TYPES = {
+    "boolean": pa.bool_(),
+    "byte": pa.int8(),
+    "char": pa.int8(),
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "numeric": pa.float64(),
+    "timestamp with time zone": pa.timestamp("ms", tz="UTC"),
+    "timestamp without time zone": pa.timestamp("ms"),
+    "date": pa.date64(),
+    "geo_point": GEO_POINT,
+}
+# Keys whose range can be cut into slices; timestamps arrive as epoch milliseconds.
+SLICEABLE = {"smallint", "integer", "bigint", "timestamp with time zone", "timestamp without time zone"}
+
+
+def connect(pool_size=4):
+    """Open a MonkDB connection with room for `pool_size` concurrent exports."""
+    from monkdb import client
+
+    return client.connect(
+        f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER, pool_size=pool_size)
+
+
+def describe(cursor, table):
+    """
+    Return (columns, primary_key, partitioned_by, number_of_shards) of a table.
+
+    columns is a list of (name, data_type) of the top-level columns in table order.
+    """
+    cursor.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position", (DB_SCHEMA, table))
+    columns = [(name, data_type) for name, data_type in cursor.fetchall() if "[" not in name]
+    if not columns:
+        raise ValueError(f"Table {DB_SCHEMA}.{table} does not exist")
+    cursor.execute(
+        "SELECT column_name FROM information_schema.key_column_usage "
+        "WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position", (DB_SCHEMA, table))
+    primary_key = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT partitioned_by, number_of_shards FROM information_schema.tables "
+        "WHERE table_schema = ? AND table_name = ?", (DB_SCHEMA, table))
+    partitioned_by, shards = cursor.fetchone()
+    return columns, primary_key, partitioned_by or [], shards or 1
+
+
+def arrow_type(cursor, table, name, data_type):
+    if data_type.endswith("_array"):
+        return pa.list_(arrow_type(cursor, table, name, data_type[:-len("_array")]))
+    if data_type == "float_vector":
+        cursor.execute(f"SELECT {name} FROM {DB_SCHEMA}.{table} WHERE {name} IS NOT NULL LIMIT 1")
+        sample = cursor.fetchone()
+        return pa.list_(pa.float32(), len(sample[0])) if sample else pa.list_(pa.float32())
+    return ARROW_TYPES.get(data_type, pa.string())
+
+
+def converter(data_type):
+    """How one column's values from the HTTP endpoint are turned into what pa.array() expects."""
+    element = data_type[:-len("_array")] if data_type.endswith("_array") else data_type
+    if element == "geo_point":
+        point = lambda v: None if v is None else {"lon": v[0], "lat": v[1]}
+        if element == data_type:
+            return lambda values: [point(v) for v in values]
+        return lambda values: [None if v is None else [point(p) for p in v] for v in values]
+    if element in ARROW_TYPES or element == "float_vector":
+        return lambda values: values
+    if element != data_type:
+        return lambda values: [None if v is None else [_text(x) for x in v] for v in values]
+    return lambda values: [_text(v) for v in values]
+
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def work_units(cursor, table, key, key_type, partitioned_by, slices):
+    """
+    Yield (directory, where, params) units covering the table once.
+
+    directory is relative to the table's output directory ("" or the hive-style
+    partition path).
+    """
+    if partitioned_by:
+        cursor.execute(
+            "SELECT \"values\" FROM information_schema.table_partitions "
+            "WHERE table_schema = ? AND table_name = ?", (DB_SCHEMA, table))
+        partitions = []
+        for (values,) in cursor.fetchall():
+            conditions, params, parts = [], [], []
+            for column in partitioned_by:
+                value = values.get(column)
+                conditions.append(f"{column} IS NULL" if value is None else f"{column} = ?")
+                params.extend([] if value is None else [value])
+                parts.append(f"{column}={quote(str(value), safe='') if value is not None else '__null__'}")
+            partitions.append(("/".join(parts), " AND ".join(conditions), params))
+    else:
+        partitions = [("", "TRUE", [])]
+
+    for directory, where, params in partitions:
+        if slices < 2 or key_type not in SLICEABLE:
+            yield directory, where, params
+            continue
+        cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {DB_SCHEMA}.{table} WHERE {where}", params)
+        low, high = cursor.fetchone()
+        if low is None:
+            continue
+        # Distinct starts: a range narrower than `slices` yields fewer, non-empty slices.
+        starts = sorted({low + (high - low) * i // slices for i in range(slices)})
+        for i, start in enumerate(starts):
+            if i == len(starts) - 1:
+                yield directory, f"{where} AND {key} >= ? AND {key} <= ?", params + [start, high]
+            else:
+                yield directory, f"{where} AND {key} >= ? AND {key} < ?", params + [start, starts[i + 1]]
+
+
+def export_unit(connection, table, schema, converters, key, unit, out_dir, number,
+                page_size=PAGE_SIZE, rows_per_file=ROWS_PER_FILE, compression="zstd"):
+    """
+    Write one unit to part-<number>-<file>.parquet files. Returns (rows, files, bytes).
+
+    Raises RuntimeError if the rows written differ from COUNT(*) of the unit, e.g.
+    because the table changed during the export.
+    """
+    directory, where, params = unit
+    target = os.path.join(out_dir, directory)
+    os.makedirs(target, exist_ok=True)
+    cursor = connection.cursor()
+    writer, path, in_file = None, None, 0
+    rows_written, paths = 0, []
+    try:
+        for _, rows in iter_pages(cursor, table, schema.names, key, page_size, where, params):
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(convert(list(values)), type=field.type)
+                 for convert, values, field in zip(converters, columns, schema)], schema=schema)
+            if writer is None or in_file >= rows_per_file:
+                if writer is not None:
+                    writer.close()
+                path = os.path.join(target, f"part-{number:04d}-{len(paths):04d}.parquet")
+                writer = pq.ParquetWriter(path, schema, compression=compression)
+                paths.append(path)
+                in_file = 0
+            writer.write_batch(batch)
+            in_file += len(rows)
+            rows_written += len(rows)
+        cursor.execute(f"SELECT COUNT(*) FROM {DB_SCHEMA}.{table} WHERE {where}", params)
+        expected = cursor.fetchone()[0]
+        if rows_written != expected:
+            raise RuntimeError(
+                f"{DB_SCHEMA}.{table} WHERE {where} {params}: wrote {rows_written} of {expected} rows")
+    finally:
+        if writer is not None:
+            writer.close()
+        cursor.close()
+    return rows_written, len(paths), sum(os.path.getsize(p) for p in paths)
+
+
+def export_table(connection, pool, table, out_dir, slices=None, key=None, page_size=PAGE_SIZE,
+                 rows_per_file=ROWS_PER_FILE, compression="zstd"):
+    """
+    Export `table` to `out_dir/<table>` on the thread pool `pool`.
+
+    Returns a list of futures, one per unit, each resolving to (rows, files, bytes).
+    """
+    cursor = connection.cursor()
+    columns, primary_key, partitioned_by, shards = describe(cursor, table)
+    exported = [(name, data_type) for name, data_type in columns if name not in partitioned_by]
+    key = key or next((name for name in primary_key if name not in partitioned_by), None)
+    if key is None:
+        raise ValueError(f"{DB_SCHEMA}.{table} has no primary key to page by; pass --key")
+    types = dict(columns)
+    schema = pa.schema([(name, arrow_type(cursor, table, name, data_type)) for name, data_type in exported])
+    converters = [converter(data_type) for _, data_type in exported]
+    units = list(work_units(cursor, table, key, types[key], partitioned_by, slices or shards))
+    cursor.close()
+    return [pool.submit(export_unit, connection, table, schema, converters, key, unit,
+                        os.path.join(out_dir, table), number, page_size, rows_per_file, compression)
+            for number, unit in enumerate(units)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out", help="output directory; each table is written to out/<table>/")
+    parser.add_argument("--tables", nargs="+", default=TABLES)
+    parser.add_argument("--workers", type=int, default=4, help="units exported at the same time")
+    parser.add_argument("--slices", type=int, help="key ranges per partition (default: number_of_shards)")
+    parser.add_argument("--key", help="unique column to page by (default: the primary key)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="rows per query and record batch")
+    parser.add_argument("--rows-per-file", type=int, default=ROWS_PER_FILE)
+    parser.add_argument("--compression", choices=("zstd", "snappy", "gzip", "none"), default="zstd")
+    args = parser.parse_args()
+
+    connection = connect(args.workers)
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for table in args.tables:
+            started = time.perf_counter()
+            futures = export_table(connection, pool, table, args.out, args.slices, args.key,
+                                   args.page_size, args.rows_per_file, args.compression)
+            results = [future.result() for future in futures]
+            seconds = time.perf_counter() - started
+            rows = sum(r[0] for r in results)
+            size = sum(r[2] for r in results)
+            print(f"✅ {DB_SCHEMA}.{table}: {rows:,} rows in {sum(r[1] for r in results)} files "
+                  f"({size / 1e6:.1f} MB) from {len(futures)} units in {seconds:.2f} s "
+                  f"({rows / seconds if seconds else 0:,.0f} rows/sec)")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measures MB/s and peak memory of exporting document query results to a file.
+
+The table is filled with --documents users with nested metadata. Each export
+path then writes the whole table to a temporary file, in its own process so its
+peak memory (max RSS) is measured on its own:
+
+- fetchall + json.dumps(indent=4): what doc_json.py does to print results,
+- ndjson, json module: json_export.export() with the standard library encoder,
+- ndjson, orjson: json_export.export() with orjson,
+- json array, orjson: the same, written as one JSON array.
+
+    python3 documentation/document_json/benchmark_json_export.py
+    python3 documentation/document_json/benchmark_json_export.py --documents 1000000 --no-load
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+import doc_json
+import json_export
+
+MODES = ["fetchall + json.dumps", "ndjson, json module", "ndjson, orjson", "json array, orjson"]
+
+
+def _metadata(rng, i):
+    return {
+        "city": rng.choice(["Paris", "Berlin", "Tokyo", "Lagos", "Lima"]),
+        "skills": rng.sample(["Python", "SQL", "AI", "Go", "Rust", "Java", "Kotlin"], 3),
+        "profile": {"preferences": {"food": rng.choice(["Thai", "Sushi", "Tacos"]), "language": "English"},
+                    "bio": f"user {i} " * 20},
+        "scores": [round(rng.random(), 6) for _ in range(10)],
+    }
+
+
+def load(cursor, table, documents, rng):
+    doc_json.create_table(cursor, table)
+    for start in range(1, documents + 1, 5000):
+        rows = [(i, f"user_{i}", rng.randrange(18, 80), _metadata(rng, i))
+                for i in range(start, min(start + 5000, documents + 1))]
+        cursor.executemany(
+            f"INSERT INTO {doc_json.DB_SCHEMA}.{table} (id, name, age, metadata) VALUES (?, ?, ?, ?)", rows)
+    cursor.execute(f"REFRESH TABLE {doc_json.DB_SCHEMA}.{table}")
+
+
+def run_mode(mode, table, path, page_size):
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    started = time.perf_counter()
+    with open(path, "wb") as out:
+        if mode == "fetchall + json.dumps":
+            cursor.execute(f"SELECT id, name, age, metadata FROM {doc_json.DB_SCHEMA}.{table}")
+            out.write(json.dumps(cursor.fetchall(), indent=4).encode("utf-8"))
+        else:
+            fmt = "json" if mode.startswith("json array") else "ndjson"
+            encoder = "orjson" if mode.endswith("orjson") else "json"
+            json_export.export(cursor, out, table, ["id", "name", "age", "metadata"], fmt,
+                               page_size=page_size, encoder=encoder)
+    seconds = time.perf_counter() - started
+    cursor.close()
+    connection.close()
+    # ru_maxrss is in KB on Linux
+    return os.path.getsize(path), seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=json_export.PAGE_SIZE)
+    parser.add_argument("--no-load", action="store_true", help="reuse the table from a previous run")
+    args = parser.parse_args()
+
+    table = f"{doc_json.TABLE_NAME}_export"
+    if not args.no_load:
+        connection = doc_json.connect()
+        cursor = connection.cursor()
+        print(f"⏱️ Loading {args.documents:,} documents")
+        load(cursor, table, args.documents, random.Random(42))
+        cursor.close()
+        connection.close()
+
+    if json_export.orjson is None:
+        print("⚠️ orjson is not installed, the orjson modes use the json module")
+
+    context = multiprocessing.get_context("spawn")
+    print(f"\n{'mode':<24} {'MB':>8} {'seconds':>8} {'MB/s':>7} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in MODES:
+            path = os.path.join(directory, "export.out")
+            with context.Pool(1) as pool:
+                size, seconds, peak = pool.apply(run_mode, (mode, table, path, args.page_size))
+            print(f"{mode:<24} {size / 1e6:>8.1f} {seconds:>8.2f} {size / 1e6 / seconds:>7.1f} {peak:>14.0f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares loading the same NDJSON file into one OBJECT(DYNAMIC) column with loading
+it through the inferred schema of ndjson_ingest.py.
+
+The generated events look like typical application logs: a few fields that are
+queried (user.name, event.type, tags), a large free-text payload that never is,
+and an `attributes` map whose keys vary from document to document. Under dynamic
+mapping every new attribute key becomes a column.
+
+For each mode the harness reports docs/sec and the number of columns created.
+
+    python3 documentation/document_json/benchmark_ndjson_ingest.py
+    python3 documentation/document_json/benchmark_ndjson_ingest.py --documents 1000000 --attribute-keys 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import doc_json
+from ndjson_ingest import ingest, ingest_dynamic
+
+EVENT_TYPES = ["click", "view", "purchase", "signup", "logout"]
+INDEXED_FIELDS = ["user.name", "event.type", "tags"]
+
+
+def write_events(path, count, attribute_keys, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(1, count + 1):
+            event = {
+                "id": i,
+                "user": {"name": f"user_{rng.randrange(10_000)}", "age": rng.randrange(18, 90)},
+                "event": {"type": rng.choice(EVENT_TYPES), "duration_ms": round(rng.expovariate(0.01), 3)},
+                "tags": rng.sample(["mobile", "web", "beta", "eu", "us", "promo"], 2),
+                "payload": " ".join(rng.choices(["lorem", "ipsum", "dolor", "sit", "amet"], k=60)),
+                "attributes": {f"attr_{rng.randrange(attribute_keys)}": rng.random() for _ in range(5)},
+            }
+            f.write(json.dumps(event) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200_000)
+    parser.add_argument("--attribute-keys", type=int, default=5_000,
+                        help="distinct keys in the attributes map")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.ndjson")
+        write_events(path, args.documents, args.attribute_keys, random.Random(42))
+        print(f"✅ Wrote {args.documents:,} events ({os.path.getsize(path) / 1e6:.0f} MB)\n")
+
+        runs = [
+            ("OBJECT(DYNAMIC) column", lambda table: ingest_dynamic(
+                path, table, workers=args.workers, batch_size=args.batch_size)),
+            ("inferred, all indexed", lambda table: ingest(
+                path, table, workers=args.workers, batch_size=args.batch_size)),
+            ("inferred, INDEX OFF", lambda table: ingest(
+                path, table, index=INDEXED_FIELDS, workers=args.workers, batch_size=args.batch_size)),
+        ]
+        print(f"{'mode':<24} {'docs/sec':>10} {'columns':>8} {'failed':>7}")
+        for i, (name, run) in enumerate(runs):
+            table = f"{doc_json.TABLE_NAME}_ingest_{i}"
+            summary = run(table)
+            print(f"{name:<24} {summary['docs_per_sec']:>10,.0f} {summary['columns']:>8,} {summary['failed']:>7,}")
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    for i in range(len(runs)):
+        cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{doc_json.TABLE_NAME}_ingest_{i}")
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures updates/sec for changing a few fields of documents with large metadata.
+
+Every document carries a `metadata` object with --fields extra keys and a skills
+array, so the whole object is tens of KB. Three ways of changing the city and
+adding a skill are compared:
+
+- read-modify-write: SELECT metadata, edit it in Python, UPDATE SET metadata = ?,
+  as doc_json.py used to,
+- patch: doc_patch.patch(), one UPDATE with nested assignments and RETURNING,
+- patch_many: doc_patch.patch_many(), bulk requests of --batch-size patches.
+
+    python3 documentation/document_json/benchmark_patch.py
+    python3 documentation/document_json/benchmark_patch.py --documents 20000 --fields 500
+"""
+
+import argparse
+import random
+import time
+import doc_json
+from doc_patch import append, patch, patch_many, set_field
+
+CITIES = ["Paris", "Berlin", "Tokyo", "Lagos", "Lima", "Oslo", "Pune", "Quito"]
+
+
+def large_metadata(rng, fields):
+    metadata = {f"attr_{i}": "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=40)) for i in range(fields)}
+    metadata["city"] = rng.choice(CITIES)
+    metadata["skills"] = [f"skill_{rng.randrange(1000)}" for _ in range(50)]
+    return metadata
+
+
+def _rate(count, seconds):
+    return f"{count / seconds:>10,.0f} updates/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5_000)
+    parser.add_argument("--fields", type=int, default=200, help="extra keys per metadata object")
+    parser.add_argument("--updates", type=int, default=2_000, help="updates per mode")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    table = f"{doc_json.TABLE_NAME}_patch"
+    doc_json.create_table(cursor, table)
+    rows = [(i, f"user_{i}", rng.randrange(18, 80), large_metadata(rng, args.fields))
+            for i in range(1, args.documents + 1)]
+    for start in range(0, len(rows), 500):
+        cursor.executemany(
+            f"INSERT INTO {doc_json.DB_SCHEMA}.{table} (id, name, age, metadata) VALUES (?, ?, ?, ?)",
+            rows[start:start + 500])
+    del rows
+    print(f"✅ Loaded {args.documents:,} documents with {args.fields} extra metadata keys\n")
+
+    ids = [rng.randrange(1, args.documents + 1) for _ in range(args.updates)]
+
+    start = time.perf_counter()
+    for i, doc_id in enumerate(ids):
+        cursor.execute(f"SELECT metadata FROM {doc_json.DB_SCHEMA}.{table} WHERE id = ?", (doc_id,))
+        metadata = cursor.fetchone()[0]
+        metadata["city"] = CITIES[i % len(CITIES)]
+        metadata["skills"].append(f"rmw_{i}")
+        cursor.execute(f"UPDATE {doc_json.DB_SCHEMA}.{table} SET metadata = ? WHERE id = ?", (metadata, doc_id))
+    print(f"{'read-modify-write':<20} {_rate(len(ids), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i, doc_id in enumerate(ids):
+        patch(cursor, doc_id, [set_field("city", CITIES[i % len(CITIES)]), append("skills", f"patch_{i}")],
+              table=table, returning=("metadata['city']",))
+    print(f"{'patch':<20} {_rate(len(ids), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    updated = patch_many(
+        cursor,
+        ((doc_id, [set_field("city", CITIES[i % len(CITIES)]), append("skills", f"bulk_{i}")])
+         for i, doc_id in enumerate(ids)),
+        table=table, batch_size=args.batch_size)
+    print(f"{f'patch_many ({args.batch_size})':<20} {_rate(len(ids), time.perf_counter() - start)}")
+    if updated != len(ids):
+        print(f"⚠️ patch_many reported {updated:,} updated documents for {len(ids):,} patches")
+
+    cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{table}")
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
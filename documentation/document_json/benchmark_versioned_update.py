@@ -0,0 +1,108 @@
+"""
+Runs concurrent read-modify-write counters against a few hot documents and reports
+throughput, conflict rate and lost updates.
+
+Every thread has its own connection and repeatedly increments metadata['counter']
+of a random document among --documents. Two modes are compared:
+
+- blind: SELECT, increment in Python, UPDATE SET metadata = ? (doc_json.py's flow),
+- versioned: versioned_update.versioned_update() with _seq_no/_primary_term checks
+  and jittered retries.
+
+Afterwards the counters are summed. With correct concurrency control the sum equals
+the number of successful updates; the difference is the number of lost updates.
+
+    python3 documentation/document_json/benchmark_versioned_update.py
+    python3 documentation/document_json/benchmark_versioned_update.py --threads 32 --documents 5
+"""
+
+import argparse
+import random
+import threading
+import time
+import doc_json
+from versioned_update import ConflictError, UpdateStats, versioned_update
+
+
+def increment(metadata):
+    metadata["counter"] = metadata.get("counter", 0) + 1
+    return metadata
+
+
+def blind_update(cursor, table, doc_id):
+    cursor.execute(f"SELECT metadata FROM {doc_json.DB_SCHEMA}.{table} WHERE id = ?", (doc_id,))
+    metadata = increment(cursor.fetchone()[0])
+    cursor.execute(f"UPDATE {doc_json.DB_SCHEMA}.{table} SET metadata = ? WHERE id = ?", (metadata, doc_id))
+
+
+def run(mode, table, threads, updates, documents, max_retries):
+    stats = UpdateStats()
+    done = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        connection = doc_json.connect()
+        cursor = connection.cursor()
+        succeeded = 0
+        for _ in range(updates):
+            doc_id = rng.randrange(1, documents + 1)
+            if mode == "blind":
+                blind_update(cursor, table, doc_id)
+                succeeded += 1
+            else:
+                try:
+                    versioned_update(cursor, doc_id, increment, table=table,
+                                     max_retries=max_retries, stats=stats)
+                    succeeded += 1
+                except ConflictError:
+                    pass
+        done.append(succeeded)
+        cursor.close()
+        connection.close()
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(done), time.perf_counter() - started, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--updates", type=int, default=200, help="updates per thread")
+    parser.add_argument("--documents", type=int, default=10, help="hot documents shared by all threads")
+    parser.add_argument("--max-retries", type=int, default=20)
+    args = parser.parse_args()
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    table = f"{doc_json.TABLE_NAME}_occ"
+
+    print(f"{args.threads} threads x {args.updates} updates on {args.documents} documents\n")
+    print(f"{'mode':<10} {'updates/s':>10} {'conflict rate':>14} {'gave up':>8} {'lost updates':>13}")
+    for mode in ["blind", "versioned"]:
+        doc_json.create_table(cursor, table)
+        cursor.executemany(
+            f"INSERT INTO {doc_json.DB_SCHEMA}.{table} (id, name, age, metadata) VALUES (?, ?, ?, ?)",
+            [(i, f"user_{i}", 30, {"counter": 0}) for i in range(1, args.documents + 1)])
+        cursor.execute(f"REFRESH TABLE {doc_json.DB_SCHEMA}.{table}")
+
+        succeeded, seconds, stats = run(mode, table, args.threads, args.updates, args.documents, args.max_retries)
+
+        cursor.execute(f"REFRESH TABLE {doc_json.DB_SCHEMA}.{table}")
+        cursor.execute(f"SELECT SUM(metadata['counter']) FROM {doc_json.DB_SCHEMA}.{table}")
+        lost = succeeded - (cursor.fetchone()[0] or 0)
+        rate = f"{stats.conflict_rate:.1%}" if mode == "versioned" else "n/a"
+        print(f"{mode:<10} {succeeded / seconds:>10,.0f} {rate:>14} {stats.gave_up:>8,} {lost:>13,}")
+
+    cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{table}")
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
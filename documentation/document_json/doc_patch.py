@@ -0,0 +1,161 @@
+"""
+Partial updates of OBJECT columns without reading the document first.
+
+Changing one field by SELECTing the whole `metadata` object, editing it in Python,
+writing the whole object back and running REFRESH TABLE costs two round trips,
+ships the full object both ways, and forces a refresh of the table.
+MonkDB can assign to a nested field directly, so a patch here is a list of
+operations that each become one assignment in a single UPDATE by primary key:
+
+    set_field("city", "Paris")              metadata['city'] = ?
+    set_field("profile.preferences.food", "Thai")
+    append("skills", "Kotlin")              metadata['skills'] = array_cat(metadata['skills'], ?)
+    append("skills", "AI", unique=True)     metadata['skills'] = array_unique(metadata['skills'], ?)
+    remove("skills", "SQL")                 metadata['skills'] = array_difference(metadata['skills'], ?)
+
+Operations on the same path are applied in order within one assignment, so
+append("skills", "Kotlin") followed by remove("skills", "SQL") becomes
+metadata['skills'] = array_difference(array_cat(metadata['skills'], ?), ?).
+patch() updates one document and returns the new values with RETURNING. No read is
+needed, and no REFRESH either: lookups by primary key see the update at once.
+patch_many() groups patches with the same shape and sends each group as a bulk
+executemany, so thousands of documents are patched in a few requests.
+benchmark_patch.py compares both against read-modify-write on large documents.
+
+    python3 documentation/document_json/doc_patch.py
+"""
+
+import re
+import doc_json
+
+SET = "set"
+APPEND = "append"
+APPEND_UNIQUE = "append_unique"
+REMOVE = "remove"
+
+_EXPRESSIONS = {
+    SET: "?",
+    APPEND: "array_cat({ref}, ?)",
+    APPEND_UNIQUE: "array_unique({ref}, ?)",
+    REMOVE: "array_difference({ref}, ?)",
+}
+
+_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def set_field(path, value):
+    return SET, path, value
+
+
+def append(path, *values, unique=False):
+    return (APPEND_UNIQUE if unique else APPEND), path, list(values)
+
+
+def remove(path, *values):
+    return REMOVE, path, list(values)
+
+
+def field_ref(path, column="metadata"):
+    """Turn a dotted path like "profile.preferences.food" into metadata['profile']['preferences']['food']."""
+    keys = path.split(".")
+    for key in keys:
+        if not _KEY.match(key):
+            raise ValueError(f"Invalid object key {key!r} in path {path!r}")
+    return column + "".join(f"['{key}']" for key in keys)
+
+
+def _by_path(ops):
+    """Group ops by path, in order of first appearance, keeping their order within a path."""
+    groups = {}
+    for op, path, value in ops:
+        if op == SET and path in groups:
+            raise ValueError(f"set_field({path!r}) would discard the earlier operations on that path")
+        groups.setdefault(path, []).append((op, value))
+    return groups
+
+
+def _values(ops):
+    """The parameters of _statement(ops), in placeholder order."""
+    return [value for path_ops in _by_path(ops).values() for _, value in path_ops]
+
+
+def _statement(ops, table, column, returning=None):
+    assignments = []
+    for path, path_ops in _by_path(ops).items():
+        ref = field_ref(path, column)
+        expression = ref
+        for op, _ in path_ops:
+            expression = _EXPRESSIONS[op].format(ref=expression)
+        assignments.append(f"{ref} = {expression}")
+    assignments = ", ".join(assignments)
+    statement = f"UPDATE {doc_json.DB_SCHEMA}.{table} SET {assignments} WHERE id = ?"
+    if returning:
+        statement += f" RETURNING {', '.join(returning)}"
+    return statement
+
+
+def patch(cursor, doc_id, ops, table=doc_json.TABLE_NAME, column="metadata", returning=("metadata",)):
+    """Apply `ops` to one document and return the RETURNING row, or None if the id does not exist."""
+    cursor.execute(_statement(ops, table, column, returning), _values(ops) + [doc_id])
+    return cursor.fetchone() if returning else None
+
+
+def patch_many(cursor, patches, table=doc_json.TABLE_NAME, column="metadata", batch_size=1000):
+    """
+    Apply many (doc_id, ops) patches with bulk requests and return how many documents changed.
+
+    Patches with the same operations on the same paths share one statement and go
+    out together; RETURNING is not available for bulk requests.
+    """
+    groups = {}
+    for doc_id, ops in patches:
+        shape = tuple((op, path) for op, path, _ in ops)
+        groups.setdefault(shape, (ops, []))[1].append(_values(ops) + [doc_id])
+
+    updated = 0
+    for ops, rows in groups.values():
+        statement = _statement(ops, table, column)
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(statement, rows[start:start + batch_size])
+            updated += max(cursor.rowcount, 0)
+    return updated
+
+
+def main():
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+
+    doc_json.create_table(cursor)
+    cursor.executemany(
+        f"INSERT INTO {doc_json.DB_SCHEMA}.{doc_json.TABLE_NAME} (id, name, age, metadata) VALUES (?, ?, ?, ?)",
+        doc_json.USERS)
+
+    row = patch(cursor, 1, [
+        set_field("city", "Paris"),
+        append("skills", "Kotlin"),
+        remove("skills", "SQL"),
+        set_field("profile.preferences.food", "French"),
+    ])
+    print(f"✏️ Alice after one UPDATE: {row[0]}")
+
+    updated = patch_many(cursor, [
+        (2, [set_field("city", "Los Angeles")]),
+        (3, [set_field("city", "Munich")]),
+        (4, [append("skills", "Kotlin", unique=True)]),
+        (5, [append("skills", "AI", unique=True)]),
+    ])
+    print(f"✅ Patched {updated} documents with bulk requests")
+
+    # Primary key lookups are real-time, no REFRESH TABLE needed.
+    cursor.execute(
+        f"SELECT id, metadata['city'], metadata['skills'] FROM {doc_json.DB_SCHEMA}.{doc_json.TABLE_NAME} "
+        f"WHERE id IN (1, 2, 3, 4, 5)")
+    for row in cursor.fetchall():
+        print(row)
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Streaming export of document query results as NDJSON or a JSON array.
+
+doc_json.py prints results with json.dumps(cursor.fetchall(), indent=4). That
+holds every row, and then the whole string, in memory, and the pure-Python json
+module is slow on large nested `metadata` objects. export() instead:
+
+- reads the table in pages with keyset pagination (WHERE id > last ORDER BY id
+  LIMIT page_size), so neither MonkDB nor the client materialises the full result,
+- encodes each row as it arrives with orjson when it is installed (falling back
+  to the json module), one compact object per row,
+- writes each encoded page in one call to any binary file-like object: a file,
+  sys.stdout.buffer, or socket.makefile("wb").
+
+Memory use depends on page_size, not on the number of rows.
+
+    python3 documentation/document_json/json_export.py users.ndjson
+    python3 documentation/document_json/json_export.py - --format json --columns id name metadata
+"""
+
+import argparse
+import json
+import sys
+import doc_json
+
+try:
+    import orjson
+except ImportError:  # optional: get_encoder() falls back to the json module
+    orjson = None
+
+PAGE_SIZE = 1000
+
+
+def get_encoder(name="orjson"):
+    """Return a function that turns one row dict into bytes, using orjson when available."""
+    if name == "orjson" and orjson is not None:
+        return lambda row: orjson.dumps(row, default=str)
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+    return lambda row: encoder.encode(row).encode("utf-8")
+
+
+def iter_pages(cursor, table=doc_json.TABLE_NAME, columns=None, key="id", page_size=PAGE_SIZE,
+               where=None, params=()):
+    """
+    Yield (column_names, rows) pages of a table ordered by `key`.
+
+    Each page continues after the last key of the previous one, so each query
+    only returns page_size rows, however deep the export is.
+    """
+    selected = list(columns) if columns else ["*"]
+    if columns and key not in selected:
+        selected.insert(0, key)
+    filters = f"({where})" if where else "TRUE"
+    last = None
+    while True:
+        condition = filters if last is None else f"{filters} AND {key} > ?"
+        cursor.execute(
+            f"SELECT {', '.join(selected)} FROM {doc_json.DB_SCHEMA}.{table} "
+            f"WHERE {condition} ORDER BY {key} LIMIT ?",
+            tuple(params) + (() if last is None else (last,)) + (page_size,))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        names = [column[0] for column in cursor.description]
+        yield names, rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1][names.index(key)]
+
+
+def export(cursor, out, table=doc_json.TABLE_NAME, columns=None, fmt="ndjson", key="id",
+           page_size=PAGE_SIZE, where=None, params=(), encoder="orjson"):
+    """
+    Write the rows of `table` to the binary stream `out` and return (rows, bytes) written.
+
+    fmt="ndjson" writes one JSON object per line; fmt="json" writes a single JSON
+    array of objects.
+    """
+    encode = get_encoder(encoder)
+    keep = None if columns is None else set(columns)
+    written = count = 0
+    first = True
+
+    if fmt == "json":
+        out.write(b"[")
+        written += 1
+    for names, rows in iter_pages(cursor, table, columns, key, page_size, where, params):
+        visible = [i for i, name in enumerate(names) if keep is None or name in keep]
+        chunk = bytearray()
+        for row in rows:
+            encoded = encode({names[i]: row[i] for i in visible})
+            if fmt == "json":
+                if not first:
+                    chunk += b",\n"
+                chunk += encoded
+            else:
+                chunk += encoded
+                chunk += b"\n"
+            first = False
+        out.write(chunk)
+        written += len(chunk)
+        count += len(rows)
+    if fmt == "json":
+        out.write(b"]\n")
+        written += 2
+    return count, written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="file to write, or - for stdout")
+    parser.add_argument("--table", default=doc_json.TABLE_NAME)
+    parser.add_argument("--columns", nargs="+", help="columns to export (default: all)")
+    parser.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+    parser.add_argument("--key", default="id", help="unique, sortable column used for paging")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        rows, written = export(cursor, out, args.table, args.columns, args.format, args.key, args.page_size)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    cursor.close()
+    connection.close()
+    print(f"✅ Exported {rows:,} rows ({written / 1e6:.1f} MB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Streaming NDJSON / JSON Lines ingestion with an inferred, typed OBJECT schema.
+
+doc_json.py stores documents in an OBJECT(DYNAMIC) column. With arbitrary JSON,
+every new key becomes a new indexed column: map-like objects (one key per user,
+per SKU, per header name) make the column count explode, and each column slows
+indexing down. This tool loads a file in three steps instead:
+
+1. Sample the first --sample documents and infer a type for every field:
+   BOOLEAN, BIGINT, DOUBLE PRECISION, TEXT, ARRAY(...) or OBJECT(...) AS (...).
+   Objects with more than --max-object-keys distinct keys are treated as maps and
+   stored as OBJECT(IGNORED): kept in the document, but adding no columns.
+   A field seen with conflicting types becomes TEXT, and non-string values are
+   stored as their JSON text.
+2. Create the table with typed columns, OBJECT(STRICT) or OBJECT(DYNAMIC) for the
+   nested objects, and INDEX OFF for every field not listed in --index. Pass no
+   --index to keep every field indexed.
+3. Stream the file in batches to a thread pool. Each thread has its own
+   connection and sends a batch as one bulk INSERT. At most `workers * 2` batches
+   are in flight.
+
+It reports docs/sec, rows that failed (e.g. keys unseen in the sample under
+OBJECT(STRICT)), and the resulting number of columns from information_schema.
+
+    python3 documentation/document_json/ndjson_ingest.py events.ndjson --index user.name event.type tags
+    python3 documentation/document_json/ndjson_ingest.py events.ndjson.gz --mode dynamic --workers 8
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+import doc_json
+
+MAX_OBJECT_KEYS = 64
+
+
+def iter_documents(path):
+    """Yield one JSON document per non-empty line; .gz files are decompressed on the fly."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class FieldStats:
+    """Types observed for one field of the sampled documents, recursively for objects and arrays."""
+
+    def __init__(self, max_object_keys=MAX_OBJECT_KEYS):
+        self.max_object_keys = max_object_keys
+        self.types = set()
+        self.children = {}
+        self.element = None
+
+    def observe(self, value):
+        if value is None:
+            return
+        if isinstance(value, bool):
+            self.types.add("boolean")
+        elif isinstance(value, int):
+            self.types.add("bigint")
+        elif isinstance(value, float):
+            self.types.add("double")
+        elif isinstance(value, dict):
+            self.types.add("object")
+            for key, child in value.items():
+                self.children.setdefault(key, FieldStats(self.max_object_keys)).observe(child)
+        elif isinstance(value, list):
+            self.types.add("array")
+            self.element = self.element or FieldStats(self.max_object_keys)
+            for item in value:
+                self.element.observe(item)
+        else:
+            self.types.add("text")
+
+    @property
+    def is_map(self):
+        return self.types == {"object"} and len(self.children) > self.max_object_keys
+
+    @property
+    def coerced(self):
+        """True when conflicting types were seen and values are stored as TEXT."""
+        return len(self.types) > 1 and self.types != {"bigint", "double"}
+
+
+def infer_schema(documents, max_object_keys=MAX_OBJECT_KEYS):
+    root = FieldStats(max_object_keys)
+    for document in documents:
+        root.observe(document)
+    return root
+
+
+def quote(name):
+    # Always quoted: JSON keys can be reserved words ("user") or contain spaces.
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _type_sql(stats, path, mode, index):
+    types = stats.types
+    if not types or stats.coerced:
+        return "TEXT"
+    if types == {"object"}:
+        if stats.is_map:
+            return "OBJECT(IGNORED)"
+        inner = ", ".join(_column_sql(key, child, path + (key,), mode, index)
+                          for key, child in sorted(stats.children.items()))
+        return f"OBJECT({mode.upper()}) AS ({inner})" if inner else f"OBJECT({mode.upper()})"
+    if types == {"array"}:
+        return f"ARRAY({_type_sql(stats.element, path, mode, index)})"
+    if types == {"bigint", "double"}:
+        return "DOUBLE PRECISION"
+    return {"boolean": "BOOLEAN", "bigint": "BIGINT", "double": "DOUBLE PRECISION", "text": "TEXT"}[next(iter(types))]
+
+
+def _column_sql(name, stats, path, mode, index):
+    column = f"{quote(name)} {_type_sql(stats, path, mode, index)}"
+    leaf = stats.element if stats.types == {"array"} and stats.element else stats
+    is_scalar = leaf.coerced or not leaf.types or not leaf.types & {"object", "array"}
+    if index is not None and is_scalar and ".".join(path) not in index:
+        column += " INDEX OFF"
+    return column
+
+
+def create_table_sql(schema, table, mode="strict", index=None, primary_key="id"):
+    """
+    CREATE TABLE statement for an inferred schema.
+
+    `index` is a collection of dotted field paths to keep indexed (array elements
+    use the array's path); None keeps every field indexed.
+    """
+    index = None if index is None else set(index) | {primary_key}
+    columns = []
+    for name, stats in sorted(schema.children.items()):
+        column = _column_sql(name, stats, (name,), mode, index)
+        if name == primary_key:
+            column += " PRIMARY KEY"
+        columns.append(column)
+    body = ",\n        ".join(columns)
+    return f"CREATE TABLE {doc_json.DB_SCHEMA}.{table} (\n        {body}\n    )"
+
+
+def count_columns(schema):
+    """Columns the inferred schema creates, counted like information_schema.columns."""
+    total = 0
+    for stats in schema.children.values():
+        total += 1
+        node = stats.element if stats.types == {"array"} and stats.element else stats
+        if node.types == {"object"} and not node.is_map and not node.coerced:
+            total += count_columns(node)
+    return total
+
+
+def conform(value, stats):
+    """Turn values of TEXT-coerced fields into JSON text, recursively; other values pass through."""
+    if value is None:
+        return None
+    if stats.coerced:
+        return value if isinstance(value, str) else json.dumps(value)
+    if isinstance(value, dict) and stats.children and not stats.is_map:
+        return {key: conform(item, stats.children[key]) if key in stats.children else item
+                for key, item in value.items()}
+    if isinstance(value, list) and stats.element is not None:
+        return [conform(item, stats.element) for item in value]
+    return value
+
+
+def _needs_conform(stats):
+    return stats.coerced or any(_needs_conform(child) for child in stats.children.values()) or (
+        stats.element is not None and _needs_conform(stats.element))
+
+
+def column_count(cursor, table):
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.columns
+    WHERE table_schema = ? AND table_name = ?
+    """, (doc_json.DB_SCHEMA, table))
+    return cursor.fetchone()[0]
+
+
+def _load(statement, rows, workers, batch_size):
+    """Send `rows` as bulk INSERTs from a thread pool; returns (loaded, failed)."""
+    # Each call has its own pool and its own connections, one per thread, so
+    # concurrent loads never share or close each other's connections.
+    local = threading.local()
+    connections = []
+    connections_lock = threading.Lock()
+
+    def insert_batch(batch):
+        if not hasattr(local, "cursor"):
+            connection = doc_json.connect()
+            with connections_lock:
+                connections.append(connection)
+            local.cursor = connection.cursor()
+        results = local.cursor.executemany(statement, batch) or []
+        return len(batch), sum(1 for result in results if result.get("rowcount", 0) < 0)
+
+    loaded = failed = 0
+    try:
+        with ThreadPoolExecutor(workers) as pool:
+            pending = deque()
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                pending.append(pool.submit(insert_batch, batch))
+                # Backpressure: never more than two batches per worker in memory.
+                while len(pending) >= workers * 2:
+                    count, errors = pending.popleft().result()
+                    loaded, failed = loaded + count, failed + errors
+            for future in pending:
+                count, errors = future.result()
+                loaded, failed = loaded + count, failed + errors
+    finally:
+        for connection in connections:
+            connection.close()
+    return loaded, failed
+
+
+def _summary(cursor, table, loaded, failed, elapsed, **extra):
+    return {
+        "documents": loaded,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "docs_per_sec": round(loaded / elapsed, 1) if elapsed else 0.0,
+        "columns": column_count(cursor, table),
+        **extra,
+    }
+
+
+def ingest(path, table, sample_size=1000, mode="strict", index=None, primary_key="id",
+           workers=4, batch_size=1000, max_object_keys=MAX_OBJECT_KEYS, drop=True):
+    """Infer a schema from the first documents of `path`, create `table` and load the file. Returns a summary dict."""
+    documents = iter_documents(path)
+    sample = list(islice(documents, sample_size))
+    schema = infer_schema(sample, max_object_keys)
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{table}")
+    cursor.execute(create_table_sql(schema, table, mode, index, primary_key))
+
+    names = sorted(schema.children)
+    statement = (f"INSERT INTO {doc_json.DB_SCHEMA}.{table} ({', '.join(quote(n) for n in names)}) "
+                 f"VALUES ({', '.join('?' * len(names))})")
+    fields = [(name, schema.children[name]) for name in names]
+    needs_conform = _needs_conform(schema)
+    known = set(names)
+    unknown_keys = 0
+
+    def rows():
+        nonlocal unknown_keys
+        for document in chain(sample, documents):
+            if not known.issuperset(document):
+                unknown_keys += 1
+            if needs_conform:
+                yield [conform(document.get(name), stats) for name, stats in fields]
+            else:
+                yield [document.get(name) for name in names]
+
+    started = time.perf_counter()
+    loaded, failed = _load(statement, rows(), workers, batch_size)
+    summary = _summary(cursor, table, loaded, failed, time.perf_counter() - started,
+                       inferred_columns=count_columns(schema), with_unknown_top_level_keys=unknown_keys)
+    cursor.close()
+    connection.close()
+    return summary
+
+
+def ingest_dynamic(path, table, primary_key="id", workers=4, batch_size=1000, drop=True):
+    """
+    Load every document whole into one OBJECT(DYNAMIC) column, the way doc_json.py stores metadata.
+
+    This is the baseline the inferred schema is compared against.
+    """
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{table}")
+    cursor.execute(f"""
+    CREATE TABLE {doc_json.DB_SCHEMA}.{table} (
+        id BIGINT PRIMARY KEY,
+        document OBJECT(DYNAMIC)
+    )
+    """)
+    rows = ([document.get(primary_key), document] for document in iter_documents(path))
+
+    started = time.perf_counter()
+    loaded, failed = _load(f"INSERT INTO {doc_json.DB_SCHEMA}.{table} (id, document) VALUES (?, ?)",
+                           rows, workers, batch_size)
+    summary = _summary(cursor, table, loaded, failed, time.perf_counter() - started)
+    cursor.close()
+    connection.close()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="NDJSON / JSON Lines file, optionally .gz")
+    parser.add_argument("--table", default=f"{doc_json.TABLE_NAME}_ndjson")
+    parser.add_argument("--sample", type=int, default=1000, help="documents used to infer the schema")
+    parser.add_argument("--mode", choices=["strict", "dynamic"], default="strict",
+                        help="column policy of the inferred nested objects")
+    parser.add_argument("--index", nargs="*", default=None,
+                        help="dotted field paths to index; all other fields get INDEX OFF")
+    parser.add_argument("--primary-key", default="id")
+    parser.add_argument("--max-object-keys", type=int, default=MAX_OBJECT_KEYS,
+                        help="objects with more distinct keys are stored as OBJECT(IGNORED)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--print-schema", action="store_true",
+                        help="only print the inferred CREATE TABLE statement")
+    args = parser.parse_args()
+
+    if args.print_schema:
+        schema = infer_schema(islice(iter_documents(args.path), args.sample), args.max_object_keys)
+        print(create_table_sql(schema, args.table, args.mode, args.index, args.primary_key))
+        return 0
+
+    summary = ingest(args.path, args.table, args.sample, args.mode, args.index, args.primary_key,
+                     args.workers, args.batch_size, args.max_object_keys)
+    print(f"✅ Loaded {summary['documents']:,} documents into {doc_json.DB_SCHEMA}.{args.table} "
+          f"in {summary['seconds']}s ({summary['docs_per_sec']:,.0f} docs/s)")
+    print(f"   {summary['columns']} columns ({summary['inferred_columns']} inferred from the sample)")
+    if summary["failed"]:
+        print(f"⚠️ {summary['failed']:,} documents were rejected by the table schema")
+    if summary["with_unknown_top_level_keys"]:
+        print(f"⚠️ {summary['with_unknown_top_level_keys']:,} documents had top-level keys "
+              f"missing from the sample; those keys were not loaded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
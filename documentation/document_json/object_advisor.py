@@ -0,0 +1,371 @@
+"""
+Index and generated-column advisor for OBJECT columns, driven by recorded queries.
+
+doc_json.py filters on deep paths such as metadata['profile']['preferences']['food']
+and 'AI' = ANY(metadata['skills']), but its schema only declares metadata['city'].
+Instead of guessing which paths deserve attention, this tool:
+
+1. records the statements an application actually runs (RecordingCursor wraps any
+   cursor; QueryLog can be saved as JSON lines and analysed later),
+2. finds every path inside the OBJECT column and how it is used: filtered on,
+   matched with ANY(), sorted or grouped by, or only selected,
+3. proposes DDL against the live schema from information_schema.columns:
+   - typed sub-columns for hot paths that are not mapped yet,
+   - generated top-level columns for hot nested paths,
+   - INDEX OFF, and for TEXT also STORAGE WITH (columnstore = false), for mapped
+     sub-columns that no recorded query filters, sorts or groups on,
+4. builds a copy of the table with the proposals applied, runs every recorded
+   query against the original and the copy (with hot paths rewritten to their
+   generated columns), and reports the median latency before and after.
+
+The original table is never altered: the copy's CREATE TABLE statement is the
+proposal to review.
+
+    python3 documentation/document_json/object_advisor.py --users 50000
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+from collections import Counter, defaultdict
+import doc_json
+
+FILTER, ANY, SORT, GROUP, SELECT = "filter", "any", "sort", "group", "select"
+HOT = {FILTER, ANY, SORT, GROUP}
+
+_CLAUSE = re.compile(r"\b(WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT)\b", re.IGNORECASE)
+_CONTEXT = {"WHERE": FILTER, "HAVING": FILTER, "GROUPBY": GROUP, "ORDERBY": SORT, "LIMIT": None}
+_INFO_SCHEMA_PATH = re.compile(r"\['([^']+)'\]")
+
+
+class QueryLog:
+    """Distinct statements with how often they ran, their total time and one sample of parameters."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def record(self, statement, params, seconds):
+        statement = " ".join(statement.split())
+        entry = self.entries.setdefault(statement, {"count": 0, "seconds": 0.0, "params": params})
+        entry["count"] += 1
+        entry["seconds"] += seconds
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for statement, entry in self.entries.items():
+                f.write(json.dumps({"statement": statement, **entry}, default=list) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        log = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                log.entries[entry.pop("statement")] = entry
+        return log
+
+
+class RecordingCursor:
+    """Cursor wrapper that records every execute() into a QueryLog and otherwise behaves like the cursor."""
+
+    def __init__(self, cursor, log=None):
+        self._cursor = cursor
+        self.log = log if log is not None else QueryLog()
+
+    def execute(self, statement, params=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(statement, params)
+        finally:
+            self.log.record(statement, params, time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def extract_paths(statement, column="metadata"):
+    """Return {path tuple: set of usages} for every column['a']['b']... reference in the statement."""
+    reference = re.compile(rf"\b{re.escape(column)}((?:\['[^']+'\])+)")
+    usages = defaultdict(set)
+    bounds = [(0, SELECT)]
+    for match in _CLAUSE.finditer(statement):
+        bounds.append((match.start(), _CONTEXT[re.sub(r"\s+", "", match.group(1).upper())]))
+    bounds.append((len(statement), None))
+
+    for (start, context), (end, _) in zip(bounds, bounds[1:]):
+        if context is None:
+            continue
+        clause = statement[start:end]
+        for match in reference.finditer(clause):
+            path = tuple(_INFO_SCHEMA_PATH.findall(match.group(1)))
+            usage = context
+            if context == FILTER and re.search(r"ANY\s*\(\s*$", clause[:match.start()], re.IGNORECASE):
+                usage = ANY
+            usages[path].add(usage)
+    return usages
+
+
+def path_usage(log, column="metadata"):
+    """Counter of (path, usage) weighted by how often each statement ran."""
+    usage = Counter()
+    for statement, entry in log.entries.items():
+        for path, kinds in extract_paths(statement, column).items():
+            for kind in kinds:
+                usage[path, kind] += entry["count"]
+    return usage
+
+
+def schema_columns(cursor, table, column="metadata"):
+    """Return ({top-level column: data_type}, {object path: data_type}) from information_schema."""
+    cursor.execute("""
+    SELECT column_name, data_type FROM information_schema.columns
+    WHERE table_schema = ? AND table_name = ?
+    ORDER BY ordinal_position
+    """, (doc_json.DB_SCHEMA, table))
+    top, paths = {}, {}
+    for name, data_type in cursor.fetchall():
+        if name.startswith(f"{column}["):
+            paths[tuple(_INFO_SCHEMA_PATH.findall(name))] = data_type
+        elif "[" not in name:
+            top[name] = data_type
+    return top, paths
+
+
+def sql_type(data_type):
+    """information_schema data_type -> DDL type, e.g. text_array -> ARRAY(TEXT)."""
+    if data_type.endswith("_array"):
+        return f"ARRAY({sql_type(data_type[:-len('_array')])})"
+    return data_type.upper()
+
+
+def path_sql(column, path):
+    return column + "".join(f"['{key}']" for key in path)
+
+
+def generated_name(column, path):
+    return re.sub(r"\W", "_", "_".join((column,) + path)).lower()
+
+
+def _sample_type(cursor, table, column, path):
+    """Guess the type of an unmapped path from stored values."""
+    cursor.execute(
+        f"SELECT {path_sql(column, path)} FROM {doc_json.DB_SCHEMA}.{table} "
+        f"WHERE {path_sql(column, path)} IS NOT NULL LIMIT 100")
+    values = [row[0] for row in cursor.fetchall()]
+    if values and all(isinstance(v, list) for v in values):
+        items = [item for v in values for item in v]
+        return f"{_python_type(items)}_array"
+    return _python_type(values)
+
+
+def _python_type(values):
+    if values and all(isinstance(v, bool) for v in values):
+        return "boolean"
+    if values and all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return "bigint"
+    if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "double precision"
+    return "text"
+
+
+def advise(log, cursor, table=doc_json.TABLE_NAME, column="metadata", min_count=1):
+    """Return a list of suggestion dicts with kind, path, data_type, ddl and reason."""
+    usage = path_usage(log, column)
+    _, mapped = schema_columns(cursor, table, column)
+    hot = Counter()
+    for (path, kind), count in usage.items():
+        if kind in HOT:
+            hot[path] += count
+
+    suggestions = []
+    for path, count in hot.most_common():
+        if count < min_count:
+            continue
+        kinds = sorted(kind for (p, kind) in usage if p == path and kind in HOT)
+        reason = f"{', '.join(kinds)} in {count} recorded executions"
+        data_type = mapped.get(path)
+        if data_type is None:
+            data_type = _sample_type(cursor, table, column, path)
+            suggestions.append({
+                "kind": "typed_subcolumn", "path": path, "data_type": data_type, "reason": reason,
+                "ddl": f"{path_sql(column, path)} {sql_type(data_type)} (declare in the OBJECT definition)",
+            })
+        if len(path) > 1:
+            name = generated_name(column, path)
+            suggestions.append({
+                "kind": "generated_column", "path": path, "data_type": data_type, "name": name,
+                "reason": reason,
+                "ddl": (f"ALTER TABLE {doc_json.DB_SCHEMA}.{table} ADD COLUMN {name} {sql_type(data_type)} "
+                        f"GENERATED ALWAYS AS {path_sql(column, path)}"),
+            })
+
+    parents = {path[:i] for path in mapped for i in range(1, len(path))}
+    for path, data_type in mapped.items():
+        if path in hot or path in parents or data_type == "object":
+            continue
+        storage = " STORAGE WITH (columnstore = false)" if data_type == "text" else ""
+        used = "only selected" if (path, SELECT) in usage else "never used"
+        suggestions.append({
+            "kind": "index_off", "path": path, "data_type": data_type,
+            "reason": f"{used} in the recorded queries",
+            "ddl": f"{path_sql(column, path)} {sql_type(data_type)} INDEX OFF{storage}",
+        })
+    return suggestions
+
+
+def _object_sql(tree, types, cold, path=()):
+    parts = []
+    for key, children in sorted(tree.items()):
+        sub = path + (key,)
+        if children:
+            parts.append(f'"{key}" OBJECT(DYNAMIC) AS ({_object_sql(children, types, cold, sub)})')
+            continue
+        definition = f'"{key}" {sql_type(types[sub])}'
+        if sub in cold:
+            definition += " INDEX OFF"
+            if types[sub] == "text":
+                definition += " STORAGE WITH (columnstore = false)"
+        parts.append(definition)
+    return ", ".join(parts)
+
+
+def advised_table_sql(cursor, table, target, suggestions, column="metadata", primary_key="id"):
+    """CREATE TABLE statement for a copy of `table` with all suggestions applied."""
+    top, mapped = schema_columns(cursor, table, column)
+    types = dict(mapped)
+    for suggestion in suggestions:
+        if suggestion["kind"] == "typed_subcolumn":
+            types[suggestion["path"]] = suggestion["data_type"]
+    cold = {s["path"] for s in suggestions if s["kind"] == "index_off"}
+
+    tree = {}
+    for path in types:
+        node = tree
+        for key in path:
+            node = node.setdefault(key, {})
+
+    columns = []
+    for name, data_type in top.items():
+        if name == column:
+            columns.append(f'"{name}" OBJECT(DYNAMIC) AS ({_object_sql(tree, types, cold)})')
+        else:
+            columns.append(f'"{name}" {sql_type(data_type)}' + (" PRIMARY KEY" if name == primary_key else ""))
+    for suggestion in suggestions:
+        if suggestion["kind"] == "generated_column":
+            columns.append(f"{suggestion['name']} {sql_type(suggestion['data_type'])} "
+                           f"GENERATED ALWAYS AS {path_sql(column, suggestion['path'])}")
+    body = ",\n        ".join(columns)
+    return f"CREATE TABLE {doc_json.DB_SCHEMA}.{target} (\n        {body}\n    )", list(top)
+
+
+def build_advised_copy(cursor, table, target, suggestions, column="metadata"):
+    statement, columns = advised_table_sql(cursor, table, target, suggestions, column)
+    cursor.execute(f"DROP TABLE IF EXISTS {doc_json.DB_SCHEMA}.{target}")
+    cursor.execute(statement)
+    names = ", ".join(f'"{name}"' for name in columns)
+    cursor.execute(f"INSERT INTO {doc_json.DB_SCHEMA}.{target} ({names}) "
+                   f"SELECT {names} FROM {doc_json.DB_SCHEMA}.{table}")
+    cursor.execute(f"REFRESH TABLE {doc_json.DB_SCHEMA}.{target}")
+    return statement
+
+
+def rewrite(statement, table, target, suggestions, column="metadata"):
+    """Point a recorded statement at the advised copy and use generated columns for hot paths."""
+    statement = statement.replace(f"{doc_json.DB_SCHEMA}.{table}", f"{doc_json.DB_SCHEMA}.{target}")
+    generated = [s for s in suggestions if s["kind"] == "generated_column"]
+    # Longest paths first, so a parent path never replaces part of a child path.
+    for suggestion in sorted(generated, key=lambda s: -len(s["path"])):
+        statement = re.sub(re.escape(path_sql(column, suggestion["path"])) + r"(?!\[)",
+                           suggestion["name"], statement)
+    return statement
+
+
+def _median_ms(cursor, statement, params, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        cursor.execute(statement, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure(cursor, log, table, target, suggestions, column="metadata", repeats=10):
+    """Yield (statement, before_ms, after_ms) for every recorded SELECT."""
+    for statement, entry in log.entries.items():
+        if not statement.upper().startswith("SELECT"):
+            continue
+        before = _median_ms(cursor, statement, entry["params"], repeats)
+        after = _median_ms(cursor, rewrite(statement, table, target, suggestions, column),
+                           entry["params"], repeats)
+        yield statement, before, after
+
+
+def run_doc_json_queries(cursor, table):
+    """The read queries doc_json.py runs, as the workload to advise on."""
+    source = f"{doc_json.DB_SCHEMA}.{table}"
+    for _ in range(5):
+        cursor.execute(f"SELECT name, metadata['city'] FROM {source}")
+        cursor.execute(f"SELECT name, metadata['skills'] FROM {source} WHERE metadata['skills'] IS NOT NULL")
+        cursor.execute(f"SELECT name FROM {source} WHERE 'AI' = ANY(metadata['skills'])")
+        cursor.execute(f"""
+            SELECT name, metadata['profile']['preferences']['food'] FROM {source}
+            WHERE metadata['profile']['preferences']['food'] IS NOT NULL
+        """)
+        cursor.execute(f"""
+            SELECT metadata['profile']['preferences']['language'], COUNT(*) FROM {source}
+            GROUP BY metadata['profile']['preferences']['language']
+            ORDER BY 2 DESC
+        """)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50_000, help="copies of doc_json.USERS to load")
+    parser.add_argument("--log", help="analyse this saved QueryLog instead of running doc_json's queries")
+    parser.add_argument("--table", default=f"{doc_json.TABLE_NAME}_advisor")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    table, target = args.table, f"{args.table}_advised"
+
+    if args.log:
+        log = QueryLog.load(args.log)
+    else:
+        doc_json.create_table(cursor, table)
+        rows = [(i, f"{name}_{i}", age, metadata)
+                for i in range(1, args.users + 1)
+                for _, name, age, metadata in [doc_json.USERS[i % len(doc_json.USERS)]]]
+        for start in range(0, len(rows), 5000):
+            cursor.executemany(
+                f"INSERT INTO {doc_json.DB_SCHEMA}.{table} (id, name, age, metadata) VALUES (?, ?, ?, ?)",
+                rows[start:start + 5000])
+        cursor.execute(f"REFRESH TABLE {doc_json.DB_SCHEMA}.{table}")
+        recorder = RecordingCursor(cursor)
+        run_doc_json_queries(recorder, table)
+        log = recorder.log
+
+    suggestions = advise(log, cursor, table)
+    print("💡 Suggestions:")
+    for suggestion in suggestions:
+        print(f"   [{suggestion['kind']}] {path_sql('metadata', suggestion['path'])}: {suggestion['reason']}")
+        print(f"      {suggestion['ddl']}")
+
+    statement = build_advised_copy(cursor, table, target, suggestions)
+    print(f"\n📐 Advised table:\n    {statement}\n")
+
+    print(f"{'before (ms)':>12} {'after (ms)':>11}  statement")
+    for query, before, after in measure(cursor, log, table, target, suggestions, repeats=args.repeats):
+        print(f"{before:>12.2f} {after:>11.2f}  {query[:90]}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Optimistic concurrency control for read-modify-write document updates.
+
+A read-modify-write such as SELECT metadata -> edit -> UPDATE SET metadata = ?
+silently loses updates when two writers read the same version: the second UPDATE
+overwrites the first. Instead of serialising writers with an application lock,
+versioned_update() uses the version MonkDB keeps for every row:
+
+1. read the document together with its _seq_no and _primary_term,
+2. apply the change in Python,
+3. UPDATE ... WHERE id = ? AND _seq_no = ? AND _primary_term = ?, which only
+   matches if nobody wrote the row in between,
+4. on a conflict (0 rows updated) wait a random, exponentially growing delay
+   ("full jitter") and start again from step 1.
+
+UpdateStats counts attempts and conflicts across threads so the conflict rate of
+a workload can be reported. Use doc_patch.py instead when the change can be
+expressed as field assignments, which need no read and cannot conflict.
+
+    python3 documentation/document_json/versioned_update.py
+"""
+
+import copy
+import random
+import threading
+import time
+import doc_json
+
+
+class ConflictError(Exception):
+    """Raised when a versioned update still conflicts after all retries."""
+
+
+class UpdateStats:
+    """Thread-safe counters for versioned updates."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.conflicts = 0
+        self.updated = 0
+        self.gave_up = 0
+
+    def record(self, attempts, conflicts, updated):
+        with self._lock:
+            self.attempts += attempts
+            self.conflicts += conflicts
+            if updated:
+                self.updated += 1
+            else:
+                self.gave_up += 1
+
+    @property
+    def conflict_rate(self):
+        """Share of UPDATE attempts that hit a concurrent write."""
+        return self.conflicts / self.attempts if self.attempts else 0.0
+
+
+def read_versioned(cursor, doc_id, column="metadata", table=doc_json.TABLE_NAME):
+    """Return (value, seq_no, primary_term) of one document, or None if it does not exist."""
+    cursor.execute(
+        f"SELECT {column}, _seq_no, _primary_term FROM {doc_json.DB_SCHEMA}.{table} WHERE id = ?",
+        (doc_id,))
+    return cursor.fetchone()
+
+
+def update_if_unchanged(cursor, doc_id, value, seq_no, primary_term, column="metadata",
+                        table=doc_json.TABLE_NAME):
+    """Write `value` only if the row is still at (seq_no, primary_term). Returns True on success."""
+    cursor.execute(
+        f"UPDATE {doc_json.DB_SCHEMA}.{table} SET {column} = ? "
+        f"WHERE id = ? AND _seq_no = ? AND _primary_term = ?",
+        (value, doc_id, seq_no, primary_term))
+    return cursor.rowcount == 1
+
+
+def versioned_update(cursor, doc_id, mutate, column="metadata", table=doc_json.TABLE_NAME,
+                     max_retries=10, base_delay=0.005, max_delay=0.5, stats=None):
+    """
+    Apply `mutate(value) -> new_value` to one document with optimistic concurrency.
+
+    `mutate` receives a copy of the current value and may be called several times,
+    once per attempt. Returns the value that was written. Raises KeyError if the
+    document does not exist and ConflictError after `max_retries` conflicts.
+    """
+    conflicts = 0
+    for attempt in range(max_retries + 1):
+        current = read_versioned(cursor, doc_id, column, table)
+        if current is None:
+            raise KeyError(doc_id)
+        value, seq_no, primary_term = current
+        new_value = mutate(copy.deepcopy(value))
+        if update_if_unchanged(cursor, doc_id, new_value, seq_no, primary_term, column, table):
+            if stats is not None:
+                stats.record(attempt + 1, conflicts, True)
+            return new_value
+        conflicts += 1
+        # Full jitter: spreads retrying writers out instead of letting them collide again.
+        time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+    if stats is not None:
+        stats.record(max_retries + 1, conflicts, False)
+    raise ConflictError(f"Document {doc_id} kept changing after {max_retries} retries")
+
+
+def main():
+    connection = doc_json.connect()
+    cursor = connection.cursor()
+    doc_json.create_table(cursor)
+    cursor.executemany(
+        f"INSERT INTO {doc_json.DB_SCHEMA}.{doc_json.TABLE_NAME} (id, name, age, metadata) VALUES (?, ?, ?, ?)",
+        doc_json.USERS)
+
+    def move_to_paris(metadata):
+        metadata["city"] = "Paris"
+        metadata.setdefault("history", []).append("New York")
+        return metadata
+
+    stats = UpdateStats()
+    metadata = versioned_update(cursor, 1, move_to_paris, stats=stats)
+    print(f"✏️ Alice's metadata after a versioned update: {metadata}")
+    print(f"   attempts: {stats.attempts}, conflicts: {stats.conflicts}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Measures shapes/sec of geo_loader.py against the per-row approach of geo.py, for
+generation and for loading, with 1M points and 100k polygons by default.
+
+The per-row baseline is only run on a sample (--baseline-sample) and reported as
+a rate, since running it for the full counts takes hours.
+
+MultiPolygons (--parts members each) and GeometryCollections (--members each) are
+generated with the grid-cell generators and loaded the same way. The rejection
+approach of other_shapes.py (draw polygons until they are disjoint) is timed on a
+few shapes for comparison; it gives up after --max-attempts draws per member.
+
+    python3 documentation/geospatial/benchmark_geo_loader.py
+    python3 documentation/geospatial/benchmark_geo_loader.py --skip-db
+    python3 documentation/geospatial/benchmark_geo_loader.py --multipolygons 10000 --parts 200 --skip-db
+"""
+
+import argparse
+import time
+import numpy as np
+import geo
+from shapely.geometry import Polygon
+from geo_loader import (BATCH_SIZE, insert_points, insert_shapes, polygons_to_wkt, random_convex_polygons,
+                        random_geometry_collections, random_multipolygons, random_points)
+
+
+def _rate(count, seconds):
+    return f"{count / seconds:>12,.0f}/s"
+
+
+def rejection_multipolygon(parts, max_attempts):
+    """other_shapes.py's approach, for `parts` members: redraw each polygon until it is disjoint from the rest."""
+    members = []
+    for _ in range(parts):
+        for _ in range(max_attempts):
+            candidate = Polygon(geo.generate_valid_convex_polygon())
+            if all(candidate.disjoint(member) for member in members):
+                members.append(candidate)
+                break
+        else:
+            return None
+    return members
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--polygons", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--baseline-sample", type=int, default=2_000,
+                        help="rows generated/inserted the old way to estimate its rate")
+    parser.add_argument("--multipolygons", type=int, default=10_000)
+    parser.add_argument("--parts", type=int, default=100, help="polygons per MultiPolygon")
+    parser.add_argument("--collections", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=100, help="geometries per GeometryCollection")
+    parser.add_argument("--max-attempts", type=int, default=1_000,
+                        help="draws per member before the rejection baseline gives up")
+    parser.add_argument("--skip-db", action="store_true",
+                        help="only benchmark generation, do not load MonkDB")
+    args = parser.parse_args()
+    rng = np.random.default_rng(42)
+
+    print(f"⏱️ Generating {args.points:,} points and {args.polygons:,} polygons")
+    start = time.perf_counter()
+    points = random_points(args.points, rng)
+    print(f"{'points (numpy)':<36} {_rate(args.points, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    wkts = polygons_to_wkt(random_convex_polygons(args.polygons, rng=rng))
+    print(f"{'polygons + WKT (shapely arrays)':<36} {_rate(args.polygons, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for _ in range(args.baseline_sample):
+        coords = geo.generate_valid_convex_polygon()
+        _ = 'POLYGON ((' + ', '.join([f"{lon} {lat}" for lon, lat in coords]) + '))'
+    print(f"{'polygons + WKT (geo.py loop)':<36} {_rate(args.baseline_sample, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    multi_wkts = polygons_to_wkt(random_multipolygons(args.multipolygons, args.parts, rng=rng))
+    print(f"{f'{args.parts}-part multipolygons (grid)':<36} {_rate(args.multipolygons, time.perf_counter() - start)}")
+
+    for parts in sorted({2, min(args.parts, 8)}):
+        start = time.perf_counter()
+        built = sum(rejection_multipolygon(parts, args.max_attempts) is not None for _ in range(20))
+        label = f"{parts}-part multipolygons (rejection)"
+        if built < 20:
+            print(f"{label:<36} gave up on {20 - built} of 20 shapes")
+        else:
+            print(f"{label:<36} {_rate(20, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    collection_wkts = polygons_to_wkt(random_geometry_collections(args.collections, args.members, rng=rng))
+    print(f"{f'{args.members}-member collections (grid)':<36} {_rate(args.collections, time.perf_counter() - start)}")
+
+    if args.skip_db:
+        return
+
+    connection = geo.connect()
+    cursor = connection.cursor()
+    geo.create_tables(cursor)
+
+    print(f"\n⏱️ Loading in batches of {args.batch_size:,}")
+    start = time.perf_counter()
+    insert_points(cursor, points, batch_size=args.batch_size)
+    print(f"{'points (batched)':<36} {_rate(args.points, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    insert_shapes(cursor, wkts, batch_size=args.batch_size)
+    print(f"{'polygons (batched)':<36} {_rate(args.polygons, time.perf_counter() - start)}")
+
+    # The old path, one execute per row, on a sample with ids past the bulk load.
+    sample = args.baseline_sample
+    start = time.perf_counter()
+    for i, (lon, lat) in enumerate(random_points(sample, rng).tolist(), start=args.points + 1):
+        cursor.execute(
+            f"INSERT INTO {geo.DB_SCHEMA}.{geo.GEO_POINTS_TABLE}(id, location) VALUES (?, ?)",
+            (i, [lon, lat]),
+        )
+    print(f"{'points (one execute per row)':<36} {_rate(sample, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i, wkt in enumerate(wkts[:sample], start=args.polygons + 1):
+        cursor.execute(
+            f"INSERT INTO {geo.DB_SCHEMA}.{geo.GEO_SHAPE_TABLE} (id, area) VALUES (?, ?)",
+            (i, wkt),
+        )
+    print(f"{'polygons (one execute per row)':<36} {_rate(min(sample, len(wkts)), time.perf_counter() - start)}")
+
+    # Multi-part shapes are large documents, so they go in smaller batches.
+    next_id = args.polygons + sample + 1
+    for label, shapes in [("multipolygons (batched)", multi_wkts),
+                          ("collections (batched)", collection_wkts)]:
+        start = time.perf_counter()
+        insert_shapes(cursor, shapes, start_id=next_id, batch_size=max(1, args.batch_size // 100))
+        print(f"{label:<36} {_rate(len(shapes), time.perf_counter() - start)}")
+        next_id += len(shapes)
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compares raw and simplified GEO_SHAPE payloads for every profile in simplify.PROFILES.
+
+Detailed coastline-like polygons (geo_loader.random_coastlines) are simplified with
+each profile, and the harness reports:
+
+- vertices and WKT bytes, and their reduction against the raw geometries,
+- preprocessing time,
+- insert time of all polygons into a fresh table per profile,
+- p50 latency of intersects(area, viewport) queries over that table,
+- p50 latency of within(location, polygon) over a points table, with the
+  simplified polygon sent as the query parameter as geo.py does.
+
+    python3 documentation/geospatial/benchmark_simplify.py
+    python3 documentation/geospatial/benchmark_simplify.py --polygons 500 --vertices 20000 --skip-db
+"""
+
+import argparse
+import statistics
+import time
+import numpy as np
+import shapely
+import geo
+from geo_loader import insert_points, insert_shapes, polygons_to_wkt, random_coastlines, random_points
+from simplify import PROFILES, payload_stats, simplify_profile
+
+QUERY_REPEATS = 30
+
+
+def _p50_ms(cursor, statement, params):
+    timings = []
+    for args in params:
+        started = time.perf_counter()
+        cursor.execute(statement, args)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure_database(cursor, profile, geometries, points_table, viewports):
+    table = f"{geo.GEO_SHAPE_TABLE}_simplify_{profile}"
+    cursor.execute(f"DROP TABLE IF EXISTS {geo.DB_SCHEMA}.{table}")
+    cursor.execute(f"""
+    CREATE TABLE {geo.DB_SCHEMA}.{table} (
+        id INTEGER PRIMARY KEY,
+        area GEO_SHAPE
+    ) WITH (number_of_replicas = 0)
+    """)
+
+    wkts = polygons_to_wkt(geometries, precision=15)
+    started = time.perf_counter()
+    insert_shapes(cursor, wkts, table=table, batch_size=100)
+    insert_seconds = time.perf_counter() - started
+    cursor.execute(f"REFRESH TABLE {geo.DB_SCHEMA}.{table}")
+
+    intersects_ms = _p50_ms(
+        cursor,
+        f"SELECT id FROM {geo.DB_SCHEMA}.{table} WHERE intersects(area, ?)",
+        [(viewport,) for viewport in viewports])
+    within_ms = _p50_ms(
+        cursor,
+        f"SELECT COUNT(*) FROM {geo.DB_SCHEMA}.{points_table} WHERE within(location, ?)",
+        [(wkt,) for wkt in wkts[:QUERY_REPEATS]])
+
+    cursor.execute(f"DROP TABLE IF EXISTS {geo.DB_SCHEMA}.{table}")
+    return insert_seconds, intersects_ms, within_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polygons", type=int, default=200)
+    parser.add_argument("--vertices", type=int, default=5_000)
+    parser.add_argument("--points", type=int, default=200_000)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--skip-db", action="store_true",
+                        help="only report payload reduction and preprocessing time")
+    args = parser.parse_args()
+    rng = np.random.default_rng(42)
+
+    raw = random_coastlines(args.polygons, args.vertices, rng=rng)
+    raw_stats = payload_stats(raw)
+
+    cursor = connection = None
+    points_table = f"{geo.GEO_POINTS_TABLE}_simplify"
+    viewports = []
+    if not args.skip_db:
+        connection = geo.connect()
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {geo.DB_SCHEMA}.{points_table}")
+        cursor.execute(f"""
+        CREATE TABLE {geo.DB_SCHEMA}.{points_table} (
+            id INTEGER PRIMARY KEY,
+            location GEO_POINT
+        ) WITH (number_of_replicas = 0)
+        """)
+        insert_points(cursor, random_points(args.points, rng) / [3.6, 1.8], table=points_table)
+        cursor.execute(f"REFRESH TABLE {geo.DB_SCHEMA}.{points_table}")
+        corners = rng.uniform(-50, 45, (QUERY_REPEATS, 2))
+        viewports = shapely.to_wkt(shapely.box(corners[:, 0], corners[:, 1],
+                                               corners[:, 0] + 5, corners[:, 1] + 5)).tolist()
+
+    print(f"{args.polygons:,} polygons, {raw_stats['vertices']:,} vertices, "
+          f"{raw_stats['wkt_bytes'] / 1e6:.1f} MB of WKT\n")
+    header = f"{'profile':<10} {'vertices':>10} {'MB':>7} {'saved':>6} {'prep (s)':>9}"
+    if cursor is not None:
+        header += f" {'insert (s)':>11} {'intersects p50':>15} {'within p50':>11}"
+    print(header)
+    for profile in args.profiles:
+        started = time.perf_counter()
+        geometries = simplify_profile(raw, profile)
+        prep_seconds = time.perf_counter() - started
+        stats = payload_stats(geometries)
+        saved = 1 - stats["wkt_bytes"] / raw_stats["wkt_bytes"]
+
+        line = (f"{profile:<10} {stats['vertices']:>10,} {stats['wkt_bytes'] / 1e6:>7.1f} "
+                f"{saved:>6.0%} {prep_seconds:>9.2f}")
+        if cursor is not None:
+            insert_seconds, intersects_ms, within_ms = measure_database(
+                cursor, profile, geometries, points_table, viewports)
+            line += f" {insert_seconds:>11.2f} {intersects_ms:>12.2f} ms {within_ms:>8.2f} ms"
+        print(line)
+
+    if cursor is not None:
+        cursor.execute(f"DROP TABLE IF EXISTS {geo.DB_SCHEMA}.{points_table}")
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Replays simulated map pan/zoom sessions against MonkDB with and without tile_cache.
+
+A session is a sequence of viewport boxes: the viewport mostly pans by a fraction
+of its width and sometimes zooms in or out by a factor of two, the way a user
+moves around a map. Every viewport is answered twice:
+
+- direct: one within(location, viewport) query per viewport, as geo.py does,
+- cached: TiledPointCache.within(viewport).
+
+The harness reports p50/p99 latency and the number of database queries for each,
+and checks that both return the same points.
+
+    python3 documentation/geospatial/benchmark_tile_cache.py
+    python3 documentation/geospatial/benchmark_tile_cache.py --sessions 20 --steps 100 --points 2000000
+"""
+
+import argparse
+import statistics
+import time
+import numpy as np
+import shapely
+import geo
+from geo_loader import insert_points, random_points
+from tile_cache import TiledPointCache
+
+
+def pan_zoom_session(steps, rng, start_width=20.0):
+    """Yield viewport boxes for one simulated session inside lon/lat [-50, 50]."""
+    center = rng.uniform(-30, 30, 2)
+    width = start_width
+    for _ in range(steps):
+        if rng.random() < 0.2:
+            width = float(np.clip(width * rng.choice([0.5, 2.0]), 1.25, 40.0))
+        else:
+            center = center + rng.uniform(-0.3, 0.3, 2) * width
+        center = np.clip(center, -50 + width / 2, 50 - width / 2)
+        half = width / 2
+        yield shapely.box(center[0] - half, center[1] - half * 0.6,
+                          center[0] + half, center[1] + half * 0.6)
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[max(0, int(len(timings) * 0.99) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--ttl", type=float, default=300.0)
+    parser.add_argument("--max-tiles", type=int, default=4096)
+    parser.add_argument("--no-load", action="store_true",
+                        help="reuse the points table from a previous run")
+    args = parser.parse_args()
+    rng = np.random.default_rng(42)
+
+    connection = geo.connect()
+    cursor = connection.cursor()
+    table = f"{geo.GEO_POINTS_TABLE}_tiles"
+    if not args.no_load:
+        cursor.execute(f"DROP TABLE IF EXISTS {geo.DB_SCHEMA}.{table}")
+        cursor.execute(f"""
+        CREATE TABLE {geo.DB_SCHEMA}.{table} (
+            id INTEGER PRIMARY KEY,
+            location GEO_POINT
+        ) WITH (number_of_replicas = 0)
+        """)
+        print(f"⏱️ Loading {args.points:,} points")
+        insert_points(cursor, random_points(args.points, rng) / [3.6, 1.8], table=table)
+        cursor.execute(f"REFRESH TABLE {geo.DB_SCHEMA}.{table}")
+
+    viewports = [viewport for _ in range(args.sessions)
+                 for viewport in pan_zoom_session(args.steps, rng)]
+    wkts = shapely.to_wkt(viewports, rounding_precision=9).tolist()
+
+    direct, direct_counts = [], []
+    for wkt in wkts:
+        started = time.perf_counter()
+        cursor.execute(
+            f"SELECT id, location FROM {geo.DB_SCHEMA}.{table} WHERE within(location, ?)", (wkt,))
+        direct_counts.append(len(cursor.fetchall()))
+        direct.append((time.perf_counter() - started) * 1000)
+
+    cache = TiledPointCache(cursor, table=table, ttl=args.ttl, max_tiles=args.max_tiles)
+    cached, cached_counts = [], []
+    for viewport in viewports:
+        started = time.perf_counter()
+        cached_counts.append(len(cache.within(viewport)))
+        cached.append((time.perf_counter() - started) * 1000)
+
+    print(f"\n{len(viewports):,} viewports in {args.sessions} sessions, "
+          f"{statistics.mean(direct_counts):,.0f} points per viewport on average\n")
+    print(f"{'mode':<8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'db queries':>11}")
+    for name, timings, queries in [("direct", direct, len(wkts)),
+                                   ("cached", cached, cache.backend_queries)]:
+        p50, p99 = _percentiles(timings)
+        print(f"{name:<8} {p50:>9.2f} {p99:>9.2f} {queries:>11,}")
+    print(f"\nTile hits: {cache.tile_hits:,}, tile misses: {cache.tile_misses:,}")
+
+    mismatches = sum(a != b for a, b in zip(direct_counts, cached_counts))
+    if mismatches:
+        print(f"⚠️ {mismatches} viewports returned a different number of points "
+              f"(points on viewport edges or writes during the run)")
+    else:
+        print("✅ Cached results match the direct queries")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
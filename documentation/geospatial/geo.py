@@ -1,7 +1,6 @@
 import random
 from monkdb import client
-from shapely.geometry import Polygon, MultiPoint
-from shapely.validation import explain_validity
+from shapely.geometry import MultiPoint
 import configparser
 import os
 
@@ -52,123 +51,140 @@ DB_SCHEMA = config['database']['DB_SCHEMA']
 GEO_POINTS_TABLE = config['database']['GEO_POINTS_TABLE']
 GEO_SHAPE_TABLE = config['database']['GEO_SHAPE_TABLE']
 
-# Create a MonkDB connection
-try:
-    connection = client.connect(
+
+def connect():
+    """Open a new MonkDB connection using the credentials from config.ini."""
+    return client.connect(
         f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER
     )
-    cursor = connection.cursor()
-    print("✅ Database connection established successfully!")
-except Exception as e:
-    print(f"⚠️ Error connecting to the database: {e}")
-    exit(1)
-
-# Drop geo-points table if it exists
-cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{GEO_POINTS_TABLE}")
-print(f"Dropped {DB_SCHEMA}.{GEO_POINTS_TABLE} table")
-
-# Drop geo shapes table if it exists
-cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{GEO_SHAPE_TABLE}")
-print(f"Dropped {DB_SCHEMA}.{GEO_SHAPE_TABLE} table")
-
-"""
-Creates a table (geo_points) if it doesn't exist.
-id INTEGER PRIMARY KEY → Unique identifier for each point.
-location GEO_POINT → Stores geospatial points (latitude, longitude).
-WITH (number_of_replicas = 0) → No replication (useful for development).
-"""
-cursor.execute(f"""
-CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{GEO_POINTS_TABLE} (
-    id INTEGER PRIMARY KEY,
-    location GEO_POINT
-) WITH (number_of_replicas = 0);
-""")
-print(f"Table '{DB_SCHEMA}.{GEO_POINTS_TABLE}' has been created.")
 
-"""
-Creates a table (geo_shapes) to store polygons.
-area GEO_SHAPE → Stores polygon geometries in GeoJSON or WKT format.
-"""
-cursor.execute(f"""
-CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{GEO_SHAPE_TABLE} (
-    id INTEGER PRIMARY KEY,
-    area GEO_SHAPE
-) WITH (number_of_replicas = 0);
-""")
-print(f"Table '{DB_SCHEMA}.{GEO_SHAPE_TABLE}' has been created.")
-
-# Insert Synthetic Data
-num_points = 10
-num_shapes = 5
 
-"""
-Generates 10 random geographic points.
-Longitude range: -180 to 180
-Latitude range: -90 to 90
-Uses ? placeholders to prevent SQL injection.
-Inserts values as [lon, lat] (MonkDB's expected GEO_POINT format).
-"""
-for i in range(1, num_points + 1):
-    lon, lat = round(random.uniform(-180, 180),
-                     6), round(random.uniform(-90, 90), 6)
+def create_tables(cursor, points_table=GEO_POINTS_TABLE, shape_table=GEO_SHAPE_TABLE, drop=True):
+    """Create the geo_points and geo_shapes tables, dropping existing ones first by default."""
+    if drop:
+        # Drop geo-points table if it exists
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{points_table}")
+        print(f"Dropped {DB_SCHEMA}.{points_table} table")
+
+        # Drop geo shapes table if it exists
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{shape_table}")
+        print(f"Dropped {DB_SCHEMA}.{shape_table} table")
+
+    """
+    Creates a table (geo_points) if it doesn't exist.
+    id INTEGER PRIMARY KEY → Unique identifier for each point.
+    location GEO_POINT → Stores geospatial points (latitude, longitude).
+    WITH (number_of_replicas = 0) → No replication (useful for development).
+    """
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{points_table} (
+        id INTEGER PRIMARY KEY,
+        location GEO_POINT
+    ) WITH (number_of_replicas = 0);
+    """)
+    print(f"Table '{DB_SCHEMA}.{points_table}' has been created.")
+
+    """
+    Creates a table (geo_shapes) to store polygons.
+    area GEO_SHAPE → Stores polygon geometries in GeoJSON or WKT format.
+    """
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{shape_table} (
+        id INTEGER PRIMARY KEY,
+        area GEO_SHAPE
+    ) WITH (number_of_replicas = 0);
+    """)
+    print(f"Table '{DB_SCHEMA}.{shape_table}' has been created.")
+
+
+def main():
+    # Create a MonkDB connection
+    try:
+        connection = connect()
+        cursor = connection.cursor()
+        print("✅ Database connection established successfully!")
+    except Exception as e:
+        print(f"⚠️ Error connecting to the database: {e}")
+        exit(1)
+
+    create_tables(cursor)
+
+    # Insert Synthetic Data
+    num_points = 10
+    num_shapes = 5
+
+    """
+    Generates 10 random geographic points.
+    Longitude range: -180 to 180
+    Latitude range: -90 to 90
+    Uses ? placeholders to prevent SQL injection.
+    Inserts values as [lon, lat] (MonkDB's expected GEO_POINT format).
+    """
+    for i in range(1, num_points + 1):
+        lon, lat = round(random.uniform(-180, 180),
+                         6), round(random.uniform(-90, 90), 6)
+        cursor.execute(
+            f"INSERT INTO {DB_SCHEMA}.{GEO_POINTS_TABLE}(id, location) VALUES (?, ?)",
+            (i, [lon, lat]),
+        )
+        print(f"Inserted point ID {i} at location [{lon}, {lat}] in {DB_SCHEMA}.")
+
+    """
+    Generates valid polygons using generate_valid_convex_polygon().
+    Ensures polygons are closed.
+    Inserts WKT (Well-Known Text) format, which MonkDB supports.
+    """
+    for i in range(1, num_shapes + 1):
+        # Generate a valid convex polygon
+        coords = generate_valid_convex_polygon()
+
+        # Convert to WKT format
+        wkt_polygon = f'POLYGON ((' + \
+            ', '.join([f"{lon} {lat}" for lon, lat in coords]) + '))'
+
+        try:
+            cursor.execute(
+                f"INSERT INTO {DB_SCHEMA}.{GEO_SHAPE_TABLE} (id, area) VALUES (?, ?)",
+                (i, wkt_polygon),
+            )
+            print(f"Inserted shape ID {i} with WKT: {wkt_polygon} in {DB_SCHEMA}.")
+        except Exception as e:
+            print(f"Error inserting shape ID {i}: {e}")
+
+    """Verifies that points were inserted correctly."""
+    cursor.execute(f"SELECT * FROM {DB_SCHEMA}.{GEO_POINTS_TABLE};")
+    geo_points = cursor.fetchall()
+    print("\nGeo Points:")
+    for row in geo_points:
+        print(row)
+
+    """Retrieves and prints all inserted polygons."""
+    cursor.execute(f"SELECT * FROM {DB_SCHEMA}.{GEO_SHAPE_TABLE};")
+    geo_shapes = cursor.fetchall()
+    print("\nGeo Shapes:")
+    for row in geo_shapes:
+        print(row)
+
+    """
+    Finds all geo_points that are inside the given polygon/ It checks if a GEO_POINT exists inside a GEO_SHAPE.
+    Uses MonkDB's within() function.
+    """
+    polygon_wkt = 'POLYGON ((-10 -10, 10 -10, 10 10, -10 10, -10 -10))'
     cursor.execute(
-        f"INSERT INTO {DB_SCHEMA}.{GEO_POINTS_TABLE}(id, location) VALUES (?, ?)",
-        (i, [lon, lat]),
+        f"""
+        SELECT id, location FROM {DB_SCHEMA}.{GEO_POINTS_TABLE}
+        WHERE within(location, ?);
+    """,
+        (polygon_wkt,),
     )
-    print(f"Inserted point ID {i} at location [{lon}, {lat}] in {DB_SCHEMA}.")
+    print("\nPoints within given polygon:")
+    for row in cursor.fetchall():
+        print(row)
 
-"""
-Generates valid polygons using generate_valid_convex_polygon().
-Ensures polygons are closed.
-Inserts WKT (Well-Known Text) format, which MonkDB supports.
-"""
-for i in range(1, num_shapes + 1):
-    # Generate a valid convex polygon
-    coords = generate_valid_convex_polygon()
+    # Close connection
+    cursor.close()
+    connection.close()
 
-    # Convert to WKT format
-    wkt_polygon = f'POLYGON ((' + \
-        ', '.join([f"{lon} {lat}" for lon, lat in coords]) + '))'
 
-    try:
-        cursor.execute(
-            f"INSERT INTO {DB_SCHEMA}.{GEO_SHAPE_TABLE} (id, area) VALUES (?, ?)",
-            (i, wkt_polygon),
-        )
-        print(f"Inserted shape ID {i} with WKT: {wkt_polygon} in {DB_SCHEMA}.")
-    except Exception as e:
-        print(f"Error inserting shape ID {i}: {e}")
-
-"""Verifies that points were inserted correctly."""
-cursor.execute(f"SELECT * FROM {DB_SCHEMA}.{GEO_POINTS_TABLE};")
-geo_points = cursor.fetchall()
-print("\nGeo Points:")
-for row in geo_points:
-    print(row)
-
-"""Retrieves and prints all inserted polygons."""
-cursor.execute(f"SELECT * FROM {DB_SCHEMA}.{GEO_SHAPE_TABLE};")
-geo_shapes = cursor.fetchall()
-print("\nGeo Shapes:")
-for row in geo_shapes:
-    print(row)
-
-"""
-Finds all geo_points that are inside the given polygon/ It checks if a GEO_POINT exists inside a GEO_SHAPE.
-Uses MonkDB's within() function.
-"""
-polygon_wkt = 'POLYGON ((-10 -10, 10 -10, 10 10, -10 10, -10 -10))'
-cursor.execute(
-    f"""
-    SELECT id, location FROM {DB_SCHEMA}.{GEO_POINTS_TABLE}
-    WHERE within(location, ?);
-""",
-    (polygon_wkt,),
-)
-print("\nPoints within given polygon:")
-for row in cursor.fetchall():
-    print(row)
-
-# Close connection
-cursor.close()
-connection.close()
+if __name__ == "__main__":
+    main()
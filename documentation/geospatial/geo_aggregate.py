@@ -0,0 +1,104 @@
+"""
+Server-side aggregation of GEO_POINT tables for heatmaps and marker clustering.
+
+geo.py reads points with SELECT * and fetchall(), so every point crosses the wire.
+For a heatmap or clustered markers only a count and a position per cell are drawn,
+so this module groups the points inside MonkDB and returns one row per cell:
+
+- geohash_cells(): cells are geohash prefixes of `precision` characters
+  (5 characters is about 5 x 5 km), using the built-in geohash() function,
+- grid_cells(): cells are a regular lon/lat grid of `cell_size` degrees.
+
+Each row is (cell, count, centroid_lon, centroid_lat), where the centroid is the
+mean position of the points in the cell, so markers sit where the points are and
+not at the cell centre. Each call runs one GROUP BY and returns every cell, ordered
+by cell. The result is bounded by the number of cells, not the number of points,
+so pick a precision or cell size that suits the viewport: the server still reads
+every point inside `bounds` once.
+
+    python3 documentation/geospatial/geo_aggregate.py
+"""
+
+import math
+import shapely
+import geo
+
+
+def geohash_precision_for_zoom(zoom):
+    """Geohash length whose cells are roughly 16-32 pixels wide on a 256px web map tile at `zoom`."""
+    return max(1, min(12, (zoom + 5) // 2))
+
+
+def _bounds_filter(bounds):
+    if bounds is None:
+        return "", ()
+    if isinstance(bounds, (tuple, list)):
+        bounds = shapely.box(*bounds)
+    return " AND within(location, ?)", (shapely.to_wkt(bounds, rounding_precision=9),)
+
+
+def _aggregate(cursor, cell, bounds, table):
+    """Run one GROUP BY `cell` over the points inside `bounds` and return every cell, ordered by cell."""
+    where, params = _bounds_filter(bounds)
+    cursor.execute(f"""
+    SELECT {cell} AS cell, COUNT(*), AVG(longitude(location)), AVG(latitude(location))
+    FROM {geo.DB_SCHEMA}.{table}
+    WHERE location IS NOT NULL{where}
+    GROUP BY {cell}
+    ORDER BY cell
+    """, params)
+    return cursor.fetchall()
+
+
+def geohash_cells(cursor, precision, bounds=None, table=geo.GEO_POINTS_TABLE):
+    """
+    Return (geohash, count, centroid_lon, centroid_lat) per geohash cell of `precision` characters.
+
+    `bounds` limits the aggregation to a (min_lon, min_lat, max_lon, max_lat) box or
+    any Shapely polygon, e.g. the current map viewport.
+    """
+    return _aggregate(cursor, f"substr(geohash(location), 1, {int(precision)})", bounds, table)
+
+
+def grid_cells(cursor, cell_size, bounds=None, table=geo.GEO_POINTS_TABLE):
+    """
+    Return ((column, row), count, centroid_lon, centroid_lat) per `cell_size`-degree grid cell.
+
+    Column 0 starts at longitude -180 and row 0 at latitude -90.
+    """
+    columns = math.ceil(360 / cell_size)
+    # One BIGINT per cell keeps the GROUP BY to a single column.
+    cell = (f"(floor((latitude(location) + 90) / {float(cell_size)}) * {columns}"
+            f" + floor((longitude(location) + 180) / {float(cell_size)}))")
+    cells = []
+    for cell_id, count, lon, lat in _aggregate(cursor, cell, bounds, table):
+        row, column = divmod(int(cell_id), columns)
+        cells.append(((column, row), count, lon, lat))
+    return cells
+
+
+def main():
+    connection = geo.connect()
+    cursor = connection.cursor()
+
+    cursor.execute(f"SELECT COUNT(*) FROM {geo.DB_SCHEMA}.{geo.GEO_POINTS_TABLE}")
+    total = cursor.fetchone()[0]
+    print(f"✅ {total:,} points in {geo.DB_SCHEMA}.{geo.GEO_POINTS_TABLE}")
+
+    for precision in (1, 2, 3):
+        cells = geohash_cells(cursor, precision)
+        print(f"\n🔍 Geohash precision {precision}: {len(cells)} cells instead of {total:,} points")
+        for cell, count, lon, lat in sorted(cells, key=lambda c: -c[1])[:5]:
+            print(f"   {cell:<4} {count:>8,} points, centroid [{lon:.4f}, {lat:.4f}]")
+
+    viewport = (-20, -20, 20, 20)
+    cells = grid_cells(cursor, 10, bounds=viewport)
+    print(f"\n🔍 10° grid inside {viewport}: {len(cells)} cells, "
+          f"{sum(c[1] for c in cells):,} points")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Vectorised generation and batched loading of geo_points and geo_shapes.
+
+geo.py builds one polygon at a time in a Python rejection loop, joins its WKT by
+hand, and sends one INSERT per row. This module does the same work on whole arrays:
+
+- coordinates are drawn as NumPy arrays in one call,
+- polygons are built with Shapely 2.x array functions (shapely.multipoints,
+  shapely.convex_hull, shapely.is_valid, shapely.to_wkt), which loop in C,
+- the rare degenerate hull (collinear points give a LineString) is replaced by
+  regenerating just those rows, again as an array,
+- rows go to MonkDB through executemany in large batches, one HTTP request per batch.
+
+MultiPolygons and GeometryCollections are built without any rejection loop: every
+member gets its own cell of a grid laid over the shape's extent and is drawn inside
+that cell, so members are disjoint by construction and a shape with hundreds of
+parts takes one pass. With a seeded rng the output is fully deterministic.
+
+benchmark_geo_loader.py measures shapes/sec against the geo.py approach.
+"""
+
+import numpy as np
+import shapely
+import geo
+
+POLYGON_TYPE_ID = 3  # shapely.GeometryType.POLYGON
+BATCH_SIZE = 10_000
+
+
+def random_points(count, rng=None):
+    """Return a (count, 2) array of [lon, lat] pairs rounded to 6 decimals."""
+    rng = rng or np.random.default_rng()
+    points = np.column_stack([
+        rng.uniform(-180, 180, count),
+        rng.uniform(-90, 90, count),
+    ])
+    return np.round(points, 6)
+
+
+def random_convex_polygons(count, num_points=4, bounds=(-50, 50), rng=None):
+    """Return an array of `count` valid convex Shapely polygons."""
+    rng = rng or np.random.default_rng()
+    polygons = np.empty(count, dtype=object)
+    todo = np.arange(count)
+    while len(todo):
+        coords = np.round(rng.uniform(bounds[0], bounds[1], (len(todo), num_points, 2)), 6)
+        hulls = shapely.convex_hull(shapely.multipoints(coords))
+        ok = (shapely.get_type_id(hulls) == POLYGON_TYPE_ID) & shapely.is_valid(hulls)
+        polygons[todo[ok]] = hulls[ok]
+        todo = todo[~ok]
+    return polygons
+
+
+def random_coastlines(count, vertices=5_000, bounds=(-50, 50), rng=None):
+    """
+    Return `count` detailed, star-shaped polygons that look like coastlines or borders.
+
+    Each outline is a radius that varies smoothly with the angle plus fine noise,
+    sampled at `vertices` points at full float precision: the kind of geometry
+    simplify.py is meant for.
+    """
+    rng = rng or np.random.default_rng()
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    harmonics = np.arange(1, 9)
+    amplitudes = rng.uniform(0, 0.15, (count, len(harmonics), 1)) / harmonics[:, None]
+    phases = rng.uniform(0, 2 * np.pi, (count, len(harmonics), 1))
+    shape = 1 + (amplitudes * np.sin(harmonics[:, None] * angles + phases)).sum(axis=1)
+    radius = rng.uniform(0.5, 2.0, (count, 1)) * (shape + rng.normal(0, 0.01, (count, vertices)))
+    centers = rng.uniform(bounds[0] + 3, bounds[1] - 3, (count, 2))
+    coords = np.stack([
+        centers[:, :1] + radius * np.cos(angles),
+        centers[:, 1:] + radius * np.sin(angles),
+    ], axis=-1)
+    return shapely.polygons(coords)
+
+
+def _grid_cells(count, members, extent, bounds, rng):
+    """
+    Pick `members` distinct cells of a square grid for each of `count` shapes.
+
+    Returns the lower-left corners, shape (count, members, 2), and the cell size.
+    Each shape covers an `extent` x `extent` square placed at random in `bounds`.
+    """
+    side = int(np.ceil(np.sqrt(members)))
+    cell = extent / side
+    origins = rng.uniform(bounds[0], bounds[1] - extent, (count, 1, 2))
+    # argsort of random keys gives an independent permutation per shape in one call.
+    chosen = np.argsort(rng.random((count, side * side)), axis=1)[:, :members]
+    corners = np.stack([chosen % side, chosen // side], axis=-1) * cell
+    return origins + corners, cell
+
+
+def _polygons_in_cells(corners, cell, num_points, rng):
+    """
+    One convex polygon per cell: `num_points` vertices on a circle inside the cell.
+
+    Angles are stratified (one per 1/num_points of the turn, jittered inside its
+    slot), so the vertices are distinct and in order, and the polygon is convex and
+    valid without checking.
+    """
+    shape = corners.shape[:-1]
+    slots = (np.arange(num_points) + rng.uniform(0.1, 0.9, shape + (num_points,))) / num_points
+    angles = 2 * np.pi * slots
+    radius = cell * rng.uniform(0.2, 0.4, shape + (1,))
+    centers = corners + cell / 2 + rng.uniform(-0.05, 0.05, shape + (2,)) * cell
+    coords = np.stack([
+        centers[..., :1] + radius * np.cos(angles),
+        centers[..., 1:] + radius * np.sin(angles),
+    ], axis=-1)
+    return shapely.polygons(np.round(coords, 6).reshape(-1, num_points, 2)).reshape(shape)
+
+
+def random_multipolygons(count, parts, num_points=6, extent=10.0, bounds=(-50, 50), rng=None):
+    """Return `count` valid MultiPolygons of `parts` disjoint convex polygons each."""
+    rng = rng or np.random.default_rng()
+    corners, cell = _grid_cells(count, parts, extent, bounds, rng)
+    polygons = _polygons_in_cells(corners, cell, num_points, rng)
+    return shapely.multipolygons(polygons.ravel(), indices=np.repeat(np.arange(count), parts))
+
+
+def random_geometry_collections(count, members, extent=10.0, bounds=(-50, 50), rng=None):
+    """
+    Return `count` GeometryCollections of `members` disjoint geometries each.
+
+    Members cycle through Point, LineString and Polygon, each in its own grid cell.
+    """
+    rng = rng or np.random.default_rng()
+    corners, cell = _grid_cells(count, members, extent, bounds, rng)
+    kinds = np.arange(members) % 3
+    geometries = np.empty((count, members), dtype=object)
+
+    point_corners = corners[:, kinds == 0]
+    geometries[:, kinds == 0] = shapely.points(
+        np.round(point_corners + rng.uniform(0.1, 0.9, point_corners.shape) * cell, 6))
+
+    line_corners = corners[:, kinds == 1]
+    vertices = line_corners[..., None, :] + rng.uniform(0.1, 0.9, line_corners.shape[:-1] + (3, 2)) * cell
+    geometries[:, kinds == 1] = shapely.linestrings(
+        np.round(vertices, 6).reshape(-1, 3, 2)).reshape(line_corners.shape[:-1])
+
+    geometries[:, kinds == 2] = _polygons_in_cells(corners[:, kinds == 2], cell, 5, rng)
+    return shapely.geometrycollections(geometries.ravel(), indices=np.repeat(np.arange(count), members))
+
+
+def polygons_to_wkt(polygons, precision=6):
+    return shapely.to_wkt(polygons, rounding_precision=precision)
+
+
+def _executemany_in_batches(cursor, statement, rows, batch_size):
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cursor.executemany(statement, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def insert_points(cursor, points, start_id=1, table=geo.GEO_POINTS_TABLE, batch_size=BATCH_SIZE):
+    """Insert a (n, 2) array of [lon, lat] pairs with consecutive ids."""
+    rows = list(zip(range(start_id, start_id + len(points)), points.tolist()))
+    return _executemany_in_batches(
+        cursor, f"INSERT INTO {geo.DB_SCHEMA}.{table} (id, location) VALUES (?, ?)",
+        rows, batch_size)
+
+
+def insert_shapes(cursor, shapes, start_id=1, table=geo.GEO_SHAPE_TABLE, batch_size=BATCH_SIZE):
+    """Insert WKT strings (or GeoJSON dicts) into a GEO_SHAPE table with consecutive ids."""
+    rows = list(zip(range(start_id, start_id + len(shapes)), list(shapes)))
+    return _executemany_in_batches(
+        cursor, f"INSERT INTO {geo.DB_SCHEMA}.{table} (id, area) VALUES (?, ?)",
+        rows, batch_size)
@@ -0,0 +1,323 @@
+"""
+Streaming GeoJSON / NDJSON importer for GEO_SHAPE tables.
+
+    python3 documentation/geospatial/geojson_importer.py countries.geojson
+    python3 documentation/geospatial/geojson_importer.py roads.ndjson --workers 8 --rejects rejects.ndjson
+
+Memory stays flat no matter how big the file is:
+
+- A GeoJSON FeatureCollection is never loaded whole. The reader scans forward to
+  the "features" array, finds where each feature ends by tracking brackets and
+  strings, and decodes it once. A large feature is scanned once however many
+  reads it spans, and a malformed one is rejected without losing the rest.
+- NDJSON / GeoJSON text sequences are read line by line.
+- Features are grouped into batches and handed to a process pool. At most
+  `workers * 2` batches are in flight, so a slow database pushes back on the
+  reader instead of letting batches pile up in memory.
+
+Each worker opens its own connection, turns every feature into a Shapely geometry,
+repairs invalid ones with shapely.make_valid (the same is_valid check
+other_shapes.py applies before inserting), and writes the batch with one
+executemany. Features that are not valid JSON, cannot be parsed, are empty, are
+still invalid after repair, or fail to insert are rejected and reported with their
+position in the file and the reason.
+With --tolerance / --grid-size (or --profile) geometries are also simplified and
+snapped with simplify.py before they are sent.
+"""
+
+import argparse
+import json
+import multiprocessing
+import re
+import sys
+import time
+from collections import Counter, deque
+import shapely
+from shapely.geometry import mapping, shape
+import geo
+import simplify
+
+READ_SIZE = 1 << 16
+
+_SEPARATORS = re.compile(r"[\s,]*")
+_STRUCTURE = re.compile(r'[{}\[\]",]')
+_STRING_END = re.compile(r'["\\]')
+
+
+class MalformedFeature(ValueError):
+    """Yielded by iter_features() in place of a record that is not valid JSON."""
+
+
+def _iter_feature_collection(f):
+    """Yield features from a FeatureCollection one at a time from a rolling buffer."""
+    buffer = ""
+    # Scan forward to the opening bracket of the "features" array.
+    while True:
+        position = buffer.find('"features"')
+        if position != -1:
+            bracket = buffer.find("[", position)
+            if bracket != -1:
+                buffer = buffer[bracket + 1:]
+                break
+        chunk = f.read(READ_SIZE)
+        if not chunk:
+            return
+        # Keep a tail in case the key is split across two reads.
+        buffer = buffer[-16:] + chunk
+
+    # buffer[start:pos] is the part of the current feature scanned so far; the scan
+    # state survives reads, so no feature is scanned twice.
+    start = pos = depth = 0
+    in_string = False
+    while True:
+        if pos == start:
+            start = pos = _SEPARATORS.match(buffer, start).end()
+            if buffer.startswith("]", start):
+                return
+        end = None
+        while end is None and pos < len(buffer):
+            if in_string:
+                match = _STRING_END.search(buffer, pos)
+                if not match:
+                    pos = len(buffer)
+                elif match.group() == '"':
+                    in_string, pos = False, match.end()
+                elif match.end() < len(buffer):
+                    pos = match.end() + 1
+                else:
+                    # A backslash at the end of the buffer: rescan it with the next read.
+                    break
+                continue
+            match = _STRUCTURE.search(buffer, pos)
+            if not match:
+                pos = len(buffer)
+                continue
+            char, pos = match.group(), match.end()
+            if char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    end = pos
+                elif depth < 0:
+                    # The closing bracket of the array, or a stray one.
+                    end = match.start() if match.start() > start else pos
+            elif depth == 0:
+                end = match.start()
+
+        if end is None:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                if start < len(buffer):
+                    raise ValueError("Truncated FeatureCollection: unexpected end of file")
+                return
+            buffer = buffer[start:] + chunk
+            pos -= start
+            start = 0
+            continue
+
+        text = buffer[start:end]
+        start = pos = end
+        depth = 0
+        try:
+            yield json.loads(text)
+        except json.JSONDecodeError as e:
+            yield MalformedFeature(f"malformed JSON: {e.msg}")
+
+
+def _iter_ndjson(f):
+    for line in f:
+        # GeoJSON text sequences (RFC 8142) prefix each record with a record separator.
+        line = line.strip().lstrip("\x1e")
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield MalformedFeature(f"malformed JSON: {e.msg}")
+
+
+def iter_features(path):
+    """
+    Yield GeoJSON features (or bare geometries) from a FeatureCollection or NDJSON file.
+
+    A record that is not valid JSON is yielded as a MalformedFeature, so it keeps its
+    position and prepare_geometry() rejects it.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(READ_SIZE)
+        f.seek(0)
+        if '"FeatureCollection"' in head or '"features"' in head:
+            yield from _iter_feature_collection(f)
+        else:
+            yield from _iter_ndjson(f)
+
+
+def prepare_geometry(feature, tolerance=None, grid_size=None):
+    """
+    Return (geojson_dict, repaired, reject_reason) for one feature.
+
+    Invalid geometries are repaired with shapely.make_valid; a geometry that is
+    empty or still invalid afterwards is rejected and geojson_dict is None. Valid
+    geometries are then simplified with simplify.simplify_geometries when a
+    tolerance or grid size is given.
+    """
+    if isinstance(feature, MalformedFeature):
+        return None, False, str(feature)
+    if not isinstance(feature, dict):
+        return None, False, "not a JSON object"
+    geometry = feature.get("geometry") if feature.get("type") == "Feature" else feature
+    if not geometry:
+        return None, False, "missing geometry"
+    try:
+        geom = shape(geometry)
+    except Exception as e:
+        return None, False, f"unparseable: {type(e).__name__}"
+
+    if geom.is_empty:
+        return None, False, "empty geometry"
+    repaired = not geom.is_valid
+    if repaired:
+        geom = shapely.make_valid(geom)
+        if geom.is_empty or not geom.is_valid:
+            return None, False, "invalid after repair"
+    if tolerance or grid_size:
+        geom = simplify.simplify_geometries(geom, tolerance, grid_size)
+    return mapping(geom), repaired, None
+
+
+_connection = None
+_cursor = None
+_table = None
+_simplify = (None, None)
+
+
+def _init_worker(table, tolerance, grid_size):
+    global _connection, _cursor, _table, _simplify
+    _connection = geo.connect()
+    _cursor = _connection.cursor()
+    _table = table
+    _simplify = (tolerance, grid_size)
+
+
+def _import_batch(batch):
+    """Validate, repair and insert one batch of (id, feature). Returns (inserted, repaired, rejects)."""
+    rows, rejects, repaired = [], [], 0
+    for feature_id, feature in batch:
+        area, was_repaired, reason = prepare_geometry(feature, *_simplify)
+        if area is None:
+            rejects.append((feature_id, reason))
+            continue
+        repaired += was_repaired
+        rows.append((feature_id, area))
+
+    inserted = 0
+    if rows:
+        results = _cursor.executemany(
+            f"INSERT INTO {geo.DB_SCHEMA}.{_table} (id, area) VALUES (?, ?)", rows) or []
+        # One result per row; a rowcount of -2 marks a row that failed.
+        for (feature_id, _), result in zip(rows, results):
+            if result.get("rowcount", 0) < 0:
+                rejects.append((feature_id, "insert failed"))
+            else:
+                inserted += 1
+    return inserted, repaired, rejects
+
+
+def import_file(path, table=geo.GEO_SHAPE_TABLE, workers=None, batch_size=500,
+                start_id=1, rejects_path=None, progress_every=5.0, tolerance=None, grid_size=None):
+    """Stream `path` into `table` with a process pool and return a summary dict."""
+    workers = workers or multiprocessing.cpu_count()
+    max_in_flight = workers * 2
+    started = time.perf_counter()
+    last_report = started
+    inserted = repaired = read = 0
+    reasons = Counter()
+    rejects_file = open(rejects_path, "w", encoding="utf-8") if rejects_path else None
+
+    def collect(result):
+        nonlocal inserted, repaired
+        batch_inserted, batch_repaired, batch_rejects = result.get()
+        inserted += batch_inserted
+        repaired += batch_repaired
+        for feature_id, reason in batch_rejects:
+            reasons[reason] += 1
+            if rejects_file:
+                rejects_file.write(json.dumps({"feature": feature_id, "reason": reason}) + "\n")
+
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(table, tolerance, grid_size)) as pool:
+            pending = deque()
+            batch = []
+            for feature_id, feature in enumerate(iter_features(path), start=start_id):
+                batch.append((feature_id, feature))
+                read += 1
+                if len(batch) < batch_size:
+                    continue
+                pending.append(pool.apply_async(_import_batch, (batch,)))
+                batch = []
+                # Backpressure: wait for the oldest batch before reading further.
+                while len(pending) >= max_in_flight:
+                    collect(pending.popleft())
+
+                now = time.perf_counter()
+                if now - last_report >= progress_every:
+                    last_report = now
+                    print(f"… read {read:,} features, inserted {inserted:,}, "
+                          f"rejected {sum(reasons.values()):,} ({read / (now - started):,.0f} features/s)")
+            if batch:
+                pending.append(pool.apply_async(_import_batch, (batch,)))
+            while pending:
+                collect(pending.popleft())
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "read": read,
+        "inserted": inserted,
+        "repaired": repaired,
+        "rejected": sum(reasons.values()),
+        "rejected_by_reason": dict(reasons),
+        "seconds": round(elapsed, 2),
+        "features_per_sec": round(read / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="GeoJSON FeatureCollection or NDJSON file")
+    parser.add_argument("--table", default=geo.GEO_SHAPE_TABLE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--start-id", type=int, default=1)
+    parser.add_argument("--rejects", help="write rejected features (position, reason) to this NDJSON file")
+    parser.add_argument("--profile", choices=list(simplify.PROFILES),
+                        help="simplification profile from simplify.PROFILES")
+    parser.add_argument("--tolerance", type=float, help="simplification tolerance in degrees")
+    parser.add_argument("--grid-size", type=float, help="snap coordinates to this grid, in degrees")
+    args = parser.parse_args()
+
+    tolerance, grid_size = simplify.PROFILES[args.profile] if args.profile else (None, None)
+    summary = import_file(args.path, args.table, args.workers, args.batch_size,
+                          args.start_id, args.rejects,
+                          tolerance=args.tolerance or tolerance,
+                          grid_size=args.grid_size or grid_size)
+    print(f"\n✅ Imported {summary['inserted']:,} of {summary['read']:,} features into "
+          f"{geo.DB_SCHEMA}.{args.table} in {summary['seconds']}s "
+          f"({summary['features_per_sec']:,.0f} features/s)")
+    if summary["repaired"]:
+        print(f"🔧 Repaired {summary['repaired']:,} invalid geometries with make_valid")
+    if summary["rejected"]:
+        print(f"⚠️ Rejected {summary['rejected']:,} features:")
+        for reason, count in sorted(summary["rejected_by_reason"].items(), key=lambda x: -x[1]):
+            print(f"   {count:>8,}  {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
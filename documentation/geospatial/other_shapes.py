@@ -1,9 +1,14 @@
 import random
 from monkdb import client
-from shapely.geometry import Polygon, MultiPoint, LineString, MultiLineString, MultiPolygon, Point
-from shapely.ops import unary_union
+from shapely.geometry import Polygon, MultiPoint, LineString, MultiLineString, Point
+import numpy as np
 import configparser
 import os
+from geo_loader import random_geometry_collections, random_multipolygons
+
+# Seeded generator for the multi-part shapes, whose members are placed in disjoint
+# grid cells (see geo_loader.py) instead of being retried until they do not overlap.
+rng = np.random.default_rng(42)
 
 # Function to generate random points
 
@@ -45,22 +50,12 @@ def generate_geo_shape(shape_type):
         shape = Polygon(coords)
 
     elif shape_type == "MultiPolygon":
-        # Generate two valid polygons that do not overlap
-        while True:
-            poly1 = Polygon(generate_valid_convex_polygon())
-            poly2 = Polygon(generate_valid_convex_polygon())
-
-            if poly1.is_valid and poly2.is_valid and poly1.disjoint(poly2):
-                break  # Only exit the loop if the polygons do not overlap
-
-        shape = MultiPolygon([poly1, poly2])
+        # Two disjoint convex polygons in one pass
+        shape = random_multipolygons(1, parts=2, rng=rng)[0]
 
     elif shape_type == "GeometryCollection":
-        shape = unary_union([
-            Point(generate_random_point()),
-            LineString([generate_random_point() for _ in range(3)]),
-            Polygon(generate_valid_convex_polygon())
-        ])
+        # A point, a line and a polygon, each in its own cell
+        shape = random_geometry_collections(1, members=3, rng=rng)[0]
 
     if not shape.is_valid:
         raise ValueError(f"Invalid shape generated for {shape_type}")
@@ -0,0 +1,77 @@
+"""
+Optional preprocessing stage that shrinks GEO_SHAPE payloads before they are sent.
+
+Coastlines and administrative boundaries often carry tens of thousands of vertices
+at 15 significant digits, far more than any map or within() check needs. Every
+extra vertex is paid for in the INSERT request, in the stored document, in the
+shape index build, and again in every query that sends the polygon as a parameter.
+
+simplify_geometries() runs three Shapely 2.x array steps, each optional:
+
+- shapely.simplify(..., preserve_topology=True) drops vertices that deviate less
+  than `tolerance` (in degrees) from the simplified outline, without creating
+  self-intersections or collapsing rings,
+- shapely.set_precision snaps coordinates to a `grid_size` grid (1e-6 degrees is
+  about 0.1 m) and keeps the output valid,
+- shapely.remove_repeated_points drops consecutive duplicate vertices.
+
+PROFILES holds tolerance / grid size pairs per use case, and tolerance_for_zoom()
+derives a tolerance from a web map zoom level. payload_stats() reports vertex
+count and WKT bytes so the reduction can be checked; benchmark_simplify.py also
+measures insert and query latency against the raw geometries.
+"""
+
+import numpy as np
+import shapely
+
+# name -> (tolerance in degrees, grid size in degrees); None skips the step.
+PROFILES = {
+    "raw": (None, None),
+    "lossless": (None, 1e-7),
+    "street": (1e-5, 1e-6),
+    "city": (1e-4, 1e-5),
+    "region": (1e-3, 1e-4),
+    "country": (1e-2, 1e-3),
+}
+
+TILE_SIZE = 256
+
+
+def tolerance_for_zoom(zoom, pixels=0.5):
+    """Tolerance in degrees that keeps the error below `pixels` on a 256px web map tile at `zoom`."""
+    return pixels * 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def simplify_geometries(geometries, tolerance=None, grid_size=None):
+    """
+    Simplify, snap and deduplicate a Shapely geometry or array of geometries.
+
+    A geometry that would collapse to empty (a polygon smaller than the grid) is
+    kept as it was instead of being dropped.
+    """
+    original = np.asarray(geometries, dtype=object)
+    result = original
+    if tolerance:
+        result = shapely.simplify(result, tolerance, preserve_topology=True)
+    if grid_size:
+        result = shapely.set_precision(result, grid_size)
+    result = shapely.remove_repeated_points(result)
+    collapsed = shapely.is_empty(result) & ~shapely.is_empty(original)
+    result = np.where(collapsed, original, result)
+    return result if result.ndim else result.item()
+
+
+def simplify_profile(geometries, profile):
+    tolerance, grid_size = PROFILES[profile]
+    return simplify_geometries(geometries, tolerance, grid_size)
+
+
+def payload_stats(geometries):
+    """Return the vertex count and WKT size of a geometry array, as sent to MonkDB."""
+    geometries = np.asarray(geometries, dtype=object)
+    wkts = shapely.to_wkt(geometries, rounding_precision=-1, trim=True)
+    return {
+        "geometries": int(geometries.size),
+        "vertices": int(shapely.get_num_coordinates(geometries).sum()),
+        "wkt_bytes": int(sum(len(wkt) for wkt in np.ravel(wkts))),
+    }
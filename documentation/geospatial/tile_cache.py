@@ -0,0 +1,226 @@
+"""
+Tiled client-side cache for within(location, ?) queries over a GEO_POINT table.
+
+Map UIs ask for the points inside overlapping viewports again and again while the
+user pans and zooms. geo.py sends every polygon to MonkDB as a fresh within()
+query; TiledPointCache instead:
+
+- splits the query area into quadkey tiles (an equirectangular lon/lat grid with
+  2^zoom x 2^zoom tiles, keyed by quadkey strings so a tile's key is a prefix of
+  all its children's keys),
+- answers tiles that are cached, or whose parent tile is cached, from memory,
+- fetches every uncovered tile in ONE within() query over the union of their boxes,
+- clips the merged result to the query polygon with a Shapely STRtree per tile;
+  tiles that lie entirely inside the polygon are taken whole without clipping.
+
+Tiles expire after `ttl` seconds and the least recently used tiles are evicted
+beyond `max_tiles`. Writes to the table are not seen until the affected tiles
+expire or invalidate() is called.
+
+    python3 documentation/geospatial/tile_cache.py
+"""
+
+import math
+import time
+from collections import OrderedDict
+import numpy as np
+import shapely
+import geo
+
+MAX_ZOOM = 16
+
+
+def tile_xy(lon, lat, zoom):
+    """Tile column/row arrays for lon/lat arrays at `zoom`."""
+    n = 2 ** zoom
+    x = np.clip(np.floor((np.asarray(lon) + 180.0) / 360.0 * n), 0, n - 1).astype(np.int64)
+    y = np.clip(np.floor((90.0 - np.asarray(lat)) / 180.0 * n), 0, n - 1).astype(np.int64)
+    return x, y
+
+
+def tile_bounds(x, y, zoom):
+    """(min_lon, min_lat, max_lon, max_lat) of a tile."""
+    width, height = 360.0 / 2 ** zoom, 180.0 / 2 ** zoom
+    return (-180.0 + x * width, 90.0 - (y + 1) * height,
+            -180.0 + (x + 1) * width, 90.0 - y * height)
+
+
+def quadkey(x, y, zoom):
+    digits = []
+    for level in range(zoom, 0, -1):
+        mask = 1 << (level - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def quadkey_to_tile(key):
+    x = y = 0
+    for digit in key:
+        x, y = x << 1 | (int(digit) & 1), y << 1 | (int(digit) >> 1)
+    return x, y, len(key)
+
+
+def zoom_for(geometry, tiles_across=4, max_zoom=MAX_ZOOM):
+    """Zoom level at which the geometry's bounding box spans about `tiles_across` tiles."""
+    min_lon, min_lat, max_lon, max_lat = geometry.bounds
+    span = max(max_lon - min_lon, (max_lat - min_lat) * 2, 1e-9)
+    return int(min(max_zoom, max(0, math.floor(math.log2(360.0 * tiles_across / span)))))
+
+
+def tiles_for(geometry, zoom):
+    """Quadkeys of the tiles at `zoom` that intersect the geometry."""
+    min_lon, min_lat, max_lon, max_lat = geometry.bounds
+    (x0, x1), (y1, y0) = tile_xy([min_lon, max_lon], [min_lat, max_lat], zoom)
+    xs, ys = np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1))
+    xs, ys = xs.ravel(), ys.ravel()
+    boxes = shapely.box(*tile_bounds(xs, ys, zoom))
+    hit = shapely.intersects(geometry, boxes)
+    return [quadkey(int(x), int(y), zoom) for x, y in zip(xs[hit], ys[hit])]
+
+
+class _Tile:
+    __slots__ = ("ids", "coords", "expires", "_tree")
+
+    def __init__(self, ids, coords, expires):
+        self.ids = ids
+        self.coords = coords
+        self.expires = expires
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = shapely.STRtree(shapely.points(self.coords))
+        return self._tree
+
+
+class TiledPointCache:
+    """within() over a GEO_POINT table, answered per quadkey tile from an LRU/TTL cache."""
+
+    def __init__(self, cursor, table=geo.GEO_POINTS_TABLE, ttl=60.0, max_tiles=4096,
+                 tiles_across=4, max_zoom=MAX_ZOOM):
+        self.cursor = cursor
+        self.table = table
+        self.ttl = ttl
+        self.max_tiles = max_tiles
+        self.tiles_across = tiles_across
+        self.max_zoom = max_zoom
+        self._tiles = OrderedDict()
+        self.backend_queries = 0
+        self.tile_hits = 0
+        self.tile_misses = 0
+
+    def within(self, polygon, zoom=None):
+        """Return [(id, [lon, lat]), ...] of the points inside `polygon` (WKT or Shapely), ordered by id."""
+        if isinstance(polygon, str):
+            polygon = shapely.from_wkt(polygon)
+        zoom = zoom_for(polygon, self.tiles_across, self.max_zoom) if zoom is None else zoom
+        keys = tiles_for(polygon, zoom)
+
+        now = time.monotonic()
+        tiles = {key: self._lookup(key, now) for key in keys}
+        missing = [key for key, tile in tiles.items() if tile is None]
+        self.tile_hits += len(keys) - len(missing)
+        self.tile_misses += len(missing)
+        if missing:
+            tiles.update(self._fetch(missing, now))
+
+        shapely.prepare(polygon)
+        ids, coords = [], []
+        for key, tile in tiles.items():
+            if not len(tile.ids):
+                continue
+            x, y, z = quadkey_to_tile(key)
+            if polygon.contains(shapely.box(*tile_bounds(x, y, z))):
+                selected = slice(None)
+            else:
+                selected = tile.tree.query(polygon, predicate="contains")
+            ids.append(tile.ids[selected])
+            coords.append(tile.coords[selected])
+        if not ids:
+            return []
+
+        ids, coords = np.concatenate(ids), np.concatenate(coords)
+        order = np.argsort(ids, kind="stable")
+        return list(zip(ids[order].tolist(), coords[order].tolist()))
+
+    def invalidate(self, geometry=None):
+        """Drop every cached tile, or only those intersecting `geometry`."""
+        if geometry is None:
+            self._tiles.clear()
+            return
+        for key in list(self._tiles):
+            x, y, z = quadkey_to_tile(key)
+            if shapely.intersects(geometry, shapely.box(*tile_bounds(x, y, z))):
+                del self._tiles[key]
+
+    def _lookup(self, key, now):
+        # The tile itself, or a cached ancestor filtered down to the tile.
+        for end in range(len(key), -1, -1):
+            tile = self._tiles.get(key[:end])
+            if tile is None:
+                continue
+            if tile.expires <= now:
+                del self._tiles[key[:end]]
+                continue
+            self._tiles.move_to_end(key[:end])
+            if end == len(key):
+                return tile
+            x, y, zoom = quadkey_to_tile(key)
+            tx, ty = tile_xy(tile.coords[:, 0], tile.coords[:, 1], zoom)
+            inside = (tx == x) & (ty == y)
+            return _Tile(tile.ids[inside], tile.coords[inside], tile.expires)
+        return None
+
+    def _fetch(self, keys, now):
+        """Load all points of the given tiles with one within() query over the union of their boxes."""
+        tiles = [quadkey_to_tile(key) for key in keys]
+        # Grow the boxes slightly so points on tile edges are not lost; they are
+        # assigned to exactly one tile below.
+        boxes = [shapely.box(*tile_bounds(x, y, z)).buffer(1e-7, join_style="mitre") for x, y, z in tiles]
+        area = shapely.union_all(boxes)
+        self.cursor.execute(
+            f"SELECT id, location FROM {geo.DB_SCHEMA}.{self.table} WHERE within(location, ?)",
+            (shapely.to_wkt(area, rounding_precision=9),),
+        )
+        rows = self.cursor.fetchall()
+        self.backend_queries += 1
+
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        coords = np.array([row[1] for row in rows], dtype=float).reshape(-1, 2)
+        zoom = tiles[0][2]
+        tx, ty = tile_xy(coords[:, 0], coords[:, 1], zoom)
+
+        fetched = {}
+        for key, (x, y, _) in zip(keys, tiles):
+            inside = (tx == x) & (ty == y)
+            fetched[key] = tile = _Tile(ids[inside], coords[inside], now + self.ttl)
+            self._tiles[key] = tile
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return fetched
+
+
+def main():
+    connection = geo.connect()
+    cursor = connection.cursor()
+
+    cache = TiledPointCache(cursor)
+    viewports = [
+        "POLYGON ((-10 -10, 10 -10, 10 10, -10 10, -10 -10))",
+        "POLYGON ((-5 -10, 15 -10, 15 10, -5 10, -5 -10))",   # pan right
+        "POLYGON ((0 -5, 10 -5, 10 5, 0 5, 0 -5))",           # zoom in
+        "POLYGON ((-10 -10, 10 -10, 10 10, -10 10, -10 -10))",  # back out
+    ]
+    for viewport in viewports:
+        rows = cache.within(viewport)
+        print(f"🔍 {len(rows)} points in {viewport}")
+    print(f"\nTile hits: {cache.tile_hits}, tile misses: {cache.tile_misses}, "
+          f"database queries: {cache.backend_queries} for {len(viewports)} viewports")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures what instrumentation.py adds to each statement.
+
+The in-process part runs a cursor that returns immediately, so the difference
+per call is the full cost of the wrapper: timing, normalization, the registry
+lock and the byte counters. The database part runs the same small query against
+MonkDB with a plain and an instrumented cursor, for comparison with a real
+round trip.
+
+    python3 documentation/observability/benchmark_instrumentation.py
+    python3 documentation/observability/benchmark_instrumentation.py --skip-db --calls 1000000
+"""
+
+import argparse
+import configparser
+import os
+import time
+from instrumentation import InstrumentedCursor, Registry
+
+
+class NullCursor:
+    """Stands in for a cursor whose execute() costs nothing."""
+
+    rowcount = 1
+    duration = 0
+
+    def execute(self, statement, parameters=None, bulk_parameters=None):
+        pass
+
+    def fetchall(self):
+        return []
+
+
+def per_call_us(cursor, calls, statement, params):
+    started = time.perf_counter()
+    for i in range(calls):
+        cursor.execute(statement, params)
+        cursor.fetchall()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def connect():
+    from monkdb import client
+
+    current_directory = os.path.dirname(os.path.realpath(__file__))
+    config = configparser.ConfigParser()
+    config.read(os.path.join(current_directory, "..", "config.ini"), encoding="utf-8")
+    db = config["database"]
+    return client.connect(
+        f"http://{db['DB_USER']}:{db['DB_PASSWORD']}@{db['DB_HOST']}:{db['DB_PORT']}", username=db["DB_USER"])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000, help="in-process calls per variant")
+    parser.add_argument("--db-calls", type=int, default=2_000, help="database round trips per variant")
+    parser.add_argument("--skip-db", action="store_true", help="only measure the in-process overhead")
+    args = parser.parse_args()
+
+    statement = "SELECT location, temperature FROM monkdb.sensor_data WHERE location = ? LIMIT 10"
+    params = ("Berlin",)
+
+    print(f"{'variant':<28} {'µs/call':>10}")
+    plain = per_call_us(NullCursor(), args.calls, statement, params)
+    registry = Registry()
+    wrapped = per_call_us(InstrumentedCursor(NullCursor(), registry), args.calls, statement, params)
+    print(f"{'null cursor':<28} {plain:>10.2f}")
+    print(f"{'null cursor, instrumented':<28} {wrapped:>10.2f}")
+    print(f"⏱️ overhead: {wrapped - plain:.2f} µs per statement")
+
+    if not args.skip_db:
+        from instrumentation import instrument
+
+        connection = connect()
+        cursor = connection.cursor()
+        instrumented = instrument(connection, registry).cursor()
+        query = "SELECT 1"
+        per_call_us(cursor, 50, query, None)  # warm up the HTTP pool
+        plain = per_call_us(cursor, args.db_calls, query, None)
+        wrapped = per_call_us(instrumented, args.db_calls, query, None)
+        print(f"{'MonkDB SELECT 1':<28} {plain:>10.2f}")
+        print(f"{'MonkDB SELECT 1, instr.':<28} {wrapped:>10.2f}")
+        print(f"⏱️ overhead: {(wrapped - plain) / plain * 100:+.2f}% of a round trip")
+        stats = registry.snapshot()[query]
+        print(f"   p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+              f"{stats['bytes_sent']:,} B sent, {stats['bytes_received']:,} B received")
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Per-statement metrics for MonkDB cursors: latency histograms, rows, bytes and a slow-query log.
+
+None of the demo scripts measure how long cursor.execute() takes, so in production
+there is no way to tell which statements are hot. instrument() wraps a connection
+so that every cursor it hands out records, per normalized statement (literals and
+IN lists replaced by ?):
+
+- a latency histogram of execute()/executemany() as seen by the client, plus the
+  server-side duration MonkDB reports,
+- rows returned or affected, and errors,
+- request and response bytes, taken from the HTTP client itself,
+- a WARNING on the "monkdb.slow" logger for statements slower than slow_ms, with
+  parameters redacted to their types and lengths.
+
+The numbers can be read in-process with Registry.snapshot() or scraped as Prometheus
+text from serve_metrics(). Recording costs two perf_counter() calls, a cached
+normalization and one short lock per statement.
+
+    import sys, os
+    sys.path.append(os.path.join(current_directory, "..", "observability"))
+    from instrumentation import instrument, serve_metrics
+
+    connection = instrument(client.connect(...), slow_ms=200)
+    serve_metrics(9464)        # http://127.0.0.1:9464/metrics, loopback only by default
+
+    python3 documentation/observability/benchmark_instrumentation.py
+"""
+
+import bisect
+import functools
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, as in the default Prometheus client buckets.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+slow_log = logging.getLogger("monkdb.slow")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize(statement):
+    """Collapse whitespace and replace literals so that statements differing only in values share metrics."""
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = " ".join(statement.split())
+    return _LIST.sub("(?, ...)", statement)
+
+
+def redact(params):
+    """Replace parameter values with their type and size, e.g. ['<str:5>', '<int>']."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: redact(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [redact(value) if isinstance(value, (list, tuple, dict)) else _redact_value(value)
+                for value in params]
+    return _redact_value(params)
+
+
+def _redact_value(value):
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile, the usual histogram estimate."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class StatementMetrics:
+    def __init__(self):
+        self.latency = Histogram()
+        self.server_seconds = 0.0
+        self.rows = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.errors = 0
+
+
+class Registry:
+    """Thread-safe collection of StatementMetrics keyed by normalized statement."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statements = {}
+
+    def observe(self, statement, seconds, rows=0, server_seconds=0.0, sent=0, received=0, error=False):
+        key = normalize(statement)
+        with self._lock:
+            metrics = self._statements.get(key)
+            if metrics is None:
+                metrics = self._statements[key] = StatementMetrics()
+            metrics.latency.observe(seconds)
+            metrics.server_seconds += server_seconds
+            metrics.rows += rows
+            metrics.bytes_sent += sent
+            metrics.bytes_received += received
+            metrics.errors += error
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+    def snapshot(self):
+        """Return {statement: {calls, total_s, mean_ms, p50_ms, p99_ms, server_s, rows, bytes_*, errors}}."""
+        with self._lock:
+            items = list(self._statements.items())
+        snapshot = {}
+        for statement, m in items:
+            latency = m.latency
+            snapshot[statement] = {
+                "calls": latency.count,
+                "total_s": latency.sum,
+                "mean_ms": latency.sum / latency.count * 1000 if latency.count else 0.0,
+                "p50_ms": latency.quantile(0.5) * 1000,
+                "p99_ms": latency.quantile(0.99) * 1000,
+                "server_s": m.server_seconds,
+                "rows": m.rows,
+                "bytes_sent": m.bytes_sent,
+                "bytes_received": m.bytes_received,
+                "errors": m.errors,
+            }
+        return snapshot
+
+    def top(self, n=10, by="total_s"):
+        """The n hottest statements from snapshot(), by total time unless told otherwise."""
+        return sorted(self.snapshot().items(), key=lambda item: -item[1][by])[:n]
+
+    def prometheus_text(self, label_length=200):
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = [(statement, m, list(m.latency.counts), m.latency.sum, m.latency.count)
+                     for statement, m in self._statements.items()]
+        lines = [
+            "# HELP monkdb_statement_duration_seconds Client-side latency of execute() per statement.",
+            "# TYPE monkdb_statement_duration_seconds histogram",
+        ]
+        counters = {
+            "server_seconds": "Server-side duration reported by MonkDB.",
+            "rows": "Rows returned or affected.",
+            "bytes_sent": "HTTP request body bytes.",
+            "bytes_received": "HTTP response body bytes.",
+            "errors": "Statements that raised.",
+        }
+        for statement, m, counts, total, count in items:
+            label = _label(statement, label_length)
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'monkdb_statement_duration_seconds_bucket{{statement="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'monkdb_statement_duration_seconds_sum{{statement="{label}"}} {total}')
+            lines.append(f'monkdb_statement_duration_seconds_count{{statement="{label}"}} {count}')
+        for name, help_text in counters.items():
+            lines.append(f"# HELP monkdb_statement_{name}_total {help_text}")
+            lines.append(f"# TYPE monkdb_statement_{name}_total counter")
+            for statement, m, *_ in items:
+                lines.append(f'monkdb_statement_{name}_total{{statement="{_label(statement, label_length)}"}} '
+                             f"{getattr(m, name)}")
+        return "\n".join(lines) + "\n"
+
+
+def _label(value, length):
+    value = value[:length]
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+class _Transfer(threading.local):
+    sent = 0
+    received = 0
+
+
+def _count_bytes(client):
+    """Wrap client._request so that request and response body sizes are counted per thread."""
+    transfer = getattr(client, "_instrumented_transfer", None)
+    if transfer is not None:
+        return transfer
+    transfer = _Transfer()
+    request = client._request
+
+    def counting_request(method, path, server=None, **kwargs):
+        response = request(method, path, server=server, **kwargs)
+        data = kwargs.get("data")
+        if data is not None and hasattr(data, "__len__"):
+            transfer.sent += len(data)
+        if not kwargs.get("stream"):
+            transfer.received += len(response.data or b"")
+        return response
+
+    client._request = counting_request
+    client._instrumented_transfer = transfer
+    return transfer
+
+
+class InstrumentedCursor:
+    """Cursor wrapper that records every execute()/executemany() in a Registry."""
+
+    def __init__(self, cursor, registry=REGISTRY, slow_ms=None, transfer=None):
+        self._cursor = cursor
+        self._registry = registry
+        self._slow_ms = slow_ms
+        self._transfer = transfer
+
+    def execute(self, statement, parameters=None, bulk_parameters=None):
+        return self._timed(statement, parameters, self._cursor.execute, statement, parameters, bulk_parameters)
+
+    def executemany(self, statement, seq_of_parameters):
+        return self._timed(statement, None, self._cursor.executemany, statement, seq_of_parameters)
+
+    def _timed(self, statement, parameters, method, *args):
+        transfer = self._transfer
+        if transfer is not None:
+            sent, received = transfer.sent, transfer.received
+        error = True
+        started = time.perf_counter()
+        try:
+            result = method(*args)
+            error = False
+            return result
+        finally:
+            seconds = time.perf_counter() - started
+            rows = 0 if error else max(getattr(self._cursor, "rowcount", 0) or 0, 0)
+            server_ms = 0 if error else max(getattr(self._cursor, "duration", 0) or 0, 0)
+            self._registry.observe(
+                statement, seconds, rows, server_ms / 1000,
+                transfer.sent - sent if transfer is not None else 0,
+                transfer.received - received if transfer is not None else 0,
+                error)
+            if self._slow_ms is not None and seconds * 1000 >= self._slow_ms:
+                slow_log.warning("%.1f ms: %s params=%s", seconds * 1000, normalize(statement), redact(parameters))
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Connection wrapper whose cursors are InstrumentedCursors."""
+
+    def __init__(self, connection, registry=REGISTRY, slow_ms=None):
+        self._connection = connection
+        self.registry = registry
+        self.slow_ms = slow_ms
+        client = getattr(connection, "client", None)
+        self._transfer = _count_bytes(client) if hasattr(client, "_request") else None
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self.registry, self.slow_ms,
+                                  self._transfer)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def instrument(connection, registry=REGISTRY, slow_ms=None):
+    """Wrap a MonkDB connection; slow_ms enables the slow-query log."""
+    return InstrumentedConnection(connection, registry, slow_ms)
+
+
+def serve_metrics(port, registry=REGISTRY, host="127.0.0.1"):
+    """
+    Serve registry.prometheus_text() at http://host:port/metrics from a daemon thread.
+
+    The metrics carry every normalised SQL statement, so they are only served on
+    the loopback interface by default. Pass host="0.0.0.0" (or one interface's
+    address) to let a Prometheus on another machine scrape them.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
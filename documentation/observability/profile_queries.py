@@ -0,0 +1,347 @@
+"""
+EXPLAIN ANALYZE profiles of the documented workloads, stored as JSON and diffed between runs.
+
+For each workload (doc_json, fts, geo, timeseries, vector) and each data scale,
+the harness loads that many rows through the workload's own table definition,
+then captures for every query the workload runs:
+
+- the EXPLAIN plan and the operators in it, e.g. Get (primary-key lookup) or Collect,
+- the EXPLAIN ANALYZE output: the Lucene queries that were executed (TermQuery,
+  PointRangeQuery, MatchAllDocsQuery, ...) and every timing it reports, flattened to
+  "phase -> ms" and reduced to the median of --repeats runs.
+
+A run is written as one JSON file. Compared with a baseline run (--baseline, or
+--diff for two files without a database), it flags:
+
+- a query whose access path degraded, e.g. a full scan (MatchAllDocsQuery) where
+  the baseline used a primary-key or index lookup,
+- a phase, or the total, that became --ratio times slower and at least --min-ms
+  slower.
+
+The exit code is 1 if anything was flagged, so it can gate CI.
+
+    python3 documentation/observability/profile_queries.py --scales 1000 100000 --out profiles/today.json
+    python3 documentation/observability/profile_queries.py --workloads fts geo --baseline profiles/today.json
+    python3 documentation/observability/profile_queries.py --diff profiles/before.json profiles/after.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+from datetime import datetime, timedelta, timezone
+
+current_directory = os.path.dirname(os.path.realpath(__file__))
+for area in ("document_json", "FTS", "geospatial", "timeseries", "vector"):
+    sys.path.append(os.path.join(current_directory, "..", area))
+
+BATCH_SIZE = 5_000
+_OPERATOR = re.compile(r"\b([A-Z][A-Za-z]+)\[")
+
+
+def _batched(cursor, statement, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(statement, rows[start:start + BATCH_SIZE])
+
+
+# Each workload: setup(cursor, scale) loads `scale` rows, queries(scale) returns
+# [(name, statement, params)] mirroring what the workload module runs.
+
+def doc_json_workload():
+    import doc_json
+
+    table = f"{doc_json.DB_SCHEMA}.{doc_json.TABLE_NAME}"
+
+    def setup(cursor, scale):
+        doc_json.create_table(cursor)
+        rows = [(i, f"{name}_{i}", age, metadata)
+                for i in range(1, scale + 1)
+                for _, name, age, metadata in [doc_json.USERS[i % len(doc_json.USERS)]]]
+        _batched(cursor, f"INSERT INTO {table} (id, name, age, metadata) VALUES (?, ?, ?, ?)", rows)
+        cursor.execute(f"REFRESH TABLE {table}")
+
+    def queries(scale):
+        return [
+            ("by_id", f"SELECT name, metadata FROM {table} WHERE id = ?", (scale // 2,)),
+            ("by_city", f"SELECT name FROM {table} WHERE metadata['city'] = ?", ("Berlin",)),
+            ("skill_any", f"SELECT name FROM {table} WHERE 'AI' = ANY(metadata['skills'])", ()),
+            ("food_not_null", f"SELECT name, metadata['profile']['preferences']['food'] FROM {table} "
+                              f"WHERE metadata['profile']['preferences']['food'] IS NOT NULL", ()),
+        ]
+
+    return setup, queries
+
+
+def fts_workload():
+    import corpus
+    import fts
+
+    table = f"{fts.DB_SCHEMA}.{fts.TABLE_NAME}"
+
+    def setup(cursor, scale):
+        fts.create_table(cursor)
+        fts.insert_documents(cursor, corpus.generate_documents(scale), batch_size=BATCH_SIZE)
+        cursor.execute(f"REFRESH TABLE {table}")
+
+    def queries(scale):
+        return [
+            ("match_content", f"SELECT id, title, content, _score FROM {table} WHERE MATCH(content, ?) "
+                              f"ORDER BY _score DESC, id ASC LIMIT 10", ("vector search",)),
+            ("match_boosted", f"SELECT id, title, content, _score FROM {table} "
+                              f"WHERE MATCH({fts.match_target(fts.DEFAULT_BOOSTS)}, ?) "
+                              f"ORDER BY _score DESC, id ASC LIMIT 10", ("machine learning",)),
+            ("by_id", f"SELECT title FROM {table} WHERE id = ?", (scale // 2,)),
+        ]
+
+    return setup, queries
+
+
+def geo_workload():
+    import geo
+    import geo_loader
+
+    table = f"{geo.DB_SCHEMA}.{geo.GEO_POINTS_TABLE}"
+
+    def setup(cursor, scale):
+        geo.create_tables(cursor)
+        geo_loader.insert_points(cursor, geo_loader.random_points(scale), batch_size=BATCH_SIZE)
+        cursor.execute(f"REFRESH TABLE {table}")
+
+    def queries(scale):
+        return [
+            ("within_polygon", f"SELECT id, location FROM {table} WHERE within(location, ?)",
+             ("POLYGON ((-10 -10, 10 -10, 10 10, -10 10, -10 -10))",)),
+            ("distance", f"SELECT id FROM {table} WHERE distance(location, ?) < ?", ([0.0, 0.0], 500_000)),
+            ("by_id", f"SELECT location FROM {table} WHERE id = ?", (scale // 2,)),
+        ]
+
+    return setup, queries
+
+
+def timeseries_workload():
+    import timeseries
+
+    table = f"{timeseries.DB_SCHEMA}.{timeseries.TABLE_NAME}"
+
+    def setup(cursor, scale):
+        timeseries.create_table(cursor)
+        # Readings one second apart, so the primary key on "timestamp" never collides.
+        now = datetime.now(timezone.utc)
+        rows = [(now - timedelta(seconds=i), random.choice(["Berlin", "London", "Tokyo", "New York"]),
+                 round(random.uniform(10, 40), 2), round(random.uniform(20, 90), 2), round(random.uniform(0, 30), 2))
+                for i in range(scale)]
+        _batched(cursor, f"INSERT INTO {table} (timestamp, location, temperature, humidity, wind_speed) "
+                         f"VALUES (?, ?, ?, ?, ?)", rows)
+        cursor.execute(f"REFRESH TABLE {table}")
+
+    def queries(scale):
+        return [
+            ("last_day", timeseries.recent_query(), ()),
+            ("avg_by_location", f"SELECT location, AVG(temperature) FROM {table} GROUP BY location", ()),
+            ("latest", f"SELECT * FROM {table} ORDER BY timestamp DESC LIMIT 5", ()),
+        ]
+
+    return setup, queries
+
+
+def vector_workload():
+    import vector_ops
+
+    table = f"{vector_ops.DB_SCHEMA}.{vector_ops.TABLE_NAME}"
+    rng = random.Random(7)
+
+    def unit_vector():
+        vector = [rng.gauss(0, 1) for _ in range(vector_ops.EMBEDDING_DIM)]
+        norm = sum(x * x for x in vector) ** 0.5
+        return [x / norm for x in vector]
+
+    def setup(cursor, scale):
+        # Random unit vectors stand in for embeddings, so no model is loaded.
+        vector_ops.create_table(cursor, drop=True)
+        rows = [(f"doc-{i}", f"document {i}", unit_vector()) for i in range(scale)]
+        _batched(cursor, vector_ops.UPSERT_SQL, rows)
+        cursor.execute(f"REFRESH TABLE {table}")
+
+    def queries(scale):
+        query = unit_vector()
+        return [
+            ("knn_match", f"SELECT id, content, _score FROM {table} WHERE knn_match(embedding, ?, 3) "
+                          f"ORDER BY _score DESC", (query,)),
+            ("vector_similarity", f"SELECT id, content, vector_similarity(embedding, ?) AS similarity "
+                                  f"FROM {table} ORDER BY similarity DESC LIMIT 3", (query,)),
+        ]
+
+    return setup, queries
+
+
+WORKLOADS = {
+    "doc_json": doc_json_workload,
+    "fts": fts_workload,
+    "geo": geo_workload,
+    "timeseries": timeseries_workload,
+    "vector": vector_workload,
+}
+
+
+def _as_json(value):
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def lucene_queries(analyze):
+    """Names of the Lucene queries in an EXPLAIN ANALYZE result, e.g. ["TermQuery"]."""
+    found = []
+    if isinstance(analyze, dict):
+        for key, value in analyze.items():
+            if key == "QueryName":
+                found.append(value)
+            else:
+                found.extend(lucene_queries(value))
+    elif isinstance(analyze, list):
+        for value in analyze:
+            found.extend(lucene_queries(value))
+    return found
+
+
+def phase_timings(analyze, prefix="", in_timings=False):
+    """Flatten every number under a "Timings" key (or a "Time" field) into {"path/to/phase": ms}."""
+    timings = {}
+    if isinstance(analyze, dict):
+        for key, value in analyze.items():
+            path = f"{prefix}/{key}" if prefix else key
+            if isinstance(value, (int, float)) and (in_timings or key == "Time"):
+                timings[path] = float(value)
+            else:
+                timings.update(phase_timings(value, path, in_timings or key == "Timings"))
+    elif isinstance(analyze, list):
+        for i, value in enumerate(analyze):
+            timings.update(phase_timings(value, f"{prefix}/{i}", in_timings))
+    return timings
+
+
+def access_path(operators, queries):
+    """Classify how the rows were found: primary_key, index, full_scan or unknown."""
+    if "Get" in operators:
+        return "primary_key"
+    if queries and all(name == "MatchAllDocsQuery" for name in queries):
+        return "full_scan"
+    if queries:
+        return "index"
+    return "unknown"
+
+
+def profile_query(cursor, statement, params, repeats):
+    cursor.execute(f"EXPLAIN {statement}", params)
+    plan = "\n".join(str(row[0]) for row in cursor.fetchall())
+    operators = sorted(set(_OPERATOR.findall(plan)))
+
+    runs, analyze = [], None
+    for _ in range(repeats):
+        cursor.execute(f"EXPLAIN ANALYZE {statement}", params)
+        analyze = _as_json(cursor.fetchone()[0])
+        runs.append(phase_timings(analyze))
+    phases = {key: statistics.median(run[key] for run in runs if key in run) for key in runs[0]}
+    queries = sorted(set(lucene_queries(analyze)))
+    return {
+        "statement": " ".join(statement.split()),
+        "plan": plan,
+        "operators": operators,
+        "lucene_queries": queries,
+        "access_path": access_path(operators, queries),
+        "phases_ms": phases,
+        "analyze": analyze,
+    }
+
+
+def run(cursor, workloads, scales, repeats):
+    results = {}
+    for scale in scales:
+        for name in workloads:
+            setup, queries = WORKLOADS[name]()
+            setup(cursor, scale)
+            for query, statement, params in queries(scale):
+                key = f"{name}/{query}@{scale}"
+                results[key] = profile_query(cursor, statement, params, repeats)
+                print(f"🔍 {key:<40} {results[key]['access_path']:<12} {', '.join(results[key]['operators'])}")
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "scales": scales,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def diff(baseline, current, ratio=2.0, min_ms=1.0):
+    """Return a list of human-readable regressions of `current` against `baseline`."""
+    rank = {"primary_key": 0, "index": 1, "unknown": 2, "full_scan": 3}
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        if rank[now["access_path"]] > rank[before["access_path"]] and now["access_path"] != "unknown":
+            regressions.append(f"{key}: {before['access_path']} -> {now['access_path']} "
+                               f"({', '.join(before['lucene_queries'] or before['operators'])} -> "
+                               f"{', '.join(now['lucene_queries'] or now['operators'])})")
+        for phase, ms in now["phases_ms"].items():
+            old = before["phases_ms"].get(phase)
+            if old is not None and ms >= old * ratio and ms - old >= min_ms:
+                regressions.append(f"{key}: {phase} {old:.2f} ms -> {ms:.2f} ms ({ms / max(old, 1e-9):.1f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    parser.add_argument("--scales", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5, help="EXPLAIN ANALYZE runs per query; phases use the median")
+    parser.add_argument("--out", help="write this run's profiles to a JSON file")
+    parser.add_argument("--baseline", help="flag regressions against this earlier run")
+    parser.add_argument("--diff", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two saved runs without touching the database")
+    parser.add_argument("--ratio", type=float, default=2.0, help="slowdown factor that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    if args.diff:
+        with open(args.diff[0], encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.diff[1], encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        import doc_json
+
+        connection = doc_json.connect()
+        cursor = connection.cursor()
+        current = run(cursor, args.workloads, args.scales, args.repeats)
+        cursor.close()
+        connection.close()
+        if args.out:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2, default=str)
+            print(f"✅ Wrote {len(current['results'])} profiles to {args.out}")
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+
+    if baseline is not None:
+        regressions = diff(baseline, current, args.ratio, args.min_ms)
+        for regression in regressions:
+            print(f"⚠️ {regression}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
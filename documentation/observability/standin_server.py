@@ -0,0 +1,372 @@
+"""
+Offline stand-in for MonkDB's HTTP endpoints, for measuring client-side performance without a cluster.
+
+It speaks enough of the protocol for the monkdb client and the demo modules:
+
+- GET /                          server info (the client reads the version on connect)
+- POST /_sql                     {"stmt", "args"} or {"stmt", "bulk_args"}
+- PUT/GET/HEAD/DELETE /_blobs/<table>/<sha1>
+
+SQL is not executed. Tables are kept in memory, keyed by the first inserted column:
+
+- CREATE/DROP TABLE create and drop them,
+- INSERT stores rows, with DuplicateKeyException (or rowcount -2 in bulk) for a
+  key that exists, unless the statement has ON CONFLICT,
+- UPDATE and DELETE find the row by `WHERE <key> = ?`; UPDATE does not change it,
+- SELECT returns the row for `WHERE <key> = ?`, otherwise up to LIMIT stored rows
+  with no filtering or ranking, projected onto the selected columns.
+
+So responses have a realistic shape and size, which is what client-side
+benchmarks need, but they are not query results.
+
+Every response is delayed by the injected cost, so network and server behaviour
+can be dialled in:
+
+    latency_ms + uniform(0, jitter_ms) + rows * row_cost_us + bytes / bandwidth_mbps
+
+    python3 documentation/observability/standin_server.py --port 4200 --latency-ms 2 --bandwidth-mbps 1000
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_NAME = r'([\w."]+)'
+_CREATE = re.compile(rf"^CREATE\s+(?:BLOB\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?{_NAME}", re.IGNORECASE)
+_DROP = re.compile(rf"^DROP\s+(?:BLOB\s+)?TABLE\s+(?:IF\s+EXISTS\s+)?{_NAME}", re.IGNORECASE)
+_INSERT = re.compile(rf"^INSERT\s+INTO\s+{_NAME}\s*\(([^)]*)\)", re.IGNORECASE)
+_UPDATE = re.compile(rf"^UPDATE\s+{_NAME}", re.IGNORECASE)
+_DELETE = re.compile(rf"^DELETE\s+FROM\s+{_NAME}", re.IGNORECASE)
+_FROM = re.compile(rf"\bFROM\s+{_NAME}", re.IGNORECASE)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+|\?)", re.IGNORECASE)
+_RETURNING = re.compile(r"\bRETURNING\s+(.+)$", re.IGNORECASE | re.DOTALL)
+_ALIAS = re.compile(r"\s+AS\s+\"?(\w+)\"?\s*$", re.IGNORECASE)
+_BLOB_PATH = re.compile(r"^/_blobs/([^/]+)/([0-9a-f]{40})$")
+
+
+def _table(name):
+    return name.split(".")[-1].strip('"').lower()
+
+
+def _key(value):
+    return json.dumps(value, default=str)
+
+
+def _key_position(statement, column):
+    """Index of the parameter compared with `column` in `... WHERE column = ?`, or None."""
+    if column is None:
+        return None
+    match = re.search(rf'\bWHERE\b.*?(?<![\w\'])"?{re.escape(column)}"?\s*=\s*\?', statement,
+                      re.IGNORECASE | re.DOTALL)
+    return statement[:match.end()].count("?") - 1 if match else None
+
+
+def _split_top_level(text):
+    """Split a select list on commas that are not inside parentheses or quotes."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [part for part in parts if part]
+
+
+def _select_list(statement):
+    """Text between the outermost SELECT and its FROM (or the end of the statement)."""
+    body = re.sub(r"^\s*SELECT\s+", "", statement, flags=re.IGNORECASE)
+    depth = 0
+    for match in re.finditer(r"\(|\)|\bFROM\b", body, re.IGNORECASE):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            return body[:match.start()]
+    return body
+
+
+def _column_name(expression):
+    alias = _ALIAS.search(expression)
+    if alias:
+        return alias.group(1)
+    return expression.strip().strip('"')
+
+
+class Store:
+    """In-memory tables and blobs shared by all handler threads."""
+
+    def __init__(self, max_rows=10_000):
+        self.max_rows = max_rows
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.blobs = {}
+
+    def sql(self, statement, args=None, bulk_args=None):
+        """Return (status, response dict, rows touched)."""
+        statement = statement.strip().rstrip(";")
+        keyword = statement.split(None, 1)[0].upper() if statement else ""
+        with self.lock:
+            if keyword == "INSERT":
+                return self._insert(statement, args, bulk_args)
+            if keyword == "SELECT":
+                return self._select(statement, args or [])
+            if keyword in ("UPDATE", "DELETE"):
+                return self._write(statement, keyword, args, bulk_args)
+            if keyword == "CREATE" and _CREATE.match(statement):
+                self.tables.setdefault(_table(_CREATE.match(statement).group(1)), {"key": None, "rows": {}})
+            elif keyword == "DROP" and _DROP.match(statement):
+                self.tables.pop(_table(_DROP.match(statement).group(1)), None)
+        return 200, {"cols": [], "rows": [], "rowcount": 1}, 0
+
+    def _insert(self, statement, args, bulk_args):
+        match = _INSERT.match(statement)
+        if not match:
+            return 200, {"cols": [], "rows": [], "rowcount": 1}, 1
+        table = self.tables.setdefault(_table(match.group(1)), {"key": None, "rows": {}})
+        columns = [c.strip().strip('"') for c in match.group(2).split(",")]
+        table["key"] = table["key"] or columns[0]
+        rows = table["rows"]
+        upsert = "ON CONFLICT" in statement.upper()
+        results = []
+        for values in (bulk_args if bulk_args else [args or []]):
+            key = _key(values[0]) if values else None
+            if key in rows and not upsert:
+                results.append({"rowcount": -2, "error_message":
+                                "DuplicateKeyException[A document with the same primary key exists already]"})
+                continue
+            rows[key] = dict(zip(columns, values))
+            results.append({"rowcount": 1})
+        if bulk_args:
+            return 200, {"cols": [], "results": [{"rowcount": r["rowcount"]} for r in results]}, len(results)
+        if results[0]["rowcount"] == -2:
+            return 409, {"error": {"message": results[0]["error_message"], "code": 4091}}, 0
+        return 200, {"cols": [], "rows": [], "rowcount": 1}, 1
+
+    def _write(self, statement, keyword, args, bulk_args):
+        match = (_UPDATE if keyword == "UPDATE" else _DELETE).match(statement)
+        table = self.tables.get(_table(match.group(1))) if match else None
+        if table is None:
+            return 404, {"error": {"message": f"RelationUnknown[{statement[:80]}]", "code": 4041}}, 0
+        position = _key_position(statement, table["key"])
+        counts, returned = [], []
+        for values in (bulk_args if bulk_args else [args or []]):
+            key = _key(values[position]) if values and position is not None else None
+            row = table["rows"].get(key)
+            if row is not None and keyword == "DELETE":
+                del table["rows"][key]
+            elif row is not None:
+                returned.append(row)
+            counts.append(1 if row is not None else 0)
+        if bulk_args:
+            return 200, {"cols": [], "results": [{"rowcount": c} for c in counts]}, len(counts)
+        returning = _RETURNING.search(statement)
+        if returning:
+            names = [_column_name(c) for c in _split_top_level(returning.group(1))]
+            return 200, {"cols": names, "rows": [[self._value(row, n, 1) for n in names] for row in returned],
+                         "rowcount": counts[0]}, counts[0]
+        return 200, {"cols": [], "rows": [], "rowcount": counts[0]}, counts[0]
+
+    def _select(self, statement, args):
+        expressions = _split_top_level(_select_list(statement))
+        source = _FROM.search(statement)
+        table = None
+        if source:
+            table = self.tables.get(_table(source.group(1)))
+            if table is None and not source.group(1).lower().startswith(("information_schema", "sys")):
+                return 404, {"error": {"message": f"RelationUnknown[{source.group(1)}]", "code": 4041}}, 0
+        rows = list(table["rows"].values()) if table else [{}]
+        position = _key_position(statement, table["key"]) if table else None
+        if position is not None and position < len(args):
+            row = table["rows"].get(_key(args[position]))
+            rows = [row] if row is not None else []
+
+        limit = _LIMIT.search(statement)
+        count = self.max_rows
+        if limit and limit.group(1) != "?":
+            count = int(limit.group(1))
+        elif limit and args:
+            count = int(args[-1])
+        if any(re.match(r"COUNT\s*\(", e, re.IGNORECASE) for e in expressions):
+            rows, size = [{}], len(table["rows"]) if table else 0
+        else:
+            rows, size = rows[:count], None
+
+        names = []
+        for expression in expressions:
+            if expression == "*":
+                names.extend(rows[0].keys() if rows else [])
+            else:
+                names.append(_column_name(expression))
+        result = [[self._value(row, name, size) for name in names] for row in rows]
+        return 200, {"cols": names, "rows": result, "rowcount": len(result)}, len(result)
+
+    @staticmethod
+    def _value(row, name, count):
+        if name in row:
+            return row[name]
+        base = re.sub(r"\[.*$", "", name)
+        if base in row and isinstance(row[base], dict):
+            keys = re.findall(r"\['([^']+)'\]", name)
+            value = row[base]
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            return value
+        if count is not None:
+            return count
+        if re.fullmatch(r"-?\d+", name):
+            return int(name)
+        return 1.0 if "score" in name.lower() or "similarity" in name.lower() else None
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0.0, jitter_ms=0.0, bandwidth_mbps=None, row_cost_us=0.0,
+                 max_rows=10_000):
+        super().__init__(address, Handler)
+        self.store = Store(max_rows)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.row_cost_us = row_cost_us
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self, nbytes, rows):
+        seconds = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000 + rows * self.row_cost_us / 1e6
+        if self.bandwidth_mbps:
+            seconds += nbytes * 8 / (self.bandwidth_mbps * 1e6)
+        if seconds > 0:
+            time.sleep(seconds)
+        return seconds
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like MonkDB, so client pooling is measured
+    # Headers and body go out in separate writes; without TCP_NODELAY every response
+    # would wait for the client's delayed ACK (~40 ms on Linux).
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _reply(self, status, body=b"", content_type="application/json", rows=0, received=0):
+        if isinstance(body, dict):
+            body = json.dumps(body, default=str).encode("utf-8")
+        self.server.delay(received + len(body), rows)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split("?")[0] in ("/", ""):
+            self._reply(200, {"ok": True, "status": 200, "name": "standin",
+                              "cluster_name": "standin", "version": {"number": "5.10.0"}})
+            return
+        blob = _BLOB_PATH.match(self.path)
+        data = self.server.store.blobs.get(blob.groups()) if blob else None
+        if data is None:
+            self._reply(404)
+        else:
+            self._reply(200, data, "application/octet-stream")
+
+    def do_HEAD(self):
+        blob = _BLOB_PATH.match(self.path)
+        self._reply(200 if blob and blob.groups() in self.server.store.blobs else 404)
+
+    def do_DELETE(self):
+        blob = _BLOB_PATH.match(self.path)
+        found = blob is not None and self.server.store.blobs.pop(blob.groups(), None) is not None
+        self._reply(204 if found else 404)
+
+    def do_PUT(self):
+        blob = _BLOB_PATH.match(self.path)
+        data = self._body()
+        if blob is None or hashlib.sha1(data).hexdigest() != blob.group(2):  # noqa: S324
+            self._reply(400, received=len(data))
+            return
+        with self.server.store.lock:
+            exists = blob.groups() in self.server.store.blobs
+            self.server.store.blobs[blob.groups()] = data
+        self._reply(409 if exists else 201, received=len(data))
+
+    def do_POST(self):
+        raw = self._body()
+        if self.path.split("?")[0] != "/_sql":
+            self._reply(404, received=len(raw))
+            return
+        started = time.perf_counter()
+        try:
+            payload = json.loads(raw)
+            status, response, rows = self.server.store.sql(
+                payload["stmt"], payload.get("args"), payload.get("bulk_args"))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            status, response, rows = 400, {"error": {"message": f"SQLParseException[{e}]", "code": 4000}}, 0
+        response["duration"] = (time.perf_counter() - started) * 1000
+        self._reply(status, response, rows=rows, received=len(raw))
+
+
+def start(port=0, host="127.0.0.1", **options):
+    """Start a stand-in on a daemon thread and return it; port 0 picks a free port (see .url)."""
+    server = StandIn((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4200)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixed delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra uniform random delay per request")
+    parser.add_argument("--bandwidth-mbps", type=float, help="throughput limit for request + response bytes")
+    parser.add_argument("--row-cost-us", type=float, default=0.0, help="simulated server time per row")
+    parser.add_argument("--max-rows", type=int, default=10_000, help="rows returned by a SELECT without LIMIT")
+    args = parser.parse_args()
+
+    server = StandIn((args.host, args.port), args.latency_ms, args.jitter_ms, args.bandwidth_mbps,
+                     args.row_cost_us, args.max_rows)
+    print(f"🔧 MonkDB stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -23,39 +23,38 @@ DB_PASSWORD = config['database']['DB_PASSWORD']
 DB_SCHEMA = config['database']['DB_SCHEMA']
 TABLE_NAME = config['database']['TIMESERIES_TABLE_NAME']
 
-# Create a MonkDB connection
-try:
-    connection = client.connect(
+
+def connect():
+    """Open a new MonkDB connection using the credentials from config.ini."""
+    return client.connect(
         f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER
     )
-    cursor = connection.cursor()
-    print("✅ Database connection established successfully!")
-except Exception as e:
-    print(f"⚠️ Error connecting to the database: {e}")
-    exit(1)
-
-# Faker for generating locations
-fake = Faker()
-
-# Drop table if it exists
-cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{TABLE_NAME}")
-print(f"Dropped {DB_SCHEMA}.{TABLE_NAME} table")
-
-# Create a table
-cursor.execute(f"""
-    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{TABLE_NAME} (
-        "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL,
-       "location" TEXT NOT NULL,
-        "temperature" REAL NOT NULL,
-        "humidity" REAL NOT NULL,
-        "wind_speed" REAL NOT NULL,
-        PRIMARY KEY ("timestamp")
-    )
-""")
+
+
+def create_table(cursor, table=TABLE_NAME, drop=True):
+    if drop:
+        # Drop table if it exists
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{table}")
+        print(f"Dropped {DB_SCHEMA}.{table} table")
+
+    # Create a table
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{table} (
+            "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL,
+            "location" TEXT NOT NULL,
+            "temperature" REAL NOT NULL,
+            "humidity" REAL NOT NULL,
+            "wind_speed" REAL NOT NULL,
+            PRIMARY KEY ("timestamp")
+        )
+    """)
+
 # Generate and Insert Time-Series Data
 
 
-def insert_sensor_data(num_rows=10):
+def insert_sensor_data(cursor, num_rows=10, table=TABLE_NAME):
+    # Faker for generating locations
+    fake = Faker()
     base_time = datetime.utcnow()
 
     for _ in range(num_rows):
@@ -66,26 +65,28 @@ def insert_sensor_data(num_rows=10):
         wind_speed = round(random.uniform(0, 30), 2)
 
         query = f"""
-        INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (timestamp, location, temperature, humidity, wind_speed) 
+        INSERT INTO {DB_SCHEMA}.{table} (timestamp, location, temperature, humidity, wind_speed) 
         VALUES (?, ?, ?, ?, ?)
         """
         cursor.execute(query, (timestamp, location,
                        temperature, humidity, wind_speed))
 
-    connection.commit()
     print(f"Inserted {num_rows} sensor records.")
 
 # Query Time-Series Data
 
 
-def fetch_sensor_data():
-    query = f"""
+def recent_query(table=TABLE_NAME):
+    return f"""
     SELECT timestamp, location, temperature, humidity, wind_speed 
-    FROM {DB_SCHEMA}.{TABLE_NAME} 
+    FROM {DB_SCHEMA}.{table} 
     WHERE timestamp >= NOW() - INTERVAL '1 day'
     ORDER BY timestamp ASC
     """
-    cursor.execute(query)
+
+
+def fetch_sensor_data(cursor, table=TABLE_NAME):
+    cursor.execute(recent_query(table))
     rows = cursor.fetchall()
 
     if not rows:
@@ -98,10 +99,26 @@ def fetch_sensor_data():
             f"{row[0]} | {row[1]} | Temp: {row[2]}°C | Humidity: {row[3]}% | Wind Speed: {row[4]} km/h")
 
 
-# Run the functions
-insert_sensor_data(10)
-fetch_sensor_data()
+def main():
+    # Create a MonkDB connection
+    try:
+        connection = connect()
+        cursor = connection.cursor()
+        print("✅ Database connection established successfully!")
+    except Exception as e:
+        print(f"⚠️ Error connecting to the database: {e}")
+        exit(1)
+
+    create_table(cursor)
+
+    # Run the functions
+    insert_sensor_data(cursor, 10)
+    fetch_sensor_data(cursor)
+
+    # Close connection
+    cursor.close()
+    connection.close()
+
 
-# Close connection
-cursor.close()
-connection.close()
+if __name__ == "__main__":
+    main()
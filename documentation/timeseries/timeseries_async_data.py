@@ -4,6 +4,7 @@ from datetime import datetime
 import random
 import configparser
 import os
+import sys
 
 # Determine the absolute path of the config.ini file
 # Get the directory of the current script
@@ -15,6 +16,10 @@ config_file_path = os.path.join(current_directory, "..", "config.ini")
 config = configparser.ConfigParser()
 config.read(config_file_path, encoding="utf-8")
 
+# Per-statement latency, rows and bytes, scraped from http://127.0.0.1:9464/metrics
+sys.path.append(os.path.join(current_directory, "..", "observability"))
+from instrumentation import REGISTRY, instrument, serve_metrics  # noqa: E402
+
 # MonkDB Connection Details from config file
 DB_HOST = config['database']['DB_HOST']
 DB_PORT = config['database']['DB_PORT']
@@ -23,11 +28,15 @@ DB_PASSWORD = config['database']['DB_PASSWORD']
 DB_SCHEMA = config['database']['DB_SCHEMA']
 TABLE_NAME = config['database']['TIMESERIES_ASYNC_TABLE_NAME']
 
+# The metrics list every SQL statement; set to "0.0.0.0" to let a remote Prometheus scrape them.
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+
 # Create a MonkDB connection
 try:
-    connection = client.connect(
+    connection = instrument(client.connect(
         f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER
-    )
+    ), slow_ms=200)
     cursor = connection.cursor()
 except Exception as e:
     print(f"⚠️ Error connecting to the database: {e}")
@@ -101,6 +110,11 @@ async def insert_data():
                 print(
                     f"Timestamp: {row[0]}, Location: {row[1]}, Temperature: {row[2]}, Humidity: {row[3]}, Wind Speed: {row[4]}")
 
+            print("\nHottest statements:")
+            for statement, stats in REGISTRY.top(3):
+                print(f"{stats['calls']:>6} calls  p50 {stats['p50_ms']:>6.1f} ms  "
+                      f"p99 {stats['p99_ms']:>6.1f} ms  {statement[:70]}")
+
         finally:
             # Close the cursor explicitly
             cursor.close()
@@ -111,6 +125,8 @@ async def insert_data():
 
 
 async def main():
+    serve_metrics(METRICS_PORT, host=METRICS_HOST)
+    print(f"📈 Metrics at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
     try:
         await insert_data()
     except KeyboardInterrupt:
@@ -0,0 +1,82 @@
+"""
+Measures the cold-start cost of the vector module and the latency of the first query.
+
+Run it as a fresh process each time; the numbers are only meaningful cold. The
+pre-forked pool is measured in a fresh spawned process too: forking after the
+embeddings above have started torch's thread pool would not be safe.
+
+    python3 documentation/vector/benchmark_cold_start.py
+    python3 documentation/vector/benchmark_cold_start.py --skip-db --pool-workers 4
+"""
+
+import time
+
+# Start the clock before anything from the vector module is imported so the
+# reported import time is the true cold cost of a fresh interpreter.
+_process_start = time.perf_counter()
+
+import argparse  # noqa: E402
+import multiprocessing  # noqa: E402
+import vector_ops  # noqa: E402
+from embedding_pool import EmbeddingPool  # noqa: E402
+
+
+def timed(label, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{label:<40} {elapsed_ms:>10.1f} ms")
+    return result
+
+
+def measure_pool(workers, count):
+    """Start a pool from a process that has not embedded anything, then time it."""
+    texts = [f"benchmark sentence number {i}" for i in range(count)]
+    pool = timed(f"start pool ({workers} workers)", EmbeddingPool, processes=workers)
+    timed(f"first pool.embed ({len(texts)} texts)", pool.embed, texts)
+    start = time.perf_counter()
+    pool.embed(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{'warm pool throughput':<40} {len(texts) / elapsed:>10.1f} texts/s")
+    pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skip-db", action="store_true",
+                        help="only measure the model, do not query MonkDB")
+    parser.add_argument("--pool-workers", type=int, default=0,
+                        help="also measure a pre-forked pool of this many workers")
+    parser.add_argument("--pool-texts", type=int, default=1024,
+                        help="number of texts embedded through the pool")
+    args = parser.parse_args()
+
+    print("⏱️ Vector module cold start")
+    print(f"{'import vector_ops':<40} {(time.perf_counter() - _process_start) * 1000:>10.1f} ms")
+
+    timed("load model (first get_model)", vector_ops.get_model)
+    timed("first embedding", vector_ops.generate_embedding, "cold query")
+    timed("second embedding", vector_ops.generate_embedding, "warm query")
+
+    if not args.skip_db:
+        connection = timed("connect", vector_ops.connect)
+        cursor = connection.cursor()
+        timed("first knn_search", vector_ops.knn_search, cursor,
+              "Find databases optimized for vector search.")
+        timed("second knn_search", vector_ops.knn_search, cursor,
+              "Which databases handle embeddings?")
+        cursor.close()
+        connection.close()
+
+    if args.pool_workers:
+        process = multiprocessing.get_context("spawn").Process(
+            target=measure_pool, args=(args.pool_workers, args.pool_texts))
+        process.start()
+        process.join()
+
+    print(f"{'total':<40} {(time.perf_counter() - _process_start) * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
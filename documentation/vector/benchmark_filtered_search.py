@@ -0,0 +1,143 @@
+"""
+Measures latency and recall@k of filtered vector search, by filter selectivity and
+table layout.
+
+--vectors synthetic embeddings (unit vectors scattered around 64 cluster centres,
+so neighbourhoods mean something) are loaded into two scratch tables:
+
+- default: the documents table layout, rows spread over the shards by id,
+- tenant: create_table(..., tenant_shards=--shards), clustered by tenant_id.
+
+Each row belongs to one of --tenants tenants (a few large, many small) and has
+metadata.bucket = i % 1000, so {"bucket": {"$lt": n}} keeps n / 1000 of the rows.
+Three strategies answer the same queries:
+
+- post-filter: knn_match(k) without the filter, then the filter in Python, which is
+  what a caller had to do before similarity_search took a filter,
+- knn + filter: knn_match(k) AND the filter in one query, without oversampling,
+- store: MonkDBVectorStore.similarity_search_by_vector_with_score(filter=...),
+  which scans small matches exactly and oversamples knn_match otherwise.
+
+Recall is measured against the exact top k, computed in NumPy over the same vectors.
+
+    python3 documentation/vector/benchmark_filtered_search.py
+    python3 documentation/vector/benchmark_filtered_search.py --vectors 200000 --queries 50 --k 10
+"""
+
+import argparse
+import time
+import numpy as np
+import vector_ops
+
+SELECTIVITIES = [0.5, 0.1, 0.01, 0.001]
+STRATEGIES = ["post-filter", "knn + filter", "store"]
+
+
+def make_vectors(rng, count, dim, centres=64):
+    centre_vectors = rng.standard_normal((centres, dim)).astype(np.float32)
+    vectors = centre_vectors[rng.integers(0, centres, count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load(cursor, table, tenant_shards, vectors, tenants):
+    vector_ops.create_table(cursor, drop=True, table=table, tenant_shards=tenant_shards)
+    statement = vector_ops.upsert_sql(table, tenant_routing=bool(tenant_shards))
+    for start in range(0, len(vectors), 1000):
+        cursor.executemany(statement, [
+            [f"v{i}", tenants[i], f"document {i}", {"bucket": i % 1000}, vectors[i].tolist()]
+            for i in range(start, min(start + 1000, len(vectors)))])
+    cursor.execute(f"REFRESH TABLE {vector_ops.DB_SCHEMA}.{table}")
+
+
+def exact_top_k(vectors, query, mask, k):
+    distances = ((vectors - query) ** 2).sum(axis=1)
+    distances[~mask] = np.inf
+    top = np.argpartition(distances, min(k, len(distances) - 1))[:k]
+    return {f"v{i}" for i in top if mask[i]}
+
+
+def search(strategy, store, query, k, filter, mask):
+    """Return the ids one strategy finds for `query`."""
+    table = f"{vector_ops.DB_SCHEMA}.{store.table}"
+    if strategy == "store":
+        return [doc.metadata["id"] for doc, _ in store.similarity_search_by_vector_with_score(query, k, filter)]
+    if strategy == "post-filter":
+        store.cursor.execute(
+            f"SELECT id FROM {table} WHERE knn_match(embedding, ?, {k}) ORDER BY _score DESC LIMIT {k}", [query])
+        return [row[0] for row in store.cursor.fetchall() if mask[int(row[0][1:])]]
+    where, params = vector_ops.filter_clause(filter)
+    store.cursor.execute(
+        f"SELECT id FROM {table} WHERE knn_match(embedding, ?, {k}) AND {where} "
+        f"ORDER BY _score DESC LIMIT {k}", [query, *params])
+    return [row[0] for row in store.cursor.fetchall()]
+
+
+def measure(strategy, store, vectors, queries, k, filters):
+    """Return (p50 ms, p95 ms, recall@k) over the queries; filters[i] is (filter, mask) for query i."""
+    latencies, recalls = [], []
+    for query, (filter, mask) in zip(queries, filters):
+        truth = exact_top_k(vectors, query, mask, k)
+        started = time.perf_counter()
+        found = search(strategy, store, query.tolist(), k, filter, mask)
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(len(truth & set(found)) / len(truth) if truth else 1.0)
+    return float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95)), float(np.mean(recalls))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--shards", type=int, default=6, help="shards of the tenant-routed table")
+    parser.add_argument("--selectivities", type=float, nargs="+", default=SELECTIVITIES)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = make_vectors(rng, args.vectors, vector_ops.EMBEDDING_DIM)
+    weights = 1.0 / np.arange(1, args.tenants + 1)
+    tenant_of = rng.choice(args.tenants, size=args.vectors, p=weights / weights.sum())
+    tenants = [f"tenant_{t:03d}" for t in tenant_of]
+    queries = make_vectors(rng, args.queries, vector_ops.EMBEDDING_DIM)
+    buckets = np.arange(args.vectors) % 1000
+
+    connection = vector_ops.connect()
+    cursor = connection.cursor()
+    layouts = {"default": f"{vector_ops.TABLE_NAME}_filter_bench",
+               "tenant": f"{vector_ops.TABLE_NAME}_tenant_bench"}
+    print(f"⏱️ Loading {args.vectors:,} vectors into both layouts")
+    load(cursor, layouts["default"], None, vectors, tenants)
+    load(cursor, layouts["tenant"], args.shards, vectors, tenants)
+
+    stores = {layout: vector_ops.MonkDBVectorStore(connection, vector_ops.EMBEDDING_DIM, table,
+                                                   tenant_routing=layout == "tenant")
+              for layout, table in layouts.items()}
+
+    print(f"\n{'filter':<24} {'layout':<8} {'strategy':<13} {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(args.k):>10}")
+    for selectivity in args.selectivities:
+        limit = max(1, int(selectivity * 1000))
+        filter = {"bucket": {"$lt": limit}}
+        filters = [(filter, buckets < limit)] * len(queries)
+        for strategy in STRATEGIES:
+            p50, p95, recall = measure(strategy, stores["default"], vectors, queries, args.k, filters)
+            print(f"{'bucket, ' + format(limit / 1000, '.1%'):<24} {'default':<8} {strategy:<13} "
+                  f"{p50:>8.1f} {p95:>8.1f} {recall:>10.3f}")
+
+    # One tenant per query, drawn by size, on both layouts.
+    picked = rng.choice(args.tenants, size=len(queries), p=weights / weights.sum())
+    filters = [({"tenant_id": f"tenant_{t:03d}"}, tenant_of == t) for t in picked]
+    for layout, store in stores.items():
+        for strategy in STRATEGIES:
+            p50, p95, recall = measure(strategy, store, vectors, queries, args.k, filters)
+            print(f"{'tenant_id':<24} {layout:<8} {strategy:<13} {p50:>8.1f} {p95:>8.1f} {recall:>10.3f}")
+
+    for table in layouts.values():
+        cursor.execute(f"DROP TABLE IF EXISTS {vector_ops.DB_SCHEMA}.{table}")
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compares the single-statement hybrid query with the two sequential calls it replaces
+(a MATCH() query followed by a knn_match() query).
+
+Both paths reuse the same precomputed query embeddings, so the numbers only show
+database and network time. Run hybrid_search.py first to create and fill the table.
+
+    python3 documentation/vector/benchmark_hybrid.py
+"""
+
+import statistics
+import time
+import hybrid_search
+import vector_ops
+from hybrid_search import DB_SCHEMA, TABLE_NAME
+
+QUERIES = [
+    "AI search over embeddings",
+    "deep learning for images",
+    "ethics and bias in machine learning",
+    "analytics for business decisions",
+    "time-series and vector database",
+]
+ITERATIONS = 200
+FETCH_K = 50
+
+
+def sequential(cursor, query, embedding):
+    cursor.execute(f"""
+    SELECT id, title, content, _score FROM {DB_SCHEMA}.{TABLE_NAME}
+    WHERE MATCH(content, ?) ORDER BY _score DESC LIMIT {FETCH_K}
+    """, [query])
+    lexical = cursor.fetchall()
+    cursor.execute(f"""
+    SELECT id, title, content, _score FROM {DB_SCHEMA}.{TABLE_NAME}
+    WHERE knn_match(embedding, ?, {FETCH_K}) ORDER BY _score DESC LIMIT {FETCH_K}
+    """, [embedding])
+    vector = cursor.fetchall()
+    return hybrid_search.reciprocal_rank_fusion(
+        {hybrid_search.LEXICAL: lexical, hybrid_search.VECTOR: vector})
+
+
+def single_statement(cursor, query, embedding):
+    ranked = hybrid_search.fetch_candidates(cursor, query, FETCH_K, embedding)
+    return hybrid_search.reciprocal_rank_fusion(ranked)
+
+
+def measure(fn, cursor, embedded_queries):
+    timings = []
+    for i in range(ITERATIONS):
+        query, embedding = embedded_queries[i % len(embedded_queries)]
+        start = time.perf_counter()
+        fn(cursor, query, embedding)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    connection = vector_ops.connect()
+    cursor = connection.cursor()
+    embedded_queries = list(zip(QUERIES, vector_ops.generate_embeddings(QUERIES)))
+
+    # Warm up connections and caches on the server before measuring.
+    for query, embedding in embedded_queries:
+        sequential(cursor, query, embedding)
+        single_statement(cursor, query, embedding)
+
+    print(f"⏱️ Hybrid retrieval, fetch_k={FETCH_K}, {ITERATIONS} queries")
+    print(f"{'path':<28} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for label, fn in [("two sequential queries", sequential),
+                      ("single UNION ALL statement", single_statement)]:
+        p50, p99 = measure(fn, cursor, embedded_queries)
+        print(f"{label:<28} {p50:>10.2f} {p99:>10.2f}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmarks the NumPy MMR selection in mmr.py against a straightforward Python-loop
+implementation, for candidate pools of up to 1000 embeddings.
+
+No database is needed: the candidate pool is random unit vectors of the same
+dimension as all-MiniLM-L6-v2, which is what max_marginal_relevance_search feeds
+the selection after its single knn_match round trip.
+
+    python3 documentation/vector/benchmark_mmr.py
+"""
+
+import time
+import numpy as np
+from mmr import maximal_marginal_relevance
+
+EMBEDDING_DIM = 384
+FETCH_K_VALUES = [20, 100, 250, 500, 1000]
+K = 10
+LAMBDA_MULT = 0.5
+REPEATS = 20
+
+
+def cosine(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def loop_mmr(query_embedding, embeddings, k=4, lambda_mult=0.5):
+    """Reference MMR that recomputes similarities pair by pair in Python."""
+    selected = []
+    candidates = list(range(len(embeddings)))
+    while candidates and len(selected) < k:
+        best, best_score = None, -np.inf
+        for i in candidates:
+            relevance = cosine(query_embedding, embeddings[i])
+            redundancy = max((cosine(embeddings[i], embeddings[j]) for j in selected),
+                             default=0.0)
+            score = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+            if score > best_score:
+                best, best_score = i, score
+        selected.append(best)
+        candidates.remove(best)
+    return selected
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    rng = np.random.default_rng(42)
+    query = rng.standard_normal(EMBEDDING_DIM).astype(np.float32)
+
+    print(f"⏱️ MMR selection, k={K}, lambda_mult={LAMBDA_MULT}, dim={EMBEDDING_DIM}")
+    print(f"{'fetch_k':>8} {'numpy (ms)':>12} {'python loop (ms)':>18} {'speed-up':>10}")
+    for fetch_k in FETCH_K_VALUES:
+        embeddings = rng.standard_normal(
+            (fetch_k, EMBEDDING_DIM)).astype(np.float32)
+
+        vectorized = maximal_marginal_relevance(query, embeddings, K, LAMBDA_MULT)
+        reference = loop_mmr(query, embeddings, K, LAMBDA_MULT)
+        # Both implementations must pick the same documents in the same order.
+        assert vectorized == reference, (vectorized, reference)
+
+        numpy_ms = best_of(lambda: maximal_marginal_relevance(
+            query, embeddings, K, LAMBDA_MULT), REPEATS)
+        loop_ms = best_of(lambda: loop_mmr(
+            query, embeddings, K, LAMBDA_MULT), max(1, REPEATS // 10))
+        print(f"{fetch_k:>8} {numpy_ms:>12.3f} {loop_ms:>18.3f} {loop_ms / numpy_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
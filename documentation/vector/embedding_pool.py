@@ -0,0 +1,75 @@
+"""
+A warm, pre-forked pool of embedding workers.
+
+The parent loads the SentenceTransformer once through vector_ops.preload_model()
+and then forks the workers. The model weights are large, read-only tensor buffers,
+so every child shares the parent's pages copy-on-write instead of loading its own
+copy from disk. gc.freeze() moves the already-loaded objects out of the garbage
+collector's reach so the collector in a child does not write to (and thereby copy)
+those pages. The parent unfreezes them again once the workers are forked.
+
+Only the weights are loaded before the fork. The first encode() is run inside each
+worker by its initializer, because torch starts its intra-op thread pool on the
+first forward pass and a thread pool does not survive a fork. For the same reason
+the pool must be created before the parent embeds anything itself.
+
+The fork start method is not available on Windows. There the pool falls back to
+the platform default (spawn) and every worker loads its own copy of the model.
+"""
+
+import gc
+import multiprocessing
+import vector_ops
+
+
+def _warm_worker(num_threads):
+    """Pin torch threads per worker and run one forward pass so the worker starts warm."""
+    import torch
+    torch.set_num_threads(num_threads)
+    vector_ops.generate_embedding("warm up")
+
+
+def _encode_chunk(texts):
+    return vector_ops.generate_embeddings(texts)
+
+
+class EmbeddingPool:
+    def __init__(self, processes=None, threads_per_worker=1):
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        if fork:
+            vector_ops.preload_model()
+            gc.freeze()
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+
+        try:
+            self._pool = context.Pool(
+                processes=processes,
+                initializer=_warm_worker,
+                initargs=(threads_per_worker,),
+            )
+        finally:
+            if fork:
+                # The workers keep their frozen copy; the parent collects normally again.
+                gc.unfreeze()
+
+    def embed(self, texts, chunk_size=64):
+        """Embed texts across the workers, preserving input order."""
+        texts = list(texts)
+        chunks = [texts[i:i + chunk_size]
+                  for i in range(0, len(texts), chunk_size)]
+        embeddings = []
+        for chunk_embeddings in self._pool.map(_encode_chunk, chunks):
+            embeddings.extend(chunk_embeddings)
+        return embeddings
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
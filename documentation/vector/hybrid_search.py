@@ -0,0 +1,210 @@
+"""
+Hybrid retrieval: BM25 full-text search and vector search over one table in one round trip.
+
+The table carries both a FULLTEXT-indexed `content` column and a FLOAT_VECTOR
+`embedding` column. hybrid_search() sends a single statement that runs the
+lexical MATCH() subquery and the knn_match() subquery side by side (UNION ALL),
+each already cut down to its own top `fetch_k`, and fuses the two ranked lists
+client-side with either reciprocal-rank fusion or a weighted sum of normalised
+scores.
+
+    python3 documentation/vector/hybrid_search.py
+"""
+
+import configparser
+import os
+import vector_ops
+
+# Determine the absolute path of the config.ini file
+# Get the directory of the current script
+current_directory = os.path.dirname(os.path.realpath(__file__))
+# Construct absolute path
+config_file_path = os.path.join(current_directory, "..", "config.ini")
+
+# Load configuration from config.ini file
+config = configparser.ConfigParser()
+config.read(config_file_path, encoding="utf-8")
+
+DB_SCHEMA = config['database']['DB_SCHEMA']
+TABLE_NAME = config['database']['HYBRID_TABLE_NAME']
+
+LEXICAL = "lexical"
+VECTOR = "vector"
+
+# Equal say for both retrievers unless the caller decides otherwise.
+DEFAULT_WEIGHTS = {LEXICAL: 1.0, VECTOR: 1.0}
+# The constant from the original RRF paper; it damps the influence of the very top ranks.
+RRF_K = 60
+
+
+def create_hybrid_table(cursor, drop=False, analyzer="english"):
+    """Create a table with both a full-text index and a vector column."""
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{TABLE_NAME}")
+        print(f"Dropped {DB_SCHEMA}.{TABLE_NAME} table")
+
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{TABLE_NAME} (
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        content TEXT INDEX USING FULLTEXT WITH (analyzer = '{analyzer}'),
+        embedding FLOAT_VECTOR({vector_ops.EMBEDDING_DIM})
+    )
+    """)
+    print(f"✅ Table '{DB_SCHEMA}.{TABLE_NAME}' is ready.")
+
+
+def upsert_documents(cursor, documents):
+    """Insert or update (id, title, content) tuples, embedding them in one batch."""
+    embeddings = vector_ops.generate_embeddings(
+        [content for _, _, content in documents])
+    cursor.executemany(f"""
+    INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (id, title, content, embedding)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        title = excluded.title,
+        content = excluded.content,
+        embedding = excluded.embedding
+    """, [[doc_id, title, content, embedding]
+          for (doc_id, title, content), embedding in zip(documents, embeddings)])
+
+
+def _hybrid_sql(fetch_k):
+    fetch_k = int(fetch_k)
+    return f"""
+    SELECT '{LEXICAL}' AS source, id, title, content, score FROM (
+        SELECT id, title, content, _score AS score
+        FROM {DB_SCHEMA}.{TABLE_NAME}
+        WHERE MATCH(content, ?)
+        ORDER BY _score DESC
+        LIMIT {fetch_k}
+    ) lexical
+    UNION ALL
+    SELECT '{VECTOR}' AS source, id, title, content, score FROM (
+        SELECT id, title, content, _score AS score
+        FROM {DB_SCHEMA}.{TABLE_NAME}
+        WHERE knn_match(embedding, ?, {fetch_k})
+        ORDER BY _score DESC
+        LIMIT {fetch_k}
+    ) vector
+    """
+
+
+def fetch_candidates(cursor, query, fetch_k=50, query_embedding=None):
+    """
+    Run both retrievers in one statement.
+
+    Returns {source: [(id, title, content, score), ...]}, each list in rank order.
+    """
+    if query_embedding is None:
+        query_embedding = vector_ops.generate_embedding(query)
+    cursor.execute(_hybrid_sql(fetch_k), [query, query_embedding])
+
+    ranked = {LEXICAL: [], VECTOR: []}
+    for source, doc_id, title, content, score in cursor.fetchall():
+        ranked[source].append((doc_id, title, content, score))
+    # UNION ALL keeps each branch's rows together but does not promise their order.
+    for rows in ranked.values():
+        rows.sort(key=lambda row: row[3], reverse=True)
+    return ranked
+
+
+def _merge_weights(weights):
+    """Fill in DEFAULT_WEIGHTS for retrievers the caller did not weigh."""
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown retrievers {sorted(unknown)}; choose from {sorted(DEFAULT_WEIGHTS)}")
+    return weights
+
+
+def reciprocal_rank_fusion(ranked, weights=None, rrf_k=RRF_K):
+    """Score each document by sum(weight / (rrf_k + rank)) over the lists it appears in."""
+    weights = _merge_weights(weights)
+    fused = {}
+    for source, rows in ranked.items():
+        weight = weights[source]
+        for rank, (doc_id, title, content, _) in enumerate(rows, start=1):
+            entry = fused.setdefault(doc_id, [doc_id, title, content, 0.0])
+            entry[3] += weight / (rrf_k + rank)
+    return sorted((tuple(entry) for entry in fused.values()),
+                  key=lambda row: row[3], reverse=True)
+
+
+def weighted_score_fusion(ranked, weights=None):
+    """
+    Score each document by the weighted sum of its min-max normalised scores.
+
+    BM25 scores are unbounded while vector scores are not, so each list is scaled
+    to [0, 1] on its own before the weights are applied. A list with a single row,
+    or with all scores equal, gives every row 1.0.
+    """
+    weights = _merge_weights(weights)
+    fused = {}
+    for source, rows in ranked.items():
+        if not rows:
+            continue
+        weight = weights[source]
+        scores = [row[3] for row in rows]
+        low, high = min(scores), max(scores)
+        spread = high - low
+        for doc_id, title, content, score in rows:
+            entry = fused.setdefault(doc_id, [doc_id, title, content, 0.0])
+            entry[3] += weight * ((score - low) / spread if spread else 1.0)
+    return sorted((tuple(entry) for entry in fused.values()),
+                  key=lambda row: row[3], reverse=True)
+
+
+def hybrid_search(cursor, query, k=10, fetch_k=50, method="rrf", weights=None, rrf_k=RRF_K):
+    """
+    Return the top k (id, title, content, fused_score) rows for the query.
+
+    method is "rrf" (reciprocal-rank fusion) or "weighted" (normalised score sum).
+    weights maps "lexical" and "vector" to their share of the fused score.
+    """
+    ranked = fetch_candidates(cursor, query, fetch_k)
+    if method == "rrf":
+        fused = reciprocal_rank_fusion(ranked, weights, rrf_k)
+    elif method == "weighted":
+        fused = weighted_score_fusion(ranked, weights)
+    else:
+        raise ValueError(f"Unknown fusion method: {method}")
+    return fused[:k]
+
+
+def main():
+    try:
+        connection = vector_ops.connect()
+        cursor = connection.cursor()
+        print("✅ Database connection established successfully!")
+    except Exception as e:
+        print(f"⚠️ Error connecting to the database: {e}")
+        exit(1)
+
+    create_hybrid_table(cursor, drop=True)
+    upsert_documents(cursor, [
+        ("doc_1", "Machine Learning", "Machine learning algorithms power modern AI applications."),
+        ("doc_2", "Deep Learning", "Deep learning revolutionized image recognition and NLP."),
+        ("doc_3", "AI Ethics", "Ethical considerations in AI are crucial for fairness and bias mitigation."),
+        ("doc_4", "Vector Databases", "Vector databases optimize similarity search for high-dimensional data."),
+        ("doc_5", "Big Data Analytics", "Big data analytics transforms decision-making in businesses."),
+        ("doc_6", "MonkDB", "MonkDB is great for time-series and vector workloads."),
+    ])
+    cursor.execute(f"REFRESH TABLE {DB_SCHEMA}.{TABLE_NAME}")
+
+    query = "AI search over embeddings"
+    print(f"\n🔍 Hybrid search (reciprocal-rank fusion) for '{query}':")
+    for doc_id, title, content, score in hybrid_search(cursor, query, k=5):
+        print(f"ID: {doc_id}, Title: {title}, Content: {content}, Score: {score:.4f}")
+
+    print(f"\n🔍 Hybrid search (weighted, lexical 0.3 / vector 0.7) for '{query}':")
+    for doc_id, title, content, score in hybrid_search(
+            cursor, query, k=5, method="weighted", weights={LEXICAL: 0.3, VECTOR: 0.7}):
+        print(f"ID: {doc_id}, Title: {title}, Content: {content}, Score: {score:.4f}")
+
+    cursor.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Maximal marginal relevance (MMR) selection in NumPy.
+
+MMR picks k of the candidate vectors one at a time, each time taking the candidate
+that maximises
+
+    lambda_mult * sim(query, candidate) - (1 - lambda_mult) * max(sim(candidate, selected))
+
+The candidate-to-candidate similarity matrix is computed once with a single matrix
+product. Every selection step is then a handful of array operations over all
+candidates: the running "closest selected neighbour" similarity is updated with the
+row of the matrix that belongs to the last pick, so no step loops over candidates or
+over the already selected set in Python.
+"""
+
+import numpy as np
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def maximal_marginal_relevance(query_embedding, embeddings, k=4, lambda_mult=0.5):
+    """Return the indices of the k embeddings selected by MMR, in selection order."""
+    embeddings = _normalize(embeddings)
+    if embeddings.ndim != 2 or len(embeddings) == 0 or k <= 0:
+        return []
+    k = min(k, len(embeddings))
+
+    query = _normalize(query_embedding).reshape(-1)
+    query_similarity = embeddings @ query
+    similarity_matrix = embeddings @ embeddings.T
+
+    relevance = lambda_mult * query_similarity
+    redundancy_weight = 1.0 - lambda_mult
+    closest_selected = np.full(len(embeddings), -np.inf, dtype=np.float32)
+    available = np.ones(len(embeddings), dtype=bool)
+
+    # The first pick has no selected neighbours, so it is simply the most relevant.
+    selected = [int(np.argmax(query_similarity))]
+    available[selected[0]] = False
+
+    for _ in range(k - 1):
+        np.maximum(closest_selected,
+                   similarity_matrix[selected[-1]], out=closest_selected)
+        scores = relevance - redundancy_weight * closest_selected
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+
+    return selected
@@ -1,9 +1,15 @@
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
 from monkdb import client
-from sentence_transformers import SentenceTransformer
 from langchain_core.documents import Document
 from langchain_community.vectorstores import VectorStore
-from typing import List
+from typing import List, Optional, Tuple
+from mmr import maximal_marginal_relevance
 import configparser
 import os
 
@@ -29,68 +35,120 @@ DB_PASSWORD = config['database']['DB_PASSWORD']
 DB_SCHEMA = config['database']['DB_SCHEMA']
 TABLE_NAME = config['database']['VECTOR_TABLE_NAME']
 
+# Importing this module is side-effect free: nothing below connects to MonkDB,
+# touches a table or loads the model until a function asks for it. The demo
+# that used to run at import time now lives in main().
+
 # ==============================
 # 1️⃣ CONNECT TO MONKDB
 # ==============================
-try:
-    connection = client.connect(
+
+
+def connect():
+    """Open a new MonkDB connection using the credentials from config.ini."""
+    return client.connect(
         f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER
     )
-    cursor = connection.cursor()
-    print("✅ Database connection established successfully!")
-except Exception as e:
-    print(f"⚠️ Error connecting to the database: {e}")
-    exit(1)
 
 # ==============================
-# 2️⃣ LOAD EMBEDDING MODEL
+# 2️⃣ LOAD EMBEDDING MODEL (LAZILY)
 # ==============================
+
+
 MODEL_NAME = "all-MiniLM-L6-v2"
-model = SentenceTransformer(MODEL_NAME)
 EMBEDDING_DIM = 384  # All-MiniLM-L6-v2 outputs 384-dimensional vectors
 
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Return the shared SentenceTransformer, loading it on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                # sentence_transformers pulls in torch, which alone takes seconds
+                # to import, so the import is deferred along with the model.
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+
+def preload_model():
+    """
+    Load the model in the current process ahead of time.
+
+    Call this in a parent process before forking workers (see embedding_pool.py)
+    so the weights are loaded once and shared copy-on-write by every child.
+    """
+    return get_model()
+
 # ==============================
 # 3️⃣ CREATE TABLE WITH FLOAT_VECTOR(384) UNDER `monkdb` SCHEMA
 # ==============================
 
-# Drop table if exists
-cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{TABLE_NAME}")
-print(f"Dropped {DB_SCHEMA}.{TABLE_NAME} table")
 
-cursor.execute(f"""
-CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{TABLE_NAME} (
-    id TEXT PRIMARY KEY,
-    content TEXT,
-    embedding FLOAT_VECTOR({EMBEDDING_DIM})
-)
-""")
-connection.commit()
-print(f"✅ Table '{DB_SCHEMA}.{TABLE_NAME}' is ready.")
+def create_table(cursor, drop=False, table=TABLE_NAME, tenant_shards=None):
+    """
+    Create the documents table, optionally dropping an existing one first.
+
+    With tenant_shards, rows are clustered by tenant_id into that many shards, so a
+    query with `tenant_id = ?` in its WHERE clause is routed to a single shard.
+    tenant_id then becomes part of the primary key.
+    """
+    if drop:
+        cursor.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{table}")
+        print(f"Dropped {DB_SCHEMA}.{table} table")
+
+    primary_key = "id, tenant_id" if tenant_shards else "id"
+    layout = f"CLUSTERED BY (tenant_id) INTO {int(tenant_shards)} SHARDS" if tenant_shards else ""
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{table} (
+        id TEXT,
+        tenant_id TEXT,
+        content TEXT,
+        metadata OBJECT(DYNAMIC),
+        embedding FLOAT_VECTOR({EMBEDDING_DIM}),
+        PRIMARY KEY ({primary_key})
+    ) {layout}
+    """)
+    print(f"✅ Table '{DB_SCHEMA}.{table}' is ready.")
 
 # ==============================
-# 4️⃣ FUNCTION TO GENERATE EMBEDDINGS
+# 4️⃣ FUNCTIONS TO GENERATE EMBEDDINGS
 # ==============================
 
 
 def generate_embedding(text):
     """Generate a 384-dimensional vector for the input text."""
-    return model.encode(text).tolist()  # Convert NumPy array to list for MonkDB compatibility
+    return get_model().encode(text).tolist()  # Convert NumPy array to list for MonkDB compatibility
+
+
+def generate_embeddings(texts, batch_size=32):
+    """Generate embeddings for many texts in one batched model call."""
+    return get_model().encode(list(texts), batch_size=batch_size).tolist()
 
 # ==============================
 # 5️⃣ INSERT DOCUMENTS INTO MONKDB
 # ==============================
 
 
-def insert_or_update_document(doc_id, text):
+UPSERT_SQL = f"""
+INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (id, content, embedding)
+VALUES (?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    content = excluded.content,
+    embedding = excluded.embedding
+"""
+
+
+def insert_or_update_document(cursor, doc_id, text):
     """Insert a document into MonkDB, updating it if it already exists."""
     embedding = generate_embedding(text)
 
     try:
-        """Insert a document into MonkDB, updating it if it already exists."""
-        embedding = generate_embedding(text)
-        cursor.execute(f"""
-            INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (id, content, embedding) VALUES (?, ?, ?) ON CONFLICT (id) DO UPDATE SET content = excluded.content, embedding = excluded.embedding""", [doc_id, text, embedding])
-        connection.commit()
+        cursor.execute(UPSERT_SQL, [doc_id, text, embedding])
         print(f"Upserted document: {doc_id}")
 
     except client.exceptions.MonkIntegrityError as e:
@@ -98,113 +156,323 @@ def insert_or_update_document(doc_id, text):
         print("Skipping insertion to prevent DuplicateKeyException.")
 
 
-# Insert some sample documents
-documents = [
-    ("doc_1", "MonkDB is great for time-series and vector workloads."),
-    ("doc_2", "Vector search in databases is important for AI applications."),
-    ("doc_3", "MonkDB provides scalable distributed storage."),
-    ("doc_4", "Machine learning models can benefit from vector databases."),
-    ("doc_5", "AI-powered search engines rely on efficient embeddings.")
-]
-
-for doc_id, text in documents:
-    insert_or_update_document(doc_id, text)
-
-print(f"✅ Documents inserted into {DB_SCHEMA}.{TABLE_NAME}.")
+def upsert_sql(table=TABLE_NAME, tenant_routing=False):
+    """Upsert of (id, tenant_id, content, metadata, embedding) rows, as used by MonkDBVectorStore."""
+    conflict = "id, tenant_id" if tenant_routing else "id"
+    # tenant_id is part of the primary key of a tenant-routed table and cannot be updated.
+    tenant_update = "" if tenant_routing else "\n    tenant_id = excluded.tenant_id,"
+    return f"""
+INSERT INTO {DB_SCHEMA}.{table} (id, tenant_id, content, metadata, embedding)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT ({conflict}) DO UPDATE SET{tenant_update}
+    content = excluded.content,
+    metadata = excluded.metadata,
+    embedding = excluded.embedding
+"""
 
 # ==============================
 # 6️⃣ PERFORM KNN SEARCH USING knn_match()
 # ==============================
 
 
-def knn_search(query, k=3):
+def knn_search(cursor, query, k=3):
     """Find the top k nearest neighbors for a given query."""
     query_embedding = generate_embedding(query)
     cursor.execute(f"""
-    SELECT id, content, _score 
-    FROM {DB_SCHEMA}.{TABLE_NAME} 
-    WHERE knn_match(embedding, ?, {k})  
+    SELECT id, content, _score
+    FROM {DB_SCHEMA}.{TABLE_NAME}
+    WHERE knn_match(embedding, ?, {int(k)})
     ORDER BY _score DESC
     """, [query_embedding])
 
     results = cursor.fetchall()
     return results
 
-
-query_text = "Find databases optimized for vector search."
-print("\n🔍 KNN Search Results:")
-for row in knn_search(query_text):
-    print(f"ID: {row[0]}, Content: {row[1]}, Score: {row[2]}")
-
 # ==============================
 # 7️⃣ COMPUTE VECTOR SIMILARITY USING vector_similarity()
 # ==============================
 
 
-def similarity_search(query, k=3):
+def similarity_search(cursor, query, k=3):
     """Find similar documents using vector similarity scoring."""
     query_embedding = generate_embedding(query)
     cursor.execute(f"""
-    SELECT id, content, vector_similarity(embedding, ?) AS similarity 
-    FROM {DB_SCHEMA}.{TABLE_NAME} 
+    SELECT id, content, vector_similarity(embedding, ?) AS similarity
+    FROM {DB_SCHEMA}.{TABLE_NAME}
     ORDER BY similarity DESC
-    LIMIT {k}
+    LIMIT {int(k)}
     """, [query_embedding])
 
     results = cursor.fetchall()
     return results
 
-
-print("\n🔍 Similarity Search Results:")
-for row in similarity_search(query_text):
-    print(f"ID: {row[0]}, Content: {row[1]}, Similarity: {row[2]}")
-
 # ==============================
 # 8️⃣ INTEGRATE WITH LANGCHAIN
 # ==============================
 
 
+# Filter operators accepted by filter_clause(), in addition to plain equality.
+FILTER_OPERATORS = {"$eq": "=", "$ne": "<>", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+# Columns of the documents table a filter can name directly; other fields live in metadata.
+FILTER_COLUMNS = ("id", "tenant_id", "content")
+_FILTER_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# Filters matching at most this many rows are answered by an exact scan of those rows.
+EXACT_SEARCH_MAX_ROWS = 5_000
+# knn_match candidates requested per expected hit, on top of 1 / selectivity.
+OVERSAMPLING = 1.5
+MAX_FETCH_K = 2_000
+# Seconds a filter's row count is reused before it is counted again.
+SELECTIVITY_TTL = 60.0
+# Distinct filters whose row counts are kept, least recently used dropped first.
+SELECTIVITY_CACHE_SIZE = 1024
+
+
+def filter_column(field):
+    """Map a filter field to a column: id/tenant_id/content, or a (nested, dotted) metadata key."""
+    if not _FILTER_FIELD.match(field):
+        raise ValueError(f"Invalid filter field: {field!r}")
+    if field in FILTER_COLUMNS:
+        return field
+    return "metadata" + "".join(f"['{part}']" for part in field.split("."))
+
+
+def filter_clause(filter):
+    """
+    Translate a filter dict into a WHERE condition and its parameters.
+
+    {"tenant_id": "acme", "lang": "en"}  ->  tenant_id = ? AND metadata['lang'] = ?
+    {"year": {"$gte": 2020}}             ->  metadata['year'] >= ?
+    {"lang": ["en", "de"]}               ->  metadata['lang'] = ANY(?)
+    {"tags": {"$contains": "faq"}}       ->  ? = ANY(metadata['tags'])
+
+    Supported operators are $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin and $contains.
+    $ne and $nin also match documents without the field, as a NULL never compares
+    unequal in SQL.
+    """
+    conditions, params = [], []
+    for field, condition in filter.items():
+        column = filter_column(field)
+        if not isinstance(condition, dict):
+            condition = {"$in": condition} if isinstance(condition, (list, tuple)) else {"$eq": condition}
+        for operator, value in condition.items():
+            if value is None and operator in ("$eq", "$ne"):
+                conditions.append(f"{column} IS {'NOT ' if operator == '$ne' else ''}NULL")
+                continue
+            if operator == "$ne":
+                conditions.append(f"({column} <> ? OR {column} IS NULL)")
+            elif operator in FILTER_OPERATORS:
+                conditions.append(f"{column} {FILTER_OPERATORS[operator]} ?")
+            elif operator == "$in":
+                conditions.append(f"{column} = ANY(?)")
+                value = list(value)
+            elif operator == "$nin":
+                conditions.append(f"(NOT {column} = ANY(?) OR {column} IS NULL)")
+                value = list(value)
+            elif operator == "$contains":
+                conditions.append(f"? = ANY({column})")
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator!r}")
+            params.append(value)
+    return " AND ".join(conditions) or "TRUE", params
+
+
 class MonkDBVectorStore(VectorStore):
-    def __init__(self, connection, embedding_dim):
+    def __init__(self, connection, embedding_dim, table=TABLE_NAME, tenant_routing=False,
+                 exact_search_max_rows=EXACT_SEARCH_MAX_ROWS, max_fetch_k=MAX_FETCH_K):
+        """
+        tenant_routing must match the table layout: True for a table created with
+        create_table(..., tenant_shards=n), which is clustered by tenant_id.
+        """
         self.connection = connection
         self.cursor = connection.cursor()
         self.embedding_dim = embedding_dim
+        self.table = table
+        self.tenant_routing = tenant_routing
+        self.exact_search_max_rows = exact_search_max_rows
+        self.max_fetch_k = max_fetch_k
+        self._row_counts = OrderedDict()
 
     def add_documents(self, docs: List[Document]):
-        """Insert documents into MonkDB with embeddings."""
-        for doc in docs:
-            embedding = generate_embedding(doc.page_content)
-            self.cursor.execute(
-                f"""
-            INSERT INTO {DB_SCHEMA}.{TABLE_NAME} (id, content, embedding) 
-            VALUES (?, ?, ?)
-            ON CONFLICT (id) DO UPDATE SET 
-                content = excluded.content, 
-                embedding = excluded.embedding
-            """,
-                [doc.metadata.get("id", "unknown"),
-                 doc.page_content, embedding]
-            )
+        """
+        Insert documents into MonkDB with embeddings.
+
+        metadata["id"] and metadata["tenant_id"] go to their own columns, every
+        other metadata key to the metadata object, where filters can reach it.
+        On a tenant-routed table tenant_id is part of the primary key, so every
+        document must have one.
+        """
+        if self.tenant_routing:
+            missing = [doc.metadata.get("id", "unknown") for doc in docs if doc.metadata.get("tenant_id") is None]
+            if missing:
+                raise ValueError(f"Documents without metadata['tenant_id'] on a tenant-routed table: {missing}")
+        embeddings = generate_embeddings([doc.page_content for doc in docs])
+        self.cursor.executemany(
+            upsert_sql(self.table, self.tenant_routing),
+            [[doc.metadata.get("id", "unknown"), doc.metadata.get("tenant_id"), doc.page_content,
+              {key: value for key, value in doc.metadata.items() if key not in ("id", "tenant_id")},
+              embedding]
+             for doc, embedding in zip(docs, embeddings)]
+        )
         self.connection.commit()
 
-    def similarity_search(self, query: str, k: int = 3):
-        """Find similar documents using vector similarity."""
-        query_embedding = generate_embedding(query)
-        self.cursor.execute(f"""
-        SELECT id, content, vector_similarity(embedding, ?) AS similarity 
-        FROM {DB_SCHEMA}.{TABLE_NAME} 
-        ORDER BY similarity DESC
-        LIMIT ?
-        """, [query_embedding, k])
-        results = self.cursor.fetchall()
-        return [Document(page_content=row[1], metadata={"id": row[0]}) for row in results]
+    def similarity_search(self, query: str, k: int = 3, filter: Optional[dict] = None):
+        """Find similar documents using vector similarity, optionally restricted by a filter."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def similarity_search_with_score(self, query: str, k: int = 3,
+                                     filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        """Find similar documents and return them with their similarity score."""
+        return self.similarity_search_by_vector_with_score(generate_embedding(query), k, filter)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 3, filter: Optional[dict] = None):
+        """Find documents similar to an already computed embedding."""
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 3,
+                                               filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        """
+        Return the k documents most similar to `embedding` among those matching `filter`.
+
+        See filter_clause() for the filter syntax. A filter that matches at most
+        exact_search_max_rows rows is answered by scoring exactly those rows.
+        Otherwise knn_match() runs together with the filter and asks for enough
+        candidates that k of them are expected to pass it. That is k * OVERSAMPLING /
+        selectivity, capped at max_fetch_k, and raised further if fewer than k come back.
+        """
+        if not filter:
+            self.cursor.execute(f"""
+            SELECT id, tenant_id, content, metadata, vector_similarity(embedding, ?) AS similarity
+            FROM {DB_SCHEMA}.{self.table}
+            ORDER BY similarity DESC
+            LIMIT ?
+            """, [embedding, k])
+            return [self._scored_document(row) for row in self.cursor.fetchall()]
+
+        return [self._scored_document(row) for row in self._filtered_rows(embedding, k, filter)]
+
+    def _filtered_rows(self, embedding, k, filter, columns=""):
+        """
+        Return up to k (id, tenant_id, content, metadata, similarity, *columns) rows
+        matching `filter`, most similar first, with the exact-scan / knn_match
+        strategy described in similarity_search_by_vector_with_score().
+        """
+        where, params = filter_clause(filter)
+        select = "id, tenant_id, content, metadata, vector_similarity(embedding, ?) AS similarity" + columns
+        matching, scope = self._filter_counts(where, params, filter)
+        if matching <= self.exact_search_max_rows:
+            self.cursor.execute(f"""
+            SELECT {select}
+            FROM {DB_SCHEMA}.{self.table}
+            WHERE {where}
+            ORDER BY similarity DESC
+            LIMIT ?
+            """, [embedding, *params, k])
+            return self.cursor.fetchall()
+
+        fetch_k = self.fetch_k(k, matching / scope if scope else 1.0)
+        while True:
+            self.cursor.execute(f"""
+            SELECT {select}
+            FROM {DB_SCHEMA}.{self.table}
+            WHERE knn_match(embedding, ?, {int(fetch_k)}) AND {where}
+            ORDER BY similarity DESC
+            LIMIT ?
+            """, [embedding, embedding, *params, k])
+            rows = self.cursor.fetchall()
+            if len(rows) >= k or fetch_k >= self.max_fetch_k:
+                return rows
+            fetch_k = min(fetch_k * 4, self.max_fetch_k)
+
+    def fetch_k(self, k, selectivity):
+        """knn_match candidates needed for k hits when `selectivity` of the searched rows pass the filter."""
+        return max(k, min(self.max_fetch_k, math.ceil(k * OVERSAMPLING / max(selectivity, 1e-9))))
+
+    def _filter_counts(self, where, params, filter):
+        """
+        Return (rows matching the filter, rows knn_match searches), cached for
+        SELECTIVITY_TTL in an LRU of SELECTIVITY_CACHE_SIZE filters.
+
+        On a tenant-routed table a tenant_id equality limits the search to the one
+        shard that holds the tenant. That shard holds other tenants too, so the
+        selectivity is relative to the shard's rows, estimated as the table's rows
+        divided by its number of shards (and never fewer than the matching rows).
+        """
+        tenant = filter.get("tenant_id") if self.tenant_routing else None
+        routed = tenant is not None and not isinstance(tenant, (dict, list, tuple))
+        cache_key = (where, json.dumps(params, sort_keys=True, default=str))
+        cached = self._row_counts.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < SELECTIVITY_TTL:
+            self._row_counts.move_to_end(cache_key)
+            return cached[1]
+
+        self.cursor.execute(f"SELECT COUNT(*) FROM {DB_SCHEMA}.{self.table} WHERE {where}", params)
+        matching = self.cursor.fetchone()[0]
+        self.cursor.execute(f"SELECT COUNT(*) FROM {DB_SCHEMA}.{self.table}")
+        scope = self.cursor.fetchone()[0]
+        if routed:
+            self.cursor.execute("""
+            SELECT number_of_shards FROM information_schema.tables
+            WHERE table_schema = ? AND table_name = ?
+            """, [DB_SCHEMA, self.table])
+            scope = max(matching, math.ceil(scope / max(self.cursor.fetchone()[0], 1)))
+        counts = (matching, scope)
+        self._row_counts[cache_key] = (time.monotonic(), counts)
+        self._row_counts.move_to_end(cache_key)
+        if len(self._row_counts) > SELECTIVITY_CACHE_SIZE:
+            self._row_counts.popitem(last=False)
+        return counts
+
+    @staticmethod
+    def _scored_document(row):
+        doc_id, tenant_id, content, metadata, similarity = row
+        fields = {"id": doc_id, **(metadata or {})}
+        if tenant_id is not None:
+            fields["tenant_id"] = tenant_id
+        return Document(page_content=content, metadata=fields), similarity
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20,
+                                      lambda_mult: float = 0.5, filter: Optional[dict] = None):
+        """
+        Return k documents that are relevant to the query but diverse among themselves.
+
+        lambda_mult=1 ranks purely by relevance, lambda_mult=0 purely by diversity.
+        """
+        return self.max_marginal_relevance_search_by_vector(
+            generate_embedding(query), k, fetch_k, lambda_mult, filter)
+
+    def max_marginal_relevance_search_by_vector(self, embedding: List[float], k: int = 4,
+                                                fetch_k: int = 20, lambda_mult: float = 0.5,
+                                                filter: Optional[dict] = None):
+        # One round trip: the candidate pool comes back together with its embeddings,
+        # and the MMR re-ranking runs locally in NumPy. A filter picks the candidates
+        # the same way similarity search does.
+        if filter:
+            candidates = self._filtered_rows(embedding, fetch_k, filter, ", embedding")
+        else:
+            self.cursor.execute(f"""
+            SELECT id, tenant_id, content, metadata, vector_similarity(embedding, ?) AS similarity, embedding
+            FROM {DB_SCHEMA}.{self.table}
+            WHERE knn_match(embedding, ?, {int(fetch_k)})
+            ORDER BY similarity DESC
+            LIMIT {int(fetch_k)}
+            """, [embedding, embedding])
+            candidates = self.cursor.fetchall()
+        if not candidates:
+            return []
+
+        selected = maximal_marginal_relevance(
+            np.asarray(embedding, dtype=np.float32),
+            np.asarray([row[5] for row in candidates], dtype=np.float32),
+            k=k,
+            lambda_mult=lambda_mult,
+        )
+        return [self._scored_document(candidates[i][:5])[0] for i in selected]
 
     @classmethod
     def from_texts(cls, texts: List[str], metadatas: List[dict] = None):
         """Create a vector store from a list of texts."""
-        connection = client.connect(
-            f"http://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}", username=DB_USER)
-        instance = cls(connection, EMBEDDING_DIM)
+        instance = cls(connect(), EMBEDDING_DIM)
 
         metadatas = metadatas or [{}] * len(texts)
 
@@ -214,17 +482,80 @@ class MonkDBVectorStore(VectorStore):
 
         return instance
 
+# ==============================
+# 9️⃣ DEMO
+# ==============================
 
-# Initialize MonkDB Vector Store
-monkdb_vector_store = MonkDBVectorStore.from_texts([
-    "MonkDB supports fast vector search.",
-    "Embedding-based retrieval is powerful in AI applications."
-])
-
-# Perform similarity search using LangChain
-print("\n🔍 LangChain Similarity Search Results:")
-for doc in monkdb_vector_store.similarity_search("How does MonkDB handle vector search?"):
-    print(doc.page_content)
 
-print(
-    f"\n✅ MonkDB vector search with Sentence Transformers & LangChain completed successfully under schema '{DB_SCHEMA}'!")
+def main():
+    try:
+        connection = connect()
+        cursor = connection.cursor()
+        print("✅ Database connection established successfully!")
+    except Exception as e:
+        print(f"⚠️ Error connecting to the database: {e}")
+        exit(1)
+
+    create_table(cursor, drop=True)
+    connection.commit()
+
+    # Insert some sample documents
+    documents = [
+        ("doc_1", "MonkDB is great for time-series and vector workloads."),
+        ("doc_2", "Vector search in databases is important for AI applications."),
+        ("doc_3", "MonkDB provides scalable distributed storage."),
+        ("doc_4", "Machine learning models can benefit from vector databases."),
+        ("doc_5", "AI-powered search engines rely on efficient embeddings.")
+    ]
+
+    for doc_id, text in documents:
+        insert_or_update_document(cursor, doc_id, text)
+    connection.commit()
+
+    print(f"✅ Documents inserted into {DB_SCHEMA}.{TABLE_NAME}.")
+
+    query_text = "Find databases optimized for vector search."
+    print("\n🔍 KNN Search Results:")
+    for row in knn_search(cursor, query_text):
+        print(f"ID: {row[0]}, Content: {row[1]}, Score: {row[2]}")
+
+    print("\n🔍 Similarity Search Results:")
+    for row in similarity_search(cursor, query_text):
+        print(f"ID: {row[0]}, Content: {row[1]}, Similarity: {row[2]}")
+
+    # Initialize MonkDB Vector Store
+    monkdb_vector_store = MonkDBVectorStore.from_texts([
+        "MonkDB supports fast vector search.",
+        "Embedding-based retrieval is powerful in AI applications."
+    ], [
+        {"id": "lc_1", "tenant_id": "acme", "topic": "databases"},
+        {"id": "lc_2", "tenant_id": "globex", "topic": "ai"},
+    ])
+
+    # Perform similarity search using LangChain
+    print("\n🔍 LangChain Similarity Search Results:")
+    for doc, score in monkdb_vector_store.similarity_search_with_score("How does MonkDB handle vector search?"):
+        print(f"{doc.page_content} (similarity: {score})")
+
+    # Only one tenant's documents: the filter becomes part of the WHERE clause
+    print("\n🔍 LangChain Similarity Search Results for tenant 'acme':")
+    for doc, score in monkdb_vector_store.similarity_search_with_score(
+            "How does MonkDB handle vector search?", filter={"tenant_id": "acme"}):
+        print(f"{doc.page_content} (similarity: {score})")
+
+    # Diverse results: relevant to the query but not near-duplicates of each other
+    print("\n🔍 LangChain Max Marginal Relevance Results:")
+    for doc in monkdb_vector_store.max_marginal_relevance_search(
+            "How does MonkDB handle vector search?", k=3, fetch_k=10):
+        print(doc.page_content)
+
+    monkdb_vector_store.connection.close()
+    cursor.close()
+    connection.close()
+
+    print(
+        f"\n✅ MonkDB vector search with Sentence Transformers & LangChain completed successfully under schema '{DB_SCHEMA}'!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Runs the demo workloads from get-started.sh concurrently and reports where the time goes.
+
+get-started.sh runs every script one after another, and each opens its own
+connection. This runner builds a dependency graph of the same scripts (blob
+create_table.py before blob.py, everything else independent), runs every workload
+whose dependencies succeeded on a thread pool, and gives all of them one shared,
+pooled MonkDB connection: monkdb's client.connect() returns it, and close() leaves
+it open for the others.
+
+Each script runs unchanged. Its statements are timed through the shared connection
+and split into phases:
+
+- setup   imports, model loading and anything else before the first statement
+- ddl     CREATE / DROP / ALTER
+- load    INSERT / UPDATE / DELETE / COPY / REFRESH / OPTIMIZE
+- query   SELECT and everything else
+- client  Python work between statements (e.g. computing embeddings)
+
+Output of each script is collected separately and printed when it finishes.
+blob.py starts a long-running FastAPI server when run as a script, so the runner
+only loads it; start it with `python3 documentation/blob/blob.py`.
+
+    python3 run_workloads.py
+    python3 run_workloads.py --workers 1               # sequential, for comparison
+    python3 run_workloads.py --only fts vector --quiet --json timings.json
+"""
+
+import argparse
+import configparser
+import io
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.realpath(__file__))
+DOCS = os.path.join(ROOT, "documentation")
+
+# name: (script under documentation/, dependencies, run as __main__)
+WORKLOADS = {
+    "blob_table": ("blob/create_table.py", (), True),
+    "blob_api": ("blob/blob.py", ("blob_table",), False),
+    "doc_json": ("document_json/doc_json.py", (), True),
+    "fts": ("FTS/fts.py", (), True),
+    "geo": ("geospatial/geo.py", (), True),
+    "geo_shapes": ("geospatial/other_shapes.py", (), True),
+    "timeseries": ("timeseries/timeseries.py", (), True),
+    "vector": ("vector/vector_ops.py", (), True),
+}
+
+PHASES = ("setup", "ddl", "load", "query", "client")
+_PHASE_OF = {
+    "CREATE": "ddl", "DROP": "ddl", "ALTER": "ddl",
+    "INSERT": "load", "UPDATE": "load", "DELETE": "load", "COPY": "load", "REFRESH": "load", "OPTIMIZE": "load",
+}
+
+_current = threading.local()
+
+
+class Timing:
+    def __init__(self, name):
+        self.name = name
+        self.status = "pending"
+        self.started = None
+        self.first_statement = None
+        self.wall = 0.0
+        self.statements = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.output = ""
+
+    def record(self, statement, started, seconds):
+        if self.first_statement is None:
+            self.first_statement = started
+        keyword = statement.split(None, 1)[0].upper() if statement.strip() else ""
+        self.phases[_PHASE_OF.get(keyword, "query")] += seconds
+        self.statements += 1
+
+    def finish(self):
+        ended = time.perf_counter()
+        self.wall = ended - self.started
+        self.phases["setup"] = (self.first_statement or ended) - self.started
+        database = self.phases["ddl"] + self.phases["load"] + self.phases["query"]
+        self.phases["client"] = max(self.wall - self.phases["setup"] - database, 0.0)
+
+
+class TimedCursor:
+    def __init__(self, cursor, timing):
+        self._cursor = cursor
+        self._timing = timing
+
+    def execute(self, statement, *args, **kwargs):
+        return self._timed(self._cursor.execute, statement, *args, **kwargs)
+
+    def executemany(self, statement, *args, **kwargs):
+        return self._timed(self._cursor.executemany, statement, *args, **kwargs)
+
+    def _timed(self, method, statement, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(statement, *args, **kwargs)
+        finally:
+            if self._timing is not None:
+                self._timing.record(statement, started, time.perf_counter() - started)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SharedConnection:
+    """The one pooled connection every workload gets from client.connect()."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, **kwargs):
+        return TimedCursor(self._connection.cursor(**kwargs), getattr(_current, "timing", None))
+
+    def close(self):
+        pass  # still in use by the other workloads; the runner closes it at the end
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement that sends each workload thread's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = getattr(_current, "output", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def run_workload(name, timing):
+    script, _, as_main = WORKLOADS[name]
+    _current.timing = timing
+    _current.output = io.StringIO()
+    timing.started = time.perf_counter()
+    try:
+        runpy.run_path(os.path.join(DOCS, script), run_name="__main__" if as_main else name)
+        timing.status = "ok"
+    except SystemExit as e:
+        timing.status = "ok" if not e.code else f"exit {e.code}"
+    except Exception as e:
+        timing.status = f"error: {type(e).__name__}: {e}"
+    finally:
+        timing.finish()
+        timing.output = _current.output.getvalue()
+        _current.timing = _current.output = None
+    return timing
+
+
+def with_dependencies(names):
+    selected, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(WORKLOADS[name][1])
+    return [name for name in WORKLOADS if name in selected]
+
+
+def run(names, workers, on_done=None):
+    """Run the workloads in dependency order, up to `workers` at a time. Returns {name: Timing}."""
+    timings = {name: Timing(name) for name in names}
+    pending, running, failed = list(names), {}, set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name in list(pending):
+                dependencies = WORKLOADS[name][1]
+                if any(d in failed for d in dependencies):
+                    timings[name].status = "skipped"
+                    failed.add(name)
+                    pending.remove(name)
+                elif all(timings[d].status == "ok" for d in dependencies):
+                    running[pool.submit(run_workload, name, timings[name])] = name
+                    pending.remove(name)
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if timings[name].status != "ok":
+                    failed.add(name)
+                if on_done is not None:
+                    on_done(timings[name])
+    return timings
+
+
+def connect(pool_size):
+    from monkdb import client
+
+    config = configparser.ConfigParser()
+    config.read(os.path.join(DOCS, "config.ini"), encoding="utf-8")
+    db = config["database"]
+    return client.connect(f"http://{db['DB_USER']}:{db['DB_PASSWORD']}@{db['DB_HOST']}:{db['DB_PORT']}",
+                          username=db["DB_USER"], pool_size=pool_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=list(WORKLOADS), help="run these (and their dependencies)")
+    parser.add_argument("--workers", type=int, default=len(WORKLOADS), help="workloads running at the same time")
+    parser.add_argument("--quiet", action="store_true", help="do not print the workloads' own output")
+    parser.add_argument("--json", help="also write the timing report to this file")
+    args = parser.parse_args()
+
+    from monkdb import client
+
+    for directory in sorted({os.path.dirname(script) for script, _, _ in WORKLOADS.values()}):
+        sys.path.insert(0, os.path.join(DOCS, directory))
+
+    names = with_dependencies(args.only or list(WORKLOADS))
+    started = time.perf_counter()
+    connection = connect(max(args.workers, 1))
+    shared = SharedConnection(connection)
+    real_connect, client.connect = client.connect, lambda *a, **kw: shared
+    stdout, sys.stdout = sys.stdout, _ThreadOutput(sys.stdout)
+
+    def report(timing):
+        marker = "✅" if timing.status == "ok" else "⚠️"
+        stdout.write(f"{marker} {timing.name} finished in {timing.wall:.2f} s ({timing.status})\n")
+        if not args.quiet and timing.output:
+            stdout.write(f"── {timing.name} output ──\n{timing.output}\n")
+
+    try:
+        timings = run(names, args.workers, report)
+    finally:
+        sys.stdout = stdout
+        client.connect = real_connect
+        connection.close()
+    total = time.perf_counter() - started
+
+    print(f"\n⏱️ {'workload':<12} {'wall s':>8} " + " ".join(f"{phase + ' s':>9}" for phase in PHASES)
+          + f" {'stmts':>6}  status")
+    for timing in timings.values():
+        print(f"   {timing.name:<12} {timing.wall:>8.2f} "
+              + " ".join(f"{timing.phases[phase]:>9.2f}" for phase in PHASES)
+              + f" {timing.statements:>6}  {timing.status}")
+    sequential = sum(t.wall for t in timings.values())
+    print(f"\nTotal wall time {total:.2f} s for {sequential:.2f} s of workloads "
+          f"({sequential / total if total else 0:.1f}x with {args.workers} workers)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"total_s": total, "workers": args.workers, "workloads": {
+                t.name: {"status": t.status, "wall_s": t.wall, "statements": t.statements,
+                         "phases_s": t.phases} for t in timings.values()}}, f, indent=2)
+    if any(t.status != "ok" for t in timings.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()